@@ -0,0 +1,41 @@
+# parceltrack/analysis/__init__.py
+
+"""
+Change detection, lineage matching, spatial weights, spillover scores and layer overlays.
+
+Submodules are imported on first use (PEP 562), so e.g. a worker that only needs
+`spatial_matching` never loads scipy.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "build_panel": ".change_detection",
+    "detect_changes": ".change_detection",
+    "geometry_fingerprint": ".change_detection",
+    "summarize_changes": ".change_detection",
+    "match_parcels": ".spatial_matching",
+    "overlap_pairs": ".spatial_matching",
+    "build_weights": ".weights",
+    "load_or_build_weights": ".weights",
+    "row_standardize": ".weights",
+    "event_flags": ".spillover",
+    "spillover_scores": ".spillover",
+    "summarize_reactivity": ".spillover",
+    "load_or_overlay": ".overlay",
+    "overlay_pairs": ".overlay",
+    "overlay_parcels": ".overlay",
+}
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,205 @@
+# parceltrack/analysis/change_detection.py
+
+"""
+ACCTID-keyed change detection across parcel years.
+
+Takes the {year: GeoDataFrame} mapping produced by `load_files_from_metdata` or
+`load_processed_years`, builds a long (Year, ACCTID) panel and flags, for each pair
+of consecutive years, parcels that were added, removed, revalued, rezoned or reshaped.
+Geometry changes are detected with vectorized fingerprints (normalized WKB hashes,
+area and centroid), never with row-by-row geometry comparisons.
+
+Example:
+    from parceltrack.analysis import detect_changes, summarize_changes
+    changes = detect_changes(geoms)
+    print(summarize_changes(changes))
+"""
+
+from typing import Dict, List, Union
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+VALUE_COLUMNS = ["NFMLNDVL", "NFMIMPVL", "NFMTTLVL"]
+ZONING_COLUMN = "ZONING"
+
+
+def geometry_fingerprint(geometry: gpd.GeoSeries, grid_size: Union[float, None] = None) -> pd.DataFrame:
+    """
+    Vectorized per-geometry fingerprint.
+
+    Args:
+        geometry (gpd.GeoSeries): Parcel polygons.
+        grid_size (float | None): Snap coordinates to this grid (CRS units) before hashing,
+            so re-digitizing noise below it does not count as a change.
+
+    Returns:
+        pd.DataFrame: 'geom_hash' (uint64 hash of the normalized WKB), 'area', 'cx', 'cy',
+            aligned to `geometry.index`.
+    """
+    geoms = np.asarray(geometry.values)
+    if grid_size:
+        geoms = shapely.set_precision(geoms, grid_size)
+    wkb = shapely.to_wkb(shapely.normalize(geoms))
+    hashes = pd.util.hash_array(np.asarray(wkb, dtype=object))
+    hashes[pd.isna(geoms)] = 0
+
+    centroids = shapely.centroid(geoms)
+    return pd.DataFrame({
+        "geom_hash": hashes,
+        "area": shapely.area(geoms),
+        "cx": shapely.get_x(centroids),
+        "cy": shapely.get_y(centroids),
+    }, index=geometry.index)
+
+
+def build_panel(
+    geoms: Dict[int, gpd.GeoDataFrame],
+    key: str = "ACCTID",
+    columns: Union[List[str], None] = None,
+    grid_size: Union[float, None] = None
+) -> pd.DataFrame:
+    """
+    Build a long (Year, key)-indexed panel of parcel attributes and geometry fingerprints.
+
+    All years are brought to the CRS of the first year before fingerprinting. If a key
+    appears more than once in a year, the first row is kept.
+
+    Args:
+        geoms (dict): {year: GeoDataFrame}.
+        key (str): Parcel identifier column.
+        columns (list[str] | None): Attribute columns to carry. Defaults to the value and
+            zoning columns that are present.
+        grid_size (float | None): Coordinate snapping for geometry hashes, see `geometry_fingerprint`.
+
+    Returns:
+        pd.DataFrame: Indexed by ('Year', key), with the attribute columns and
+            'geom_hash', 'area', 'cx', 'cy'.
+    """
+    years = sorted(geoms)
+    if not years:
+        raise ValueError("No years to build a panel from.")
+    crs = geoms[years[0]].crs
+
+    frames = []
+    for year in years:
+        gdf = geoms[year]
+        if key not in gdf.columns:
+            raise KeyError(f"Column '{key}' not found for year {year}")
+
+        cols = columns if columns is not None else [c for c in VALUE_COLUMNS + [ZONING_COLUMN] if c in gdf.columns]
+        duplicated = gdf[key].duplicated()
+        if duplicated.any():
+            print(f"[WARNING] {year}: dropping {int(duplicated.sum())} rows with duplicate {key}")
+            gdf = gdf[~duplicated]
+        if crs is not None and gdf.crs is not None and gdf.crs != crs:
+            gdf = gdf.to_crs(crs)
+
+        frame = gdf[[key] + [c for c in cols if c in gdf.columns]].copy()
+        frame = frame.join(geometry_fingerprint(gdf.geometry, grid_size=grid_size))
+        frame.insert(0, "Year", year)
+        frames.append(pd.DataFrame(frame))
+
+    return pd.concat(frames, ignore_index=True).set_index(["Year", key])
+
+
+def _changed(a: pd.Series, b: pd.Series) -> np.ndarray:
+    """Elementwise 'values differ', treating two missing values as equal."""
+    a_na, b_na = a.isna().to_numpy(), b.isna().to_numpy()
+    equal = (a.to_numpy() == b.to_numpy()) & ~a_na & ~b_na
+    return ~(equal | (a_na & b_na))
+
+
+def detect_changes(
+    geoms: Union[Dict[int, gpd.GeoDataFrame], None] = None,
+    panel: Union[pd.DataFrame, None] = None,
+    key: str = "ACCTID",
+    value_columns: List[str] = VALUE_COLUMNS,
+    zoning_column: str = ZONING_COLUMN,
+    method: str = "hash",
+    area_tolerance: float = 0.01,
+    centroid_tolerance: float = 1.0,
+    grid_size: Union[float, None] = None
+) -> pd.DataFrame:
+    """
+    Flag changes between every pair of consecutive years.
+
+    Args:
+        geoms (dict | None): {year: GeoDataFrame}. Ignored if `panel` is given.
+        panel (pd.DataFrame | None): Output of `build_panel`, to reuse across calls.
+        key (str): Parcel identifier column.
+        value_columns (list[str]): Assessment columns compared for `value_changed`.
+        zoning_column (str): Column compared for `zoning_changed`.
+        method (str): 'hash' flags any change of the normalized geometry; 'delta' flags
+            relative area changes above `area_tolerance` or centroid shifts above
+            `centroid_tolerance` (CRS units), ignoring vertex-level edits.
+        area_tolerance (float): Relative area change threshold for method='delta'.
+        centroid_tolerance (float): Centroid distance threshold for method='delta'.
+        grid_size (float | None): Coordinate snapping for geometry hashes.
+
+    Returns:
+        pd.DataFrame: One row per parcel present in either year of each pair, with
+            key, 'FromYear', 'ToYear', 'added', 'removed', '<col>_changed' per value
+            column, 'value_changed', 'zoning_changed' and 'geometry_changed'.
+            Change flags are False for added/removed parcels.
+    """
+    if method not in ("hash", "delta"):
+        raise ValueError(f"Unsupported method: {method}")
+    if panel is None:
+        if geoms is None:
+            raise ValueError("Pass either geoms or panel.")
+        panel = build_panel(geoms, key=key, columns=value_columns + [zoning_column], grid_size=grid_size)
+
+    years = sorted(panel.index.get_level_values("Year").unique())
+    value_columns = [c for c in value_columns if c in panel.columns]
+
+    results = []
+    for from_year, to_year in zip(years[:-1], years[1:]):
+        before_year = panel.xs(from_year, level="Year")
+        after_year = panel.xs(to_year, level="Year")
+        before, after = before_year.align(after_year, join="outer")
+        in_before = before_year.index.get_indexer(before.index) >= 0
+        in_after = after_year.index.get_indexer(after.index) >= 0
+        both = in_before & in_after
+
+        out = pd.DataFrame({key: before.index, "FromYear": from_year, "ToYear": to_year})
+        out["added"] = ~in_before
+        out["removed"] = ~in_after
+
+        value_changed = np.zeros(len(out), dtype=bool)
+        for col in value_columns:
+            flag = _changed(before[col], after[col]) & both
+            out[f"{col}_changed"] = flag
+            value_changed |= flag
+        out["value_changed"] = value_changed
+
+        if zoning_column in panel.columns:
+            out["zoning_changed"] = _changed(before[zoning_column], after[zoning_column]) & both
+        else:
+            out["zoning_changed"] = False
+
+        if method == "hash":
+            # Reindex the raw uint64 hashes; the aligned frames hold them as float64.
+            hash_before = before_year["geom_hash"].reindex(before.index, fill_value=0).to_numpy()
+            hash_after = after_year["geom_hash"].reindex(after.index, fill_value=0).to_numpy()
+            geometry_changed = hash_before != hash_after
+        else:
+            area_before = before["area"].to_numpy()
+            area_delta = np.abs(after["area"].to_numpy() - area_before) / np.where(area_before > 0, area_before, 1.0)
+            shift = np.hypot(after["cx"].to_numpy() - before["cx"].to_numpy(),
+                             after["cy"].to_numpy() - before["cy"].to_numpy())
+            geometry_changed = (area_delta > area_tolerance) | (shift > centroid_tolerance)
+        out["geometry_changed"] = geometry_changed & both
+
+        results.append(out)
+
+    if not results:
+        return pd.DataFrame(columns=[key, "FromYear", "ToYear", "added", "removed"])
+    return pd.concat(results, ignore_index=True)
+
+
+def summarize_changes(changes: pd.DataFrame) -> pd.DataFrame:
+    """Count each change flag per (FromYear, ToYear) pair."""
+    flags = [c for c in changes.columns if c in ("added", "removed", "geometry_changed") or c.endswith("_changed")]
+    return changes.groupby(["FromYear", "ToYear"])[flags].sum().reset_index()
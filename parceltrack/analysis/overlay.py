@@ -0,0 +1,314 @@
+# parceltrack/analysis/overlay.py
+
+"""
+Overlay parcels with area layers (census block groups, zoning, redlining, ...).
+
+The city is cut into a grid of tiles and every parcel is assigned to the tile that
+holds the centre of its bounding box, so each parcel is handled by exactly one tile
+and the per-tile results are simply concatenated. For each tile, the layer features
+near its parcels are found with an STRtree and joined there, one tile per task
+across a process pool. Three joins are supported:
+
+- 'intersects': every (parcel, feature) pair with a positive overlap area.
+- 'largest': for each parcel, the feature covering most of it, with that share.
+- 'apportion': area-weighted sums of layer columns (counts such as population are
+  split between parcels in proportion to the part of the feature each covers).
+
+`load_or_overlay` caches results per (parcel year, layer, join) and rebuilds them
+when the parcels or the layer change.
+
+Example:
+    from parceltrack.analysis import load_or_overlay
+    tracts = load_or_overlay(parcels_2021, 2021, paths.raw / "census" / "cenbg2020.shp",
+                             how="apportion", columns=["POP", "HOUSEHOLDS"], workers=4)
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Tuple, Union
+import geopandas as gpd
+import hashlib
+import json
+import numpy as np
+import pandas as pd
+import shapely
+
+from parceltrack.configs.paths import ProjectPaths
+from parceltrack.instrumentation import stage
+
+HOW = ("intersects", "largest", "apportion")
+
+_WORKER_LAYER = {}
+
+
+def _grid_shape(bounds: Tuple[float, float, float, float], tiles: int) -> Tuple[int, int]:
+    """Columns and rows of a grid of about `tiles` cells with roughly square cells."""
+    width, height = max(bounds[2] - bounds[0], 1e-9), max(bounds[3] - bounds[1], 1e-9)
+    nx = max(1, int(round(np.sqrt(tiles * width / height))))
+    return nx, max(1, int(np.ceil(tiles / nx)))
+
+
+def grid_tiles(bounds: Tuple[float, float, float, float], tiles: int) -> np.ndarray:
+    """
+    Split `bounds` into about `tiles` equal cells.
+
+    Returns:
+        np.ndarray: (n, 4) array of (minx, miny, maxx, maxy), row by row.
+    """
+    nx, ny = _grid_shape(bounds, tiles)
+    xs, ys = np.linspace(bounds[0], bounds[2], nx + 1), np.linspace(bounds[1], bounds[3], ny + 1)
+    return np.array([(xs[i], ys[j], xs[i + 1], ys[j + 1]) for j in range(ny) for i in range(nx)])
+
+
+def _tile_of(geoms: np.ndarray, bounds: Tuple[float, float, float, float], tiles: int) -> np.ndarray:
+    """Number of the `grid_tiles` cell holding each geometry's bounding-box centre."""
+    nx, ny = _grid_shape(bounds, tiles)
+    minx, miny, maxx, maxy = bounds
+    b = shapely.bounds(geoms)
+    cx, cy = (b[:, 0] + b[:, 2]) / 2, (b[:, 1] + b[:, 3]) / 2
+    ix = np.clip(((cx - minx) / max(maxx - minx, 1e-9) * nx).astype(int), 0, nx - 1)
+    iy = np.clip(((cy - miny) / max(maxy - miny, 1e-9) * ny).astype(int), 0, ny - 1)
+    return iy * nx + ix
+
+
+def _init_worker(layer_wkb: np.ndarray):
+    """Parse the layer and build its tree once per worker process."""
+    geoms = shapely.from_wkb(layer_wkb)
+    shapely.prepare(geoms)
+    _WORKER_LAYER["geoms"] = geoms
+    _WORKER_LAYER["tree"] = shapely.STRtree(geoms)
+
+
+def _join_tile(parcel_pos: np.ndarray, parcel_wkb: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(parcel position, layer position, intersection area) for one tile's overlapping pairs."""
+    parcels = shapely.from_wkb(parcel_wkb)
+    layer = _WORKER_LAYER["geoms"]
+    left, right = _WORKER_LAYER["tree"].query(parcels, predicate="intersects")
+    # Most parcels lie inside a single feature; only those crossing a feature's
+    # boundary need the (expensive) intersection.
+    areas = shapely.area(parcels[left])
+    inside = shapely.contains_properly(layer[right], parcels[left])
+    crossing = np.flatnonzero(~inside)
+    areas[crossing] = shapely.area(shapely.intersection(parcels[left[crossing]], layer[right[crossing]]))
+    # Parcels that only share an edge with a feature have no overlap area.
+    keep = areas > 0
+    return parcel_pos[left[keep]], right[keep], areas[keep]
+
+
+def overlay_pairs(
+    parcels: gpd.GeoDataFrame,
+    layer: gpd.GeoDataFrame,
+    tiles: int = 64,
+    workers: int = 1
+) -> pd.DataFrame:
+    """
+    Every (parcel, layer feature) pair with a positive overlap area, computed per tile.
+
+    Args:
+        parcels (gpd.GeoDataFrame): One year of parcels.
+        layer (gpd.GeoDataFrame): Overlay layer. Reprojected to the parcels' CRS if needed.
+        tiles (int): Approximate number of grid tiles the parcel extent is cut into.
+        workers (int): Processes joining tiles. 1 runs inline.
+
+    Returns:
+        pd.DataFrame: 'parcel_pos', 'layer_pos' (row positions), 'intersection_area',
+            'parcel_area' and 'layer_area', ordered by parcel.
+    """
+    if parcels.crs is not None and layer.crs is not None and parcels.crs != layer.crs:
+        layer = layer.to_crs(parcels.crs)
+    parcel_geoms = np.asarray(parcels.geometry.values)
+    layer_geoms = np.asarray(layer.geometry.values)
+
+    with stage("overlay_tiles", rows=len(parcels), layer_rows=len(layer)) as s:
+        valid = np.flatnonzero(~shapely.is_missing(parcel_geoms) & ~shapely.is_empty(parcel_geoms))
+        tile_of = _tile_of(parcel_geoms[valid], tuple(parcels.total_bounds), tiles)
+        order = np.argsort(tile_of, kind="stable")
+        splits = np.flatnonzero(np.diff(tile_of[order])) + 1
+        tile_positions = [valid[idx] for idx in np.split(order, splits) if len(idx)]
+        s.set(tiles=len(tile_positions))
+
+    parcel_wkb = shapely.to_wkb(parcel_geoms)
+    layer_wkb = shapely.to_wkb(layer_geoms)
+    tasks = [(pos, parcel_wkb[pos]) for pos in tile_positions]
+    with stage("overlay_join", tiles=len(tasks), workers=workers) as s:
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(layer_wkb,)) as pool:
+                parts = list(pool.map(_join_tile, *zip(*tasks)))
+        else:
+            _init_worker(layer_wkb)
+            parts = [_join_tile(pos, wkb) for pos, wkb in tasks]
+            _WORKER_LAYER.clear()
+        s.set(rows=sum(len(p[0]) for p in parts))
+
+    if parts:
+        parcel_pos, layer_pos, inter = (np.concatenate(a) for a in zip(*parts))
+    else:
+        parcel_pos, layer_pos, inter = np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros(0)
+    order = np.lexsort((layer_pos, parcel_pos))
+    parcel_pos, layer_pos, inter = parcel_pos[order], layer_pos[order], inter[order]
+    return pd.DataFrame({
+        "parcel_pos": parcel_pos,
+        "layer_pos": layer_pos,
+        "intersection_area": inter,
+        "parcel_area": shapely.area(parcel_geoms[parcel_pos]),
+        "layer_area": shapely.area(layer_geoms[layer_pos]),
+    })
+
+
+def overlay_parcels(
+    parcels: gpd.GeoDataFrame,
+    layer: gpd.GeoDataFrame,
+    how: str = "largest",
+    columns: Union[List[str], None] = None,
+    key: str = "ACCTID",
+    tiles: int = 64,
+    workers: int = 1
+) -> pd.DataFrame:
+    """
+    Join a layer's attributes to parcels by overlap.
+
+    Args:
+        parcels (gpd.GeoDataFrame): One year of parcels.
+        layer (gpd.GeoDataFrame): Overlay layer (census block groups, zoning, redlining).
+        how (str): 'intersects', 'largest' or 'apportion' (see the module docstring).
+        columns (list[str] | None): Layer columns to carry (for 'apportion', the numeric
+            columns to split). Defaults to all non-geometry columns (numeric ones for
+            'apportion').
+        key (str): Parcel identifier column carried into the result.
+        tiles (int): Approximate number of grid tiles.
+        workers (int): Processes joining tiles.
+
+    Returns:
+        pd.DataFrame:
+            - 'intersects': one row per overlapping pair: key, layer columns,
+              'overlap_area', 'parcel_share' (share of the parcel it covers).
+            - 'largest': one row per parcel (index of `parcels`): key, the layer columns of
+              the feature with the largest overlap (missing if none), 'parcel_share'.
+            - 'apportion': one row per parcel (index of `parcels`): key, each column's
+              area-weighted share, and 'parcel_share' (share of the parcel covered by the layer).
+    """
+    if how not in HOW:
+        raise ValueError(f"Unsupported overlay: {how}. Use one of {HOW}.")
+    if columns is None:
+        attributes = layer.drop(columns=layer.geometry.name)
+        columns = list(attributes.select_dtypes("number").columns if how == "apportion" else attributes.columns)
+    missing = [c for c in columns if c not in layer.columns]
+    if missing:
+        raise KeyError(f"Columns not in the layer: {missing}")
+
+    pairs = overlay_pairs(parcels, layer, tiles=tiles, workers=workers)
+    pairs["parcel_share"] = pairs["intersection_area"] / np.where(pairs["parcel_area"] > 0, pairs["parcel_area"], 1.0)
+    keys = parcels[key].to_numpy() if key in parcels.columns else np.asarray(parcels.index)
+    layer_values = layer[columns].reset_index(drop=True)
+
+    if how == "intersects":
+        out = pd.DataFrame({key: keys[pairs["parcel_pos"]]})
+        out = out.join(layer_values.iloc[pairs["layer_pos"]].reset_index(drop=True))
+        out["overlap_area"] = pairs["intersection_area"].to_numpy()
+        out["parcel_share"] = pairs["parcel_share"].to_numpy()
+        return out
+
+    out = pd.DataFrame({key: keys}, index=parcels.index)
+    if how == "largest":
+        best = pairs.sort_values(["parcel_pos", "intersection_area"], ascending=[True, False], kind="stable")
+        best = best.drop_duplicates("parcel_pos")
+        winners = layer_values.iloc[best["layer_pos"]].set_axis(parcels.index[best["parcel_pos"]])
+        out = out.join(winners)
+        out["parcel_share"] = pd.Series(best["parcel_share"].to_numpy(), index=parcels.index[best["parcel_pos"]])
+        return out
+
+    weights = pairs["intersection_area"] / np.where(pairs["layer_area"] > 0, pairs["layer_area"], 1.0)
+    by_parcel = pairs["parcel_pos"].to_numpy()
+    for col in columns:
+        values = layer_values[col].to_numpy(dtype=float)[pairs["layer_pos"]] * weights.to_numpy()
+        out[col] = np.bincount(by_parcel, weights=np.nan_to_num(values), minlength=len(parcels))
+    out["parcel_share"] = np.minimum(np.bincount(by_parcel, weights=pairs["parcel_share"], minlength=len(parcels)), 1.0)
+    return out
+
+
+def _frame_signature(gdf: gpd.GeoDataFrame, columns: List[str]) -> str:
+    """Hash of a frame's geometries and the given columns."""
+    digest = hashlib.sha1()
+    digest.update(pd.util.hash_array(np.asarray(shapely.to_wkb(gdf.geometry.values), dtype=object)).tobytes())
+    for col in columns:
+        if col in gdf.columns:
+            digest.update(pd.util.hash_pandas_object(gdf[col], index=False).to_numpy().tobytes())
+    if gdf.crs is not None:
+        digest.update(gdf.crs.to_string().encode("utf-8"))
+    return digest.hexdigest()
+
+
+def overlay_cache_name(year, layer_name: str, how: str, **params) -> str:
+    """Cache file stem for a parcel year, layer and overlay parameters."""
+    payload = json.dumps({"how": how, **{k: str(v) for k, v in sorted(params.items())}}, sort_keys=True)
+    return f"overlay_{year}_{layer_name}_{how}_{hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]}"
+
+
+def load_or_overlay(
+    parcels: gpd.GeoDataFrame,
+    year,
+    layer: Union[gpd.GeoDataFrame, str, Path],
+    how: str = "largest",
+    layer_name: Union[str, None] = None,
+    columns: Union[List[str], None] = None,
+    key: str = "ACCTID",
+    cache_dir: Union[str, Path, None] = None,
+    rebuild: bool = False,
+    tiles: int = 64,
+    workers: int = 1
+) -> pd.DataFrame:
+    """
+    Return the cached overlay for (year, layer, how, columns), computing it on a miss.
+
+    The result is stored as `<name>.parquet` with a `<name>.json` sidecar holding
+    hashes of the parcels (key and geometry) and the layer (columns and geometry); an
+    entry is only reused when both still match.
+
+    Args:
+        parcels (gpd.GeoDataFrame): One year of parcels.
+        year (int): Year the parcels belong to (part of the cache key).
+        layer (GeoDataFrame | str | Path): Overlay layer, or a file read with `load_geometry`.
+        how (str): See `overlay_parcels`.
+        layer_name (str | None): Layer name in the cache key. Defaults to the file stem;
+            required for an in-memory layer.
+        columns (list[str] | None): See `overlay_parcels`.
+        key (str): Parcel identifier column.
+        cache_dir (str | Path | None): Defaults to `data/processed/overlays`.
+        rebuild (bool): Ignore any cached result.
+        tiles (int): Approximate number of grid tiles.
+        workers (int): Processes joining tiles.
+
+    Returns:
+        pd.DataFrame: As returned by `overlay_parcels`.
+    """
+    if not isinstance(layer, gpd.GeoDataFrame):
+        from parceltrack.io.load_geometry import load_geometry
+
+        layer_name = layer_name or Path(layer).stem
+        layer = load_geometry(layer)
+    if layer_name is None:
+        raise ValueError("layer_name is required for an in-memory layer.")
+
+    cache_dir = Path(cache_dir) if cache_dir else ProjectPaths().processed / "overlays"
+    name = overlay_cache_name(year, layer_name, how, columns=columns, key=key)
+    data_path, meta_path = cache_dir / f"{name}.parquet", cache_dir / f"{name}.json"
+
+    with stage("overlay_signature", year=year, layer=layer_name):
+        signature = {
+            "parcels": _frame_signature(parcels, [key]),
+            "layer": _frame_signature(layer, list(layer.columns.drop(layer.geometry.name))),
+        }
+    if not rebuild and data_path.exists() and meta_path.exists():
+        if json.loads(meta_path.read_text()).get("signature") == signature:
+            print(f"[INFO] Loaded overlay {name} from cache.")
+            return pd.read_parquet(data_path)
+        print(f"[INFO] Cached overlay {name} does not match the parcels or layer; rebuilding.")
+
+    result = overlay_parcels(parcels, layer, how=how, columns=columns, key=key, tiles=tiles, workers=workers)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp = data_path.with_name(data_path.name + ".tmp")
+    result.to_parquet(tmp)
+    tmp.replace(data_path)
+    meta_path.write_text(json.dumps({"year": year, "layer": layer_name, "how": how, "signature": signature}, indent=2))
+    print(f"[SUCCESS] {how} overlay of {len(parcels)} parcels with {len(layer)} {layer_name} features ({len(result)} rows).")
+    return result
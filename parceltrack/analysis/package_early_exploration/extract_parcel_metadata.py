@@ -1,41 +1,142 @@
 #parceltrack/analysis/extract_parcel_metadata.py
 
 from parceltrack.configs.paths import ProjectPaths
+from parceltrack.io.archive import file_signature, path_exists, split_archive_path, vsi_path
 
 import pandas as pd
 from pathlib import Path
+import ast
 from collections import defaultdict
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Union
+import json
+import os
+import posixpath
 import re
+import zipfile
 import geopandas as gpd
+import pyogrio
 import warnings
 warnings.filterwarnings("ignore", category=RuntimeWarning)
 
 
-def build_shapefile_tree_with_paths(directory: Path) -> List[Dict[str, str]]:
-    def recurse(folder: Path, rel_parts: List[str]) -> List[Dict[str, str]]:
-        records = []
-        for subfolder in folder.iterdir():
-            if subfolder.is_dir():
-                shapefiles = [f.name for f in subfolder.glob("*.shp")]
-                if shapefiles:
-                    full_path = Path(*rel_parts, subfolder.name)
-                    for shp in shapefiles:
-                        records.append({
-                            "Year": infer_year(rel_parts[0]),
-                            "FullPath": str(full_path),
-                            "Shapefile": shp
-                        })
-                # Recurse further
-                records.extend(recurse(subfolder, rel_parts + [subfolder.name]))
-        return records
-
-    all_records = []
-    for year_folder in directory.iterdir():
-        if year_folder.is_dir():
-            all_records.extend(recurse(year_folder, [year_folder.name]))
-
-    return pd.DataFrame(all_records)
+TREE_MANIFEST_NAME = "shapefile_tree_manifest.json"
+
+def _scan_zip(zip_path: Path) -> List[List[str]]:
+    """(inner folder, shapefile name) pairs for every .shp member of a zip archive."""
+    with zipfile.ZipFile(zip_path) as archive:
+        members = [name for name in archive.namelist() if name.lower().endswith(".shp")]
+    return [[posixpath.dirname(name), posixpath.basename(name)] for name in members]
+
+def build_shapefile_tree_with_paths(
+    directory: Path,
+    include_zips: bool = True,
+    manifest_path: Union[Path, None] = None
+) -> pd.DataFrame:
+    """
+    Inventory every shapefile below the year folders (and year archives) of `directory`.
+
+    Walks the tree once with `os.scandir`. A manifest of directory mtimes (and zip
+    size/mtime) from the previous run is kept next to the data: a directory whose mtime
+    is unchanged is not listed again, its shapefiles, subfolders and archives are taken
+    from the manifest, and only its subfolders are stat-ed for changes.
+
+    Zip archives are listed without extracting them. Their shapefiles are recorded with
+    the archive as part of 'FullPath' (e.g. 'BACIparcels0821.zip/BACIPOLY'). An archive
+    next to a folder of the same name (already extracted) is skipped.
+
+    Parameters:
+        directory (Path): Raw data folder whose subfolders / .zip files are per year.
+        include_zips (bool): Also list shapefiles inside .zip archives.
+        manifest_path (Path | None): Manifest location. Defaults to
+            `directory / 'shapefile_tree_manifest.json'`.
+
+    Returns:
+        pd.DataFrame: One row per shapefile with 'Year', 'FullPath' (folder relative to
+            `directory`) and 'Shapefile'.
+    """
+    directory = Path(directory)
+    manifest_path = Path(manifest_path) if manifest_path else directory / TREE_MANIFEST_NAME
+    try:
+        previous = json.loads(manifest_path.read_text())
+    except (OSError, ValueError):
+        previous = {}
+    old_dirs, old_zips = previous.get("dirs", {}), previous.get("zips", {})
+    new_dirs, new_zips = {}, {}
+
+    def list_dir(rel: str) -> Dict:
+        path = directory / rel if rel else directory
+        mtime = path.stat().st_mtime_ns
+        cached = old_dirs.get(rel)
+        if cached is not None and cached["mtime_ns"] == mtime:
+            entry = cached
+        else:
+            entry = {"mtime_ns": mtime, "subdirs": [], "shapefiles": [], "zips": []}
+            with os.scandir(path) as it:
+                for item in it:
+                    if item.is_dir():
+                        entry["subdirs"].append(item.name)
+                    elif item.name.lower().endswith(".shp"):
+                        entry["shapefiles"].append(item.name)
+                    elif item.name.lower().endswith(".zip"):
+                        entry["zips"].append(item.name)
+            for key in ("subdirs", "shapefiles", "zips"):
+                entry[key].sort()
+        new_dirs[rel] = entry
+        return entry
+
+    def list_zip(rel: str) -> List[List[str]]:
+        stat = (directory / rel).stat()
+        cached = old_zips.get(rel)
+        if cached is not None and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+            entry = cached
+        else:
+            entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "members": _scan_zip(directory / rel)}
+        new_zips[rel] = entry
+        return entry["members"]
+
+    records = []
+    root = list_dir("")
+    years = {}
+
+    def year_of(top: str) -> int:
+        if top not in years:
+            years[top] = infer_year(top)
+        return years[top]
+
+    def add_zip(rel_zip: str, top: str):
+        for inner_dir, shp in list_zip(rel_zip):
+            records.append({
+                "Year": year_of(top),
+                "FullPath": str(Path(rel_zip, inner_dir)),
+                "Shapefile": shp
+            })
+
+    stack = [(name, name) for name in reversed(root["subdirs"])]
+    while stack:
+        rel, top = stack.pop()
+        entry = list_dir(rel)
+        for shp in entry["shapefiles"]:
+            records.append({"Year": year_of(top), "FullPath": rel, "Shapefile": shp})
+        if include_zips:
+            for zip_name in entry["zips"]:
+                if Path(zip_name).stem not in entry["subdirs"]:
+                    add_zip(str(Path(rel, zip_name)), top)
+        stack.extend((str(Path(rel, sub)), top) for sub in reversed(entry["subdirs"]))
+
+    if include_zips:
+        for zip_name in root["zips"]:
+            if Path(zip_name).stem not in root["subdirs"]:
+                add_zip(zip_name, Path(zip_name).stem)
+
+    manifest = {"dirs": new_dirs, "zips": new_zips}
+    try:
+        if manifest != previous:
+            manifest_path.write_text(json.dumps(manifest))
+    except OSError as e:
+        print(f"[WARNING] Could not write {manifest_path}: {e}")
+
+    return pd.DataFrame(records, columns=["Year", "FullPath", "Shapefile"])
 
 def infer_year(folder_name: str) -> int:
     # Case 1: BACIQ198 → 1998
@@ -90,14 +191,98 @@ def generate_flags(shapefile_tree: pd.DataFrame) -> pd.DataFrame:
 
     return summary
 
+SHAPEFILE_SIDECARS = (".shp", ".shx", ".dbf", ".prj")
+
+def shapefile_signature(full_path: Path) -> Dict[str, int]:
+    """Total size and latest mtime of a shapefile and its sidecar files (of its archive for a zip member)."""
+    if not full_path.exists() and split_archive_path(full_path)[0] is not None:
+        signature = file_signature(full_path)
+        return {"SizeBytes": signature["size"], "MTimeNs": signature["mtime_ns"]}
+    size, mtime = 0, 0
+    for suffix in SHAPEFILE_SIDECARS:
+        part = full_path.with_suffix(suffix)
+        if part.exists():
+            stat = part.stat()
+            size += stat.st_size
+            mtime = max(mtime, stat.st_mtime_ns)
+    return {"SizeBytes": size, "MTimeNs": mtime}
+
+def inspect_shapefile(full_path: Path, header_only: bool = True) -> Dict:
+    """
+    Metadata for one shapefile.
+
+    With `header_only`, everything comes from the layer info (feature count, schema,
+    CRS, extent) and no features are read. Otherwise the file is fully loaded and the
+    geometry type is the most common one among its features.
+    """
+    record = {"NumFeatures": None, "Columns": None, "GeometryType": None, "CRS": None, "Bounds": None}
+    try:
+        if header_only:
+            info = pyogrio.read_info(vsi_path(full_path), force_total_bounds=True)
+            record["NumFeatures"] = info["features"]
+            record["Columns"] = [str(c) for c in info["fields"]] + ["geometry"]
+            record["GeometryType"] = info["geometry_type"]
+            record["CRS"] = info["crs"]
+            record["Bounds"] = [float(v) for v in info["total_bounds"]] if info["total_bounds"] is not None else None
+        else:
+            gdf = gpd.read_file(vsi_path(full_path))
+            record["NumFeatures"] = len(gdf)
+            record["Columns"] = [str(c) for c in gdf.columns]
+            record["GeometryType"] = gdf.geometry.geom_type.mode()[0] if not gdf.empty else None
+            record["CRS"] = str(gdf.crs) if gdf.crs else None
+            record["Bounds"] = [float(v) for v in gdf.total_bounds] if not gdf.empty else None
+    except Exception as e:
+        record["Error"] = str(e)
+    return record
+
 #parsing an individual shapefile
-def get_shapefile_metadata(shapefile_tree: pd.DataFrame, base_dir: Path) -> pd.DataFrame:
+def _parse_list(value) -> Union[list, None]:
+    """
+    A 'Columns'/'Bounds' value as a list, also when it was read back from a CSV.
+
+    CSVs hold the list's repr; older ones may contain numpy scalar reprs such as
+    `np.str_('ACCTID')` or `np.float64(1.5)`, which are unwrapped before parsing.
+    """
+    if isinstance(value, list):
+        return value
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return list(ast.literal_eval(re.sub(r"np\.\w+\(([^()]*)\)", r"\1", value)))
+
+# Signature columns stay nullable integers: nanosecond mtimes (~1.7e18) do not survive
+# a round trip through float64, which pandas would otherwise use once a row lacks them.
+SIGNATURE_DTYPES = {"SizeBytes": "Int64", "MTimeNs": "Int64"}
+
+def _same_signature(cached: Dict, record: Dict) -> bool:
+    return all(
+        pd.notna(cached.get(col)) and int(cached[col]) == record[col]
+        for col in SIGNATURE_DTYPES
+    )
+
+def get_shapefile_metadata(
+    shapefile_tree: pd.DataFrame,
+    base_dir: Path,
+    header_only: bool = True,
+    workers: int = 8,
+    previous: Union[pd.DataFrame, Path, None] = None
+) -> pd.DataFrame:
     """
-    For each shapefile listed in the DataFrame, read the file and extract metadata.
+    For each shapefile listed in the DataFrame, extract metadata.
+
+    Shapefiles inside zip archives (FullPath running through a `.zip`, as listed by
+    `build_shapefile_tree_with_paths`) are inspected in place through GDAL's /vsizip/.
+
+    By default only layer headers are read (no geometry is parsed), files are inspected
+    concurrently, and rows of a previous run whose file size and mtime are unchanged
+    are reused as-is.
 
     Parameters:
         shapefile_tree (pd.DataFrame): Must contain columns 'FullPath' and 'Shapefile'
         base_dir (Path): Root directory to prepend to 'FullPath'
+        header_only (bool): Read layer info only; False loads every file with geopandas.
+        workers (int): Number of files inspected concurrently.
+        previous (pd.DataFrame | Path | None): An earlier result (or its CSV, e.g.
+            `shapefile_metadata.csv`) to reuse unchanged rows from.
 
     Returns:
         pd.DataFrame: Metadata for each shapefile including:
@@ -108,47 +293,52 @@ def get_shapefile_metadata(shapefile_tree: pd.DataFrame, base_dir: Path) -> pd.D
             - Columns (list or None)
             - GeometryType (str or None)
             - CRS (str or None)
+            - Bounds (list or None)
+            - SizeBytes, MTimeNs (int): Signature used for incremental runs
     """
-    metadata_records = []
+    if isinstance(previous, (str, Path)):
+        previous = pd.read_csv(previous, dtype=SIGNATURE_DTYPES) if Path(previous).exists() else None
+    reusable = {}
+    if previous is not None and {"SizeBytes", "MTimeNs"}.issubset(previous.columns):
+        for record in previous.to_dict("records"):
+            record["Columns"] = _parse_list(record.get("Columns"))
+            record["Bounds"] = _parse_list(record.get("Bounds"))
+            reusable[(str(record["FullPath"]), record["Shapefile"])] = record
 
-    for _, row in shapefile_tree.iterrows():
-        rel_path = Path(row["FullPath"]) / row["Shapefile"]
-        full_path = base_dir / rel_path
-        if row['Year'] < 2021:
-            print(row['Year'])
-            print('skipping to next row')
-            continue
-        
+    metadata_records = []
+    to_inspect = []
+    for row in shapefile_tree[["FullPath", "Shapefile"]].itertuples(index=False):
+        full_path = base_dir / Path(row.FullPath) / row.Shapefile
         record = {
-            "FullPath": str(row["FullPath"]),
-            "Shapefile": row["Shapefile"],
-            "Exists": full_path.exists()
+            "FullPath": str(row.FullPath),
+            "Shapefile": row.Shapefile,
+            "Exists": path_exists(full_path)
         }
-        # continue
-        if full_path.exists():
-            try:
-                print(f'reading in {full_path}')
-                gdf = gpd.read_file(full_path)
-                record["NumFeatures"] = len(gdf)
-                record["Columns"] = list(gdf.columns)
-                record["GeometryType"] = gdf.geometry.geom_type.mode()[0] if not gdf.empty else None
-                record["CRS"] = str(gdf.crs) if gdf.crs else None
-            except Exception as e:
-                record["NumFeatures"] = None
-
-                record["Columns"] = None
-                record["GeometryType"] = None
-                record["CRS"] = None
-                record["Error"] = str(e)
-        else:
-            record["NumFeatures"] = None
-            record["Columns"] = None
-            record["GeometryType"] = None
-            record["CRS"] = None
-
+        if record["Exists"]:
+            record.update(shapefile_signature(full_path))
+            cached = reusable.get((record["FullPath"], record["Shapefile"]))
+            if (
+                cached is not None
+                and _same_signature(cached, record)
+                and pd.isna(cached.get("Error"))
+            ):
+                record = cached
+            else:
+                to_inspect.append((len(metadata_records), full_path))
         metadata_records.append(record)
 
-    return pd.DataFrame(metadata_records)
+    print(f"Inspecting {len(to_inspect)} of {len(metadata_records)} shapefiles "
+          f"({len(metadata_records) - len(to_inspect)} unchanged)...")
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        inspected = pool.map(lambda job: inspect_shapefile(job[1], header_only=header_only), to_inspect)
+        for (i, _), info in zip(to_inspect, inspected):
+            metadata_records[i].update(info)
+
+    df = pd.DataFrame(metadata_records)
+    for col, dtype in SIGNATURE_DTYPES.items():
+        if col in df.columns:
+            df[col] = pd.array([record.get(col) for record in metadata_records], dtype=dtype)
+    return df
 
 if __name__ == '__main__':
     get_inventory = False
@@ -165,5 +355,5 @@ if __name__ == '__main__':
     
     print(f"{shapefile_tree.shape=}")
 
-    df_meta = get_shapefile_metadata(shapefile_tree, base_dir=paths.raw)
+    df_meta = get_shapefile_metadata(shapefile_tree, base_dir=paths.raw, previous=paths.raw / 'shapefile_metadata.csv')
     df_meta.to_csv(paths.raw / 'shapefile_metadata.csv', index=False)
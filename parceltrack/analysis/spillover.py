@@ -0,0 +1,191 @@
+# parceltrack/analysis/spillover.py
+
+"""
+Neighbour spillover / event-study scores over the parcel panel.
+
+Implements the "event at a focal parcel at T, neighbour outcomes at T+1" logic from
+proposalmapnotes.md. Events and outcomes are pivoted to dense (parcel x year) arrays
+aligned to the row order of a spatial weights matrix, and every spatial lag is a
+single sparse-matrix / dense-array product covering all parcels and all year pairs.
+
+Example:
+    from parceltrack.analysis import build_panel, build_weights, event_flags, spillover_scores
+    panel = build_panel(geoms, columns=["NFMTTLVL", "ZONING"])
+    panel = panel.join(event_flags(panel))
+    W, ids = build_weights(geoms[2021], method="queen", standardize=False)
+    scores = spillover_scores(panel, W, ids, events=["value_jump", "rezoned"], outcomes=["NFMTTLVL"])
+"""
+
+from typing import List, Union
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+def _wide(panel: pd.DataFrame, column: str, ids: np.ndarray, years: List) -> pd.DataFrame:
+    """(parcel x year) view of a panel column, rows in `ids` order."""
+    key = panel.index.names[1]
+    wide = panel[column].unstack("Year").reindex(columns=years)
+    return wide.reindex(pd.Index(ids, name=key))
+
+
+def event_flags(
+    panel: pd.DataFrame,
+    value_col: str = "NFMTTLVL",
+    jump_threshold: float = 0.25,
+    zoning_col: str = "ZONING",
+    sale_col: Union[str, None] = None
+) -> pd.DataFrame:
+    """
+    Derive per-year event flags from the panel (an event at T compares T with T-1).
+
+    Args:
+        panel (pd.DataFrame): ('Year', key)-indexed panel, e.g. from `build_panel`.
+        value_col (str): Value column for 'value_jump'.
+        jump_threshold (float): Relative increase that counts as a value jump.
+        zoning_col (str): Zoning column for 'rezoned'.
+        sale_col (str | None): Column that changes on a sale (e.g. a transfer date) for 'sale'.
+
+    Returns:
+        pd.DataFrame: Boolean 'value_jump', 'rezoned' and (if `sale_col`) 'sale' columns,
+            on the panel's index. The first year has no events.
+    """
+    years = sorted(panel.index.get_level_values("Year").unique())
+    ids = panel.index.get_level_values(1).unique().to_numpy()
+    flags = {}
+
+    if value_col in panel.columns:
+        values = _wide(panel, value_col, ids, years).to_numpy(dtype=float)
+        previous = np.column_stack([np.full(len(ids), np.nan), values[:, :-1]])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            growth = (values - previous) / previous
+        flags["value_jump"] = np.nan_to_num(growth, nan=0.0) > jump_threshold
+
+    for name, column in (("rezoned", zoning_col), ("sale", sale_col)):
+        if column is None or column not in panel.columns:
+            continue
+        wide = _wide(panel, column, ids, years)
+        current, previous = wide.iloc[:, 1:].to_numpy(), wide.iloc[:, :-1].to_numpy()
+        both = ~pd.isna(current) & ~pd.isna(previous)
+        changed = np.zeros(wide.shape, dtype=bool)
+        changed[:, 1:] = both & (current != previous)
+        flags[name] = changed
+
+    key = panel.index.names[1]
+    index = pd.MultiIndex.from_product([ids, years], names=[key, "Year"])
+    out = pd.DataFrame({name: flag.ravel() for name, flag in flags.items()}, index=index)
+    out = out.swaplevel().sort_index()
+    return out.reindex(panel.index)
+
+
+def _spatial_aggregates(W: sparse.csr_matrix, values: np.ndarray, normalize: bool) -> np.ndarray:
+    """W @ values with missing values skipped; optionally divided by the weight of non-missing neighbours."""
+    valid = ~np.isnan(values)
+    totals = W @ np.where(valid, values, 0.0)
+    if not normalize:
+        return totals
+    weight = W @ valid.astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(weight > 0, totals / weight, np.nan)
+
+
+def spillover_scores(
+    panel: pd.DataFrame,
+    W: sparse.spmatrix,
+    ids: np.ndarray,
+    events: List[str],
+    outcomes: List[str],
+    W_decay: Union[sparse.spmatrix, None] = None,
+    relative: bool = False
+) -> pd.DataFrame:
+    """
+    Neighbour exposure and response for every parcel and every consecutive year pair.
+
+    For each pair (T, T+1):
+
+    - '<event>_exposure_mean' / '_sum' / '_decay': share, count and distance-weighted
+      share of neighbours with the event at T.
+    - '<outcome>_change': the parcel's own outcome change from T to T+1.
+    - '<outcome>_neighbor_change_mean' / '_sum' / '_decay': the same over neighbours.
+    - '<event>_<outcome>_reactivity': neighbours' mean outcome change for parcels with
+      the event at T (NaN for parcels without it).
+
+    Args:
+        panel (pd.DataFrame): ('Year', key)-indexed panel holding the event and outcome columns.
+        W (sparse matrix): Contiguity/knn/distance weights; its pattern defines neighbours.
+        ids (np.ndarray): Parcel ids in W's row order. Panel rows for other ids are ignored.
+        events (list[str]): Event columns (bool or 0/1).
+        outcomes (list[str]): Numeric outcome columns.
+        W_decay (sparse matrix | None): Distance-decayed weights (same ids) for the '_decay' columns.
+        relative (bool): Use relative instead of absolute outcome changes.
+
+    Returns:
+        pd.DataFrame: Tidy frame with key, 'Year' (T), 'NextYear' (T+1), the event flags and
+            the columns above.
+    """
+    years = sorted(panel.index.get_level_values("Year").unique())
+    if len(years) < 2:
+        raise ValueError("Spillover scores need at least two years.")
+    key = panel.index.names[1]
+    W = sparse.csr_matrix(W)
+    binary = W.copy()
+    binary.data = np.ones_like(binary.data)
+    aggregates = {"mean": (binary, True), "sum": (binary, False)}
+    if W_decay is not None:
+        aggregates["decay"] = (sparse.csr_matrix(W_decay), True)
+
+    n, pairs = len(ids), len(years) - 1
+    columns = {}
+
+    # Stack every event (n x pairs) side by side so each W needs a single product.
+    event_arrays = [_wide(panel, e, ids, years).to_numpy(dtype=float)[:, :-1] for e in events]
+    for e, arr in zip(events, event_arrays):
+        columns[e] = arr
+    if events:
+        stacked = np.hstack(event_arrays)
+        for agg, (matrix, normalize) in aggregates.items():
+            lagged = _spatial_aggregates(matrix, stacked, normalize)
+            for k, e in enumerate(events):
+                columns[f"{e}_exposure_{agg}"] = lagged[:, k * pairs:(k + 1) * pairs]
+
+    changes = []
+    for o in outcomes:
+        values = _wide(panel, o, ids, years).to_numpy(dtype=float)
+        change = values[:, 1:] - values[:, :-1]
+        if relative:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                change = np.where(values[:, :-1] != 0, change / values[:, :-1], np.nan)
+        columns[f"{o}_change"] = change
+        changes.append(change)
+    if outcomes:
+        stacked = np.hstack(changes)
+        neighbor_means = None
+        for agg, (matrix, normalize) in aggregates.items():
+            lagged = _spatial_aggregates(matrix, stacked, normalize)
+            if agg == "mean":
+                neighbor_means = lagged
+            for k, o in enumerate(outcomes):
+                columns[f"{o}_neighbor_change_{agg}"] = lagged[:, k * pairs:(k + 1) * pairs]
+
+        for e, arr in zip(events, event_arrays):
+            for k, o in enumerate(outcomes):
+                response = neighbor_means[:, k * pairs:(k + 1) * pairs]
+                columns[f"{e}_{o}_reactivity"] = np.where(arr > 0, response, np.nan)
+
+    out = pd.DataFrame({
+        key: np.repeat(ids, pairs),
+        "Year": np.tile(years[:-1], n),
+        "NextYear": np.tile(years[1:], n),
+    })
+    for name, arr in columns.items():
+        out[name] = arr.ravel()
+    for e in events:
+        out[e] = out[e].fillna(0).astype(bool)
+    return out
+
+
+def summarize_reactivity(scores: pd.DataFrame, by: Union[str, List[str], None] = None) -> pd.DataFrame:
+    """Mean and count of every reactivity column per year pair (and optional grouping)."""
+    groups = ["Year", "NextYear"] + ([by] if isinstance(by, str) else list(by or []))
+    cols = [c for c in scores.columns if c.endswith("_reactivity")]
+    return scores.groupby(groups)[cols].agg(["mean", "count"])
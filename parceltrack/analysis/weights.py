@@ -0,0 +1,199 @@
+# parceltrack/analysis/weights.py
+
+"""
+Sparse spatial weights (W) over a year's parcels.
+
+Builds queen/rook contiguity, k-nearest-neighbour and distance-band weights as
+`scipy.sparse` CSR matrices, using an STRtree (contiguity) or a KD-tree on parcel
+centroids (knn, distance band) instead of all-pairs distances. Rows and columns
+follow the order of the returned ids.
+
+Example:
+    from parceltrack.analysis import load_or_build_weights
+    W, ids = load_or_build_weights(parcels_2021, year=2021, method="queen")
+    lag = W @ parcels_2021.set_index("ACCTID").loc[ids, "NFMTTLVL"].to_numpy()
+"""
+
+from pathlib import Path
+from typing import Tuple, Union
+import geopandas as gpd
+import hashlib
+import json
+import numpy as np
+import shapely
+from scipy import sparse
+from scipy.spatial import cKDTree
+
+from parceltrack.configs.paths import ProjectPaths
+
+METHODS = ("queen", "rook", "knn", "distance")
+
+
+def _contiguity_pairs(geoms: np.ndarray, rook: bool, tolerance: float):
+    """Unique (i < j) pairs of parcels sharing a point (queen) or an edge (rook)."""
+    tree = shapely.STRtree(geoms)
+    if tolerance:
+        i, j = tree.query(geoms, predicate="dwithin", distance=tolerance)
+    else:
+        i, j = tree.query(geoms, predicate="intersects")
+    upper = i < j
+    i, j = i[upper], j[upper]
+
+    if rook:
+        # Boundaries must share a line, not just a vertex. With a tolerance, each pair
+        # is first snapped together (a onto b, then b onto the snapped a), so edges
+        # within the tolerance of each other coincide, also where they only partly
+        # overlap, while parcels meeting at a corner still share only a point.
+        a, b = geoms[i], geoms[j]
+        if tolerance:
+            a = shapely.snap(a, b, tolerance)
+            b = shapely.snap(b, a, tolerance)
+        shared_edge = shapely.relate_pattern(a, b, "****1****")
+        i, j = i[shared_edge], j[shared_edge]
+    return i, j
+
+
+def _decay_weights(distances: np.ndarray, decay: Union[str, None], alpha: float, bandwidth: Union[float, None]):
+    if decay is None:
+        return np.ones_like(distances)
+    if decay == "inverse":
+        return 1.0 / np.power(np.maximum(distances, 1e-9), alpha)
+    if decay == "exponential":
+        if not bandwidth:
+            raise ValueError("Exponential decay requires a bandwidth.")
+        return np.exp(-distances / bandwidth)
+    raise ValueError(f"Unsupported decay: {decay}")
+
+
+def row_standardize(W: sparse.csr_matrix) -> sparse.csr_matrix:
+    """Scale each row to sum to 1 (rows without neighbours stay zero)."""
+    sums = np.asarray(W.sum(axis=1)).ravel()
+    scale = np.divide(1.0, sums, out=np.zeros_like(sums, dtype=float), where=sums > 0)
+    return sparse.diags(scale) @ W
+
+
+def build_weights(
+    gdf: gpd.GeoDataFrame,
+    method: str = "queen",
+    id_col: str = "ACCTID",
+    k: int = 8,
+    threshold: Union[float, None] = None,
+    tolerance: float = 0.0,
+    decay: Union[str, None] = None,
+    alpha: float = 1.0,
+    bandwidth: Union[float, None] = None,
+    standardize: bool = True
+) -> Tuple[sparse.csr_matrix, np.ndarray]:
+    """
+    Build a sparse spatial weights matrix over a year's parcels.
+
+    Args:
+        gdf (gpd.GeoDataFrame): One year of parcels, in a projected CRS.
+        method (str): 'queen', 'rook', 'knn' or 'distance'.
+        id_col (str): Column holding parcel ids; row order of W follows it.
+        k (int): Neighbours per parcel for 'knn'.
+        threshold (float | None): Centroid distance band (CRS units) for 'distance'.
+        tolerance (float): Contiguity snapping distance, for parcels separated by tiny gaps.
+        decay (str | None): Distance decay for 'knn'/'distance': None (binary),
+            'inverse' (1 / d**alpha) or 'exponential' (exp(-d / bandwidth)).
+        alpha (float): Exponent for inverse decay.
+        bandwidth (float | None): Scale for exponential decay.
+        standardize (bool): Row-standardize W.
+
+    Returns:
+        tuple: (W as an n x n CSR matrix, ids as an array in row order).
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unsupported method: {method}")
+    if gdf.crs is not None and gdf.crs.is_geographic:
+        print("[WARNING] Building weights on a geographic CRS; distances are in degrees.")
+
+    n = len(gdf)
+    geoms = np.asarray(gdf.geometry.values)
+    ids = gdf[id_col].to_numpy() if id_col in gdf.columns else np.asarray(gdf.index)
+
+    if method in ("queen", "rook"):
+        i, j = _contiguity_pairs(geoms, rook=method == "rook", tolerance=tolerance)
+        values = np.ones(len(i))
+        rows, cols, values = np.concatenate([i, j]), np.concatenate([j, i]), np.concatenate([values, values])
+    else:
+        centroids = shapely.centroid(geoms)
+        points = np.column_stack([shapely.get_x(centroids), shapely.get_y(centroids)])
+        tree = cKDTree(points)
+        if method == "knn":
+            distances, neighbours = tree.query(points, k=min(k + 1, n))
+            # A single neighbour per point (k + 1 == 1) comes back as 1-D arrays.
+            distances, neighbours = distances.reshape(n, -1), neighbours.reshape(n, -1)
+            rows = np.repeat(np.arange(n), neighbours.shape[1])
+            cols, distances = neighbours.ravel(), distances.ravel()
+            not_self = rows != cols
+            rows, cols, distances = rows[not_self], cols[not_self], distances[not_self]
+        else:
+            if threshold is None:
+                raise ValueError("Distance-band weights require a threshold.")
+            pairs = tree.query_pairs(threshold, output_type="ndarray")
+            distances = np.hypot(*(points[pairs[:, 0]] - points[pairs[:, 1]]).T)
+            rows = np.concatenate([pairs[:, 0], pairs[:, 1]])
+            cols = np.concatenate([pairs[:, 1], pairs[:, 0]])
+            distances = np.concatenate([distances, distances])
+        values = _decay_weights(distances, decay, alpha, bandwidth)
+
+    W = sparse.csr_matrix((values, (rows, cols)), shape=(n, n))
+    if standardize:
+        W = row_standardize(W).tocsr()
+
+    islands = int((np.diff(W.indptr) == 0).sum())
+    print(f"[SUCCESS] {method} weights: {n} parcels, {W.nnz} links, {islands} without neighbours.")
+    return W, ids
+
+
+def weights_cache_name(year, method: str, **params) -> str:
+    """Cache file stem for a year and weights parameters."""
+    payload = json.dumps({"method": method, **{k: str(v) for k, v in sorted(params.items())}}, sort_keys=True)
+    return f"W_{year}_{method}_{hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]}"
+
+
+def load_or_build_weights(
+    gdf: gpd.GeoDataFrame,
+    year,
+    method: str = "queen",
+    cache_dir: Union[str, Path, None] = None,
+    rebuild: bool = False,
+    **params
+) -> Tuple[sparse.csr_matrix, np.ndarray]:
+    """
+    Return cached weights for (year, method, params), building and caching them on a miss.
+
+    The matrix is stored as `<name>.npz` with the id order in `<name>_ids.npy`. A cached
+    matrix is only reused if its ids match the current parcels in the same order.
+
+    Args:
+        gdf (gpd.GeoDataFrame): One year of parcels.
+        year (int): Year the parcels belong to (part of the cache key).
+        method (str): See `build_weights`.
+        cache_dir (str | Path | None): Defaults to `data/processed/weights`.
+        rebuild (bool): Ignore any cached matrix.
+        **params: Passed to `build_weights` and part of the cache key.
+
+    Returns:
+        tuple: (W, ids), as returned by `build_weights`.
+    """
+    cache_dir = Path(cache_dir) if cache_dir else ProjectPaths().processed / "weights"
+    name = weights_cache_name(year, method, **params)
+    matrix_path, ids_path = cache_dir / f"{name}.npz", cache_dir / f"{name}_ids.npy"
+
+    id_col = params.get("id_col", "ACCTID")
+    current_ids = gdf[id_col].to_numpy() if id_col in gdf.columns else np.asarray(gdf.index)
+
+    if not rebuild and matrix_path.exists() and ids_path.exists():
+        cached_ids = np.load(ids_path, allow_pickle=False)
+        if len(cached_ids) == len(current_ids) and (cached_ids == current_ids.astype(str)).all():
+            print(f"[INFO] Loaded weights {name} from cache.")
+            return sparse.load_npz(matrix_path).tocsr(), current_ids
+        print(f"[INFO] Cached weights {name} do not match the parcels; rebuilding.")
+
+    W, ids = build_weights(gdf, method=method, **params)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    sparse.save_npz(matrix_path, W)
+    np.save(ids_path, ids.astype(str), allow_pickle=False)
+    return W, ids
@@ -6,6 +6,9 @@ ProjectPaths utility
 Centralized directory manager for the ParcelMicroAnalysis project. 
 Resolves all key folders (data, notebooks, scripts, etc.) relative to the project root.
 
+Resolving paths has no filesystem side effects; pass `create_dirs=True` (or call
+`ensure_dirs()`) to create the folders, e.g. when setting up a fresh checkout.
+
 Example:
     from parceltrack.configs.paths import ProjectPaths
     paths = ProjectPaths()
@@ -15,7 +18,7 @@ Example:
 from pathlib import Path
 
 class ProjectPaths:
-    def __init__(self, root: Path = None):
+    def __init__(self, root: Path = None, create_dirs: bool = False):
         self.root = root or Path(__file__).resolve().parents[2]  # <- Now inside parceltrack/configs
 
         # Top-level project directories
@@ -34,8 +37,8 @@ class ProjectPaths:
         self.visuals = self.package / "visualization"
         self.io = self.package / 'io'
 
-        # Automatically create dirs
-        self.ensure_dirs()
+        if create_dirs:
+            self.ensure_dirs()
 
     def __repr__(self):
         return f"<ProjectPaths root={self.root}>"
@@ -0,0 +1,315 @@
+# parceltrack/instrumentation.py
+
+"""
+Stage-level timing and memory instrumentation.
+
+Pipeline code wraps its steps in `stage(...)` (or decorates functions with
+`instrumented`). While instrumentation is enabled, every stage records its wall
+time, row count, RSS at start/end and peak RSS, plus any context passed in (file,
+year, ...), and hands the record to the registered sinks. While it is disabled,
+`stage` returns a shared no-op object, so an instrumented call costs one flag check.
+
+Peak RSS is per stage on Linux, where the kernel's high-water mark can be reset at
+stage start; elsewhere it is the process high-water mark at the end of the stage.
+Stages nest per thread. The high-water mark is process-wide, though, so a stage that
+overlaps a stage of another thread gets no peak (`peak_scope` 'concurrent').
+Stages run inside process-pool workers are not collected; callers that know a
+worker's timings can add them with `record`.
+
+Example:
+    from parceltrack import instrumentation as inst
+    inst.enable(sink=inst.logging_sink())
+    geoms = load_processed_years(paths.processed, [2021, 2022], workers=4)
+    inst.report("reports/run_report.csv")
+    inst.disable()
+"""
+
+from pathlib import Path
+from typing import Callable, Dict, List, Union
+import functools
+import json
+import logging
+import sys
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+_STATE = {"enabled": False, "memory": True, "sinks": [], "records": []}
+# Open stages: per thread for nesting, and all of them for spotting overlap between threads.
+_LOCAL = threading.local()
+_ACTIVE = {}
+_ACTIVE_LOCK = threading.Lock()
+_CLEAR_REFS = Path("/proc/self/clear_refs")
+_PROC_STATUS = Path("/proc/self/status")
+
+
+def _rss_mb() -> Union[float, None]:
+    return psutil.Process().memory_info().rss / 1024 / 1024 if psutil else None
+
+
+def _reset_peak() -> bool:
+    """Reset the kernel's RSS high-water mark (Linux only)."""
+    try:
+        _CLEAR_REFS.write_text("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_mb() -> Union[float, None]:
+    """RSS high-water mark of the process, in MB."""
+    try:
+        for line in _PROC_STATUS.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+    return None
+
+
+def _stack() -> list:
+    stack = getattr(_LOCAL, "stack", None)
+    if stack is None:
+        stack = _LOCAL.stack = []
+    return stack
+
+
+class _NullStage:
+    """Stand-in returned by `stage` while instrumentation is disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **values):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("record", "_start", "_child_peak", "concurrent")
+
+    def __init__(self, name: str, context: Dict):
+        self.record = {"stage": name, **context}
+        self._child_peak = None
+        self.concurrent = False
+
+    def set(self, **values):
+        """Attach values (e.g. `rows=len(gdf)`) to the stage record."""
+        self.record.update(values)
+
+    def _merge_peak(self, peak):
+        if peak is not None:
+            self._child_peak = peak if self._child_peak is None else max(self._child_peak, peak)
+
+    def _register(self) -> bool:
+        """Mark this stage and other threads' open stages as concurrent if they overlap."""
+        thread = threading.get_ident()
+        with _ACTIVE_LOCK:
+            others = any(t != thread for t in _ACTIVE)
+            if others:
+                self.concurrent = True
+                for stages in _ACTIVE.values():
+                    for other in stages:
+                        other.concurrent = True
+            _ACTIVE.setdefault(thread, []).append(self)
+        return not others
+
+    def _unregister(self):
+        thread = threading.get_ident()
+        with _ACTIVE_LOCK:
+            stages = _ACTIVE.get(thread, [])
+            if self in stages:
+                stages.remove(self)
+            if not stages:
+                _ACTIVE.pop(thread, None)
+
+    def __enter__(self):
+        stack = _stack()
+        alone = self._register()
+        if stack and _STATE["memory"] and alone:
+            # Keep the parent's peak so far before this stage resets the high-water mark.
+            stack[-1]._merge_peak(_peak_mb())
+        self.record["parent"] = stack[-1].record["stage"] if stack else None
+        self.record["depth"] = len(stack)
+        stack.append(self)
+        if _STATE["memory"]:
+            self.record["rss_start_mb"] = _rss_mb()
+            # Resetting the high-water mark while another thread's stage is open would
+            # erase that stage's peak.
+            self.record["peak_scope"] = "stage" if alone and _reset_peak() else "process"
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.record["seconds"] = time.perf_counter() - self._start
+        self.record["status"] = "success" if exc_type is None else f"failure: {exc_type.__name__}"
+        stack = _stack()
+        stack.pop()
+        self._unregister()
+
+        if _STATE["memory"]:
+            self.record["rss_end_mb"] = _rss_mb()
+            if self.concurrent:
+                # The high-water mark is process-wide; it cannot be attributed to this stage.
+                self.record["peak_scope"] = "concurrent"
+                self.record["peak_rss_mb"] = None
+            else:
+                peak = _peak_mb()
+                if self._child_peak is not None and peak is not None:
+                    peak = max(peak, self._child_peak)
+                self.record["peak_rss_mb"] = peak
+                # A nested stage resets the high-water mark, so hand its peak up to the parent.
+                if stack:
+                    stack[-1]._merge_peak(peak)
+
+        _emit(self.record)
+        return False
+
+
+def _emit(entry: Dict):
+    _STATE["records"].append(entry)
+    for sink in _STATE["sinks"]:
+        try:
+            sink(entry)
+        except Exception as e:
+            print(f"[WARNING] Instrumentation sink failed: {e}")
+
+
+def enable(sink: Union[Callable[[Dict], None], None] = None, memory: bool = True):
+    """
+    Start recording stages.
+
+    Args:
+        sink (callable | None): Called with each finished stage record.
+        memory (bool): Record RSS and peak RSS (needs psutil for RSS).
+    """
+    _STATE["enabled"] = True
+    _STATE["memory"] = memory
+    if sink is not None:
+        _STATE["sinks"].append(sink)
+
+
+def disable():
+    """Stop recording and drop the sinks; recorded stages are kept until `reset`."""
+    _STATE["enabled"] = False
+    _STATE["sinks"] = []
+
+
+def is_enabled() -> bool:
+    return _STATE["enabled"]
+
+
+def reset():
+    """Forget all recorded stages."""
+    _STATE["records"] = []
+
+
+def stage(name: str, **context):
+    """
+    Context manager timing one pipeline stage.
+
+    Args:
+        name (str): Stage name, e.g. 'read' or 'reproject'.
+        **context: Extra fields stored with the record (file, year, ...).
+
+    Returns:
+        A context manager whose `set(**values)` attaches values such as `rows`.
+    """
+    if not _STATE["enabled"]:
+        return _NULL_STAGE
+    return _Stage(name, context)
+
+
+def instrumented(name: Union[str, None] = None):
+    """Decorator recording each call as a stage; `rows` is taken from the result's length."""
+    def decorator(fn):
+        stage_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _STATE["enabled"]:
+                return fn(*args, **kwargs)
+            with _Stage(stage_name, {}) as s:
+                result = fn(*args, **kwargs)
+                if hasattr(result, "__len__") and not isinstance(result, (str, bytes)):
+                    s.set(rows=len(result))
+                return result
+        return wrapper
+    return decorator
+
+
+def record(name: str, seconds: float, **values):
+    """Add a stage measured elsewhere (e.g. inside a worker process)."""
+    if _STATE["enabled"]:
+        stack = _stack()
+        _emit({"stage": name, "parent": stack[-1].record["stage"] if stack else None,
+               "depth": len(stack), "seconds": seconds, **values})
+
+
+def records() -> List[Dict]:
+    """The recorded stages, in completion order."""
+    return list(_STATE["records"])
+
+
+def report(path: Union[str, Path, None] = None):
+    """
+    Recorded stages as a DataFrame, optionally written to `path` (.csv, .json or .parquet).
+
+    Returns:
+        pd.DataFrame: One row per stage.
+    """
+    import pandas as pd
+
+    df = pd.DataFrame(_STATE["records"])
+    if path is not None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".json":
+            path.write_text(json.dumps(_STATE["records"], indent=2, default=str))
+        elif path.suffix == ".parquet":
+            df.astype({c: str for c in df.columns if df[c].dtype == object}).to_parquet(path, index=False)
+        else:
+            df.to_csv(path, index=False)
+        print(f"[SUCCESS] Wrote run report ({len(df)} stages) to {path}")
+    return df
+
+
+def summarize(by: Union[str, List[str]] = "stage"):
+    """Total seconds, calls, rows and max peak RSS per stage (or other columns)."""
+    df = report()
+    if df.empty:
+        return df
+    agg = {"seconds": ["sum", "count"]}
+    if "rows" in df.columns:
+        agg["rows"] = "sum"
+    if "peak_rss_mb" in df.columns:
+        agg["peak_rss_mb"] = "max"
+    return df.groupby(by, dropna=False).agg(agg).sort_values(("seconds", "sum"), ascending=False)
+
+
+def logging_sink(logger: Union[logging.Logger, None] = None, level: int = logging.INFO) -> Callable[[Dict], None]:
+    """Sink writing one log line per finished stage."""
+    logger = logger or logging.getLogger("parceltrack")
+
+    def sink(entry: Dict):
+        extra = {k: v for k, v in entry.items() if k not in ("stage", "seconds", "parent", "depth")}
+        logger.log(level, "%s%s: %.3fs %s", "  " * entry.get("depth", 0), entry["stage"], entry["seconds"], extra)
+    return sink
@@ -1,6 +1,65 @@
-from .load_geometry import (load_geometry,
-                            load_files_from_metdata,
-                            load_processed_year_files,
-                            save_geojson_per_year
-                        )
-__all__ = ["load_geometry", "load_files_from_metdata", "load_processed_year_files", "save_geojson_per_year"]
\ No newline at end of file
+# parceltrack/io/__init__.py
+
+"""
+Loaders, writers and caches for parcel geometries.
+
+Submodules are imported on first use (PEP 562), so `import parceltrack.io` does not
+pull in geopandas/pyarrow until one of the functions below is accessed.
+"""
+
+import importlib
+import sys
+import types
+
+_EXPORTS = {
+    "load_geometry": ".load_geometry",
+    "load_files_from_metdata": ".load_geometry",
+    "load_processed_year_files": ".load_geometry",
+    "load_processed_years": ".load_geometry",
+    "save_geojson_per_year": ".load_geometry",
+    "rebuild_cache": ".load_geometry",
+    "invalidate_cache": ".cache",
+    "vsi_path": ".archive",
+    "compact_dtypes": ".dtypes",
+    "memory_report": ".dtypes",
+    "unify_categories": ".dtypes",
+    "iter_file_batches": ".stream",
+    "iter_year_batches": ".stream",
+    "query": ".stream",
+    "query_years": ".stream",
+    "collect": ".stream",
+    "save_geometry_store": ".geomstore",
+    "load_store_years": ".geomstore",
+    "load_store_year": ".geomstore",
+    "build_cubes": ".cubes",
+    "query_cube": ".cubes",
+    "build_lod_levels": ".simplify",
+    "simplify_geometries": ".simplify",
+    "build_tiles": ".tiles",
+    "build_year_tiles": ".tiles",
+}
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+class _LazyPackage(types.ModuleType):
+    def __setattr__(self, name, value):
+        # Importing the `load_geometry` submodule binds it on the package, which would
+        # shadow the function of the same name; keep the function, as an eager import did.
+        if name in _EXPORTS and isinstance(value, types.ModuleType):
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _LazyPackage
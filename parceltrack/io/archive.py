@@ -0,0 +1,88 @@
+# parceltrack/io/archive.py
+
+"""
+Zip-aware paths for raw data that is kept in its original archives.
+
+A file inside an archive is addressed with an ordinary path that runs through the
+archive, e.g. `data/raw/BACIparcels0821.zip/BACIPOLY/BACIPOLY.shp` (this is how the
+shapefile inventory records zip members). When such a path does not exist on disk,
+these helpers find the archive along it and translate the path to a GDAL `/vsizip/`
+path, so pyogrio/geopandas read the member in place without extracting it.
+
+Example:
+    from parceltrack.io.archive import vsi_path
+    gpd.read_file(vsi_path(paths.raw / "BACIparcels0821.zip" / "BACIPOLY" / "BACIPOLY.shp"))
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Tuple, Union
+import zipfile
+
+ARCHIVE_SUFFIXES = (".zip",)
+
+
+def split_archive_path(path: Union[str, Path]) -> Tuple[Union[Path, None], Union[str, None]]:
+    """
+    Split a path running through an archive into (archive, member).
+
+    Returns:
+        tuple: (archive file, member path inside it as a posix string), or (None, None)
+            when no component of the path is an existing archive.
+    """
+    path = Path(path)
+    parts = path.parts
+    for i in range(len(parts) - 1):
+        if parts[i].lower().endswith(ARCHIVE_SUFFIXES):
+            archive = Path(*parts[:i + 1])
+            if archive.is_file():
+                return archive, "/".join(parts[i + 1:])
+    return None, None
+
+
+@lru_cache(maxsize=64)
+def _members(archive: str, mtime_ns: int, size: int) -> frozenset:
+    """Names in an archive; keyed by mtime/size so a rewritten archive is listed again."""
+    with zipfile.ZipFile(archive) as zf:
+        return frozenset(zf.namelist())
+
+
+def archive_members(archive: Union[str, Path]) -> frozenset:
+    stat = Path(archive).stat()
+    return _members(str(Path(archive).resolve()), stat.st_mtime_ns, stat.st_size)
+
+
+def path_exists(path: Union[str, Path]) -> bool:
+    """Like `Path.exists`, but also true for a member of an archive along the path."""
+    path = Path(path)
+    if path.exists():
+        return True
+    archive, member = split_archive_path(path)
+    return archive is not None and member in archive_members(archive)
+
+
+def vsi_path(path: Union[str, Path]) -> Union[Path, str]:
+    """The path itself if it exists on disk, else a GDAL `/vsizip/` path for an archive member."""
+    path = Path(path)
+    if path.exists():
+        return path
+    archive, member = split_archive_path(path)
+    if archive is None:
+        return path
+    return f"/vsizip/{archive.resolve().as_posix()}/{member}"
+
+
+def file_signature(path: Union[str, Path]) -> Dict[str, int]:
+    """
+    Size and mtime of a file, or of its archive for an archive member.
+
+    Returns:
+        dict: {'size', 'mtime_ns'}.
+    """
+    path = Path(path)
+    if not path.exists():
+        archive, _ = split_archive_path(path)
+        if archive is not None:
+            path = archive
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
@@ -0,0 +1,173 @@
+# parceltrack/io/cache.py
+
+"""
+Persistent GeoParquet cache for loaded parcel geometries.
+
+Each cache entry is a GeoParquet file plus a small JSON sidecar describing the
+sources it was built from. Entries are keyed by the resolved source path(s) and
+the load options (validation flag, target CRS, ...). The sidecar stores the size
+and mtime of every source so a changed source is detected and the entry rebuilt.
+
+Example:
+    from parceltrack.io.cache import invalidate_cache
+    invalidate_cache()  # drop every cached entry
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+import geopandas as gpd
+import hashlib
+import json
+
+from parceltrack.configs.paths import ProjectPaths
+from parceltrack.io.archive import file_signature
+
+CACHE_VERSION = 1
+
+
+def default_cache_dir() -> Path:
+    """Default cache location: `data/processed/cache`."""
+    return ProjectPaths().processed / "cache"
+
+
+def source_signature(sources: Iterable[Union[str, Path]]) -> List[Dict]:
+    """
+    Describe source files by resolved path, size and mtime.
+
+    Args:
+        sources (Iterable[str | Path]): Source files backing a cache entry.
+
+    Returns:
+        List[dict]: One {'path', 'size', 'mtime_ns'} record per source, in input order.
+            A member of a zip archive gets the archive's size and mtime.
+    """
+    signature = []
+    for source in sources:
+        path = Path(source).resolve()
+        signature.append({"path": str(path), **file_signature(path)})
+    return signature
+
+
+def cache_key(sources: Iterable[Union[str, Path]], options: Dict) -> str:
+    """Stable hash of the source paths and load options (not their size/mtime)."""
+    payload = {
+        "version": CACHE_VERSION,
+        "sources": [str(Path(s).resolve()) for s in sources],
+        "options": {k: str(v) for k, v in sorted(options.items())},
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()[:20]
+
+
+def _entry_paths(cache_dir: Path, name: str, key: str):
+    stem = f"{name}_{key}"
+    return cache_dir / f"{stem}.parquet", cache_dir / f"{stem}.json"
+
+
+def read_cache(
+    sources: List[Union[str, Path]],
+    options: Dict,
+    name: str,
+    cache_dir: Union[str, Path, None] = None
+) -> Optional[gpd.GeoDataFrame]:
+    """
+    Return the cached GeoDataFrame for `sources` + `options`, or None on a miss.
+
+    A stale entry (any source size/mtime changed) counts as a miss.
+
+    Args:
+        sources (list[str | Path]): Source files the entry was built from.
+        options (dict): Load options that are part of the key.
+        name (str): Human-readable prefix of the cache file.
+        cache_dir (str | Path | None): Cache directory. Defaults to `default_cache_dir()`.
+
+    Returns:
+        gpd.GeoDataFrame | None: Cached data when fresh.
+    """
+    cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+    data_path, meta_path = _entry_paths(cache_dir, name, cache_key(sources, options))
+    if not (data_path.exists() and meta_path.exists()):
+        return None
+
+    try:
+        meta = json.loads(meta_path.read_text())
+        if meta.get("signature") != source_signature(sources):
+            return None
+        return gpd.read_parquet(data_path)
+    except Exception as e:
+        print(f"[WARNING] Ignoring unreadable cache entry {data_path.name}: {e}")
+        return None
+
+
+def write_cache(
+    gdf: gpd.GeoDataFrame,
+    sources: List[Union[str, Path]],
+    options: Dict,
+    name: str,
+    cache_dir: Union[str, Path, None] = None
+) -> Path:
+    """
+    Store `gdf` as the cache entry for `sources` + `options`.
+
+    The GeoParquet file is written under a temporary name and renamed, and the
+    sidecar is written last, so an interrupted write never yields a valid entry.
+
+    Returns:
+        Path: Path of the GeoParquet file.
+    """
+    cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    data_path, meta_path = _entry_paths(cache_dir, name, cache_key(sources, options))
+
+    meta_path.unlink(missing_ok=True)
+    tmp_path = data_path.with_suffix(".parquet.tmp")
+    gdf.to_parquet(tmp_path, index=False)
+    tmp_path.replace(data_path)
+
+    meta = {
+        "version": CACHE_VERSION,
+        "name": name,
+        "options": {k: str(v) for k, v in sorted(options.items())},
+        "signature": source_signature(sources),
+        "rows": len(gdf),
+    }
+    meta_path.write_text(json.dumps(meta, indent=2))
+    return data_path
+
+
+def invalidate_cache(
+    source: Union[str, Path, None] = None,
+    cache_dir: Union[str, Path, None] = None
+) -> int:
+    """
+    Remove cache entries.
+
+    Args:
+        source (str | Path | None): Drop only entries built from this file, or from
+            any file inside this directory. If None, drop every entry.
+        cache_dir (str | Path | None): Cache directory. Defaults to `default_cache_dir()`.
+
+    Returns:
+        int: Number of entries removed.
+    """
+    cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+    if not cache_dir.exists():
+        return 0
+
+    target = Path(source).resolve() if source is not None else None
+    removed = 0
+    for meta_path in cache_dir.glob("*.json"):
+        if target is not None:
+            try:
+                meta = json.loads(meta_path.read_text())
+                paths = [Path(s["path"]) for s in meta.get("signature", [])]
+            except Exception:
+                paths = []
+            if not any(p == target or target in p.parents for p in paths):
+                continue
+
+        meta_path.unlink(missing_ok=True)
+        meta_path.with_suffix(".parquet").unlink(missing_ok=True)
+        removed += 1
+
+    print(f"[INFO] Removed {removed} cache entries from {cache_dir}")
+    return removed
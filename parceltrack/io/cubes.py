@@ -0,0 +1,278 @@
+# parceltrack/io/cubes.py
+
+"""
+Precomputed per-year aggregate tables ("cubes") for dashboard summaries.
+
+A cube is a group-by of one processed year over a few dimension columns, with a row
+count and, for each measure column, its sum and non-null count (plus medians, minima
+or maxima where asked for). `build_cubes` reads only the attribute columns the cubes
+need (never geometry) and writes them next to the partitions:
+
+    parcels_2021_cube_zoning_values.parquet, ..., parcels_2021_cubes.json
+
+The sidecar records the partitions' signature and the cube definitions, so a rerun
+only rebuilds years whose partitions (or cube definitions) changed. `query_cube`
+answers group-bys from the cubes: by all of a cube's dimensions, or by fewer of them
+(and across years) for counts, sums, means, minima and maxima. Medians are only
+available at the grain the cube was built with.
+
+Example:
+    from parceltrack.io.cubes import build_cubes, query_cube
+    build_cubes(paths.processed)
+    print(query_cube(paths.processed, "zoning_values", measures=["NFMTTLVL_mean", "NFMTTLVL_median"]))
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Union
+import json
+import re
+
+import pandas as pd
+import pyogrio
+
+from parceltrack.instrumentation import stage
+from parceltrack.io.cache import source_signature
+from parceltrack.io.load_geometry import find_year_files
+from parceltrack.io.stream import iter_year_batches
+
+CUBE_VERSION = 1
+
+# name -> {"dims": [...], "measures": {column: [aggregations]}, "filter": DataFrame.query expression}
+# Every cube has 'count'; every measure has '<col>_sum' and '<col>_n' (non-null count), from
+# which means are derived. Extra aggregations: 'median', 'min', 'max'.
+DEFAULT_CUBES = {
+    "zoning_values": {
+        "dims": ["ZONING"],
+        "measures": {"NFMTTLVL": ["median", "min", "max"], "NFMLNDVL": ["median"], "NFMIMPVL": ["median"]},
+    },
+    "block_values": {
+        "dims": ["BLOCK", "ZONING"],
+        "measures": {"NFMTTLVL": ["median"], "NFMLNDVL": [], "NFMIMPVL": []},
+    },
+    "zero_value_owners": {
+        "dims": ["OWNNAME1", "ZONING"],
+        "measures": {"SQFTSTRC": ["max"]},
+        "filter": "NFMTTLVL == 0",
+    },
+    "year_built": {
+        "dims": ["YEARBLT"],
+        "measures": {"SQFTSTRC": ["median"]},
+    },
+}
+
+_STORED_AGGS = ("median", "min", "max")
+_ROLLUP = {"count": "sum", "sum": "sum", "n": "sum", "min": "min", "max": "max"}
+
+
+def cube_path(directory, year, name: str) -> Path:
+    return Path(directory) / f"parcels_{year}_cube_{name}.parquet"
+
+
+def cube_manifest_path(directory, year) -> Path:
+    """Path of the sidecar describing a year's cubes."""
+    return Path(directory) / f"parcels_{year}_cubes.json"
+
+
+def processed_years(directory) -> List[int]:
+    """Years with GeoJSON partitions in `directory`, ascending."""
+    pattern = re.compile(r'^parcels_(\d+)_part\d+_\d+\.geojson$')
+    return sorted({int(m.group(1)) for f in Path(directory).iterdir() if (m := pattern.match(f.name))})
+
+
+def _cube_columns(spec: Dict) -> List[str]:
+    return list(dict.fromkeys(list(spec["dims"]) + list(spec.get("measures", {}))))
+
+
+def _filter_columns(expression: Union[str, None], columns: Iterable[str]) -> List[str]:
+    """Columns referenced by a `DataFrame.query` expression (by name match)."""
+    if not expression:
+        return []
+    return [c for c in columns if re.search(rf'\b{re.escape(c)}\b', expression)]
+
+
+def _all_fields(directory: Path, year) -> List[str]:
+    """Attribute names of a year's first partition."""
+    return list(pyogrio.read_info(find_year_files(directory, year)[0])["fields"])
+
+
+def aggregate_cube(attributes: pd.DataFrame, spec: Dict) -> pd.DataFrame:
+    """
+    Group one year's attributes as described by a cube definition.
+
+    Returns:
+        pd.DataFrame: One row per group: the dims, 'count', and per measure
+            '<col>_sum', '<col>_n' and any extra '<col>_<agg>'.
+    """
+    df = attributes.query(spec["filter"]) if spec.get("filter") else attributes
+    grouped = df.groupby(list(spec["dims"]), dropna=False, observed=True, sort=True)
+    out = grouped.size().to_frame("count")
+    for col, aggs in spec.get("measures", {}).items():
+        values = pd.to_numeric(df[col], errors="coerce").groupby([df[d] for d in spec["dims"]], dropna=False, observed=True, sort=True)
+        out[f"{col}_sum"] = values.sum()
+        out[f"{col}_n"] = values.count()
+        for agg in aggs:
+            if agg not in _STORED_AGGS:
+                raise ValueError(f"Unsupported aggregation {agg!r} for {col}; use one of {_STORED_AGGS}.")
+            out[f"{col}_{agg}"] = values.agg(agg)
+    return out.reset_index()
+
+
+def build_cubes(
+    directory: Union[str, Path],
+    years: Union[Iterable, None] = None,
+    cubes: Dict[str, Dict] = DEFAULT_CUBES,
+    overwrite: bool = False
+) -> List:
+    """
+    Build or refresh the aggregate cubes of processed years.
+
+    A year is skipped when its sidecar shows the cubes were built from the current
+    partitions with the same definitions, unless `overwrite` is set.
+
+    Args:
+        directory (str | Path): Folder containing the GeoJSON partitions.
+        years (Iterable | None): Years to build; None for every year in `directory`.
+        cubes (dict): Cube definitions, see `DEFAULT_CUBES`.
+        overwrite (bool): Rebuild even if the cubes are up to date.
+
+    Returns:
+        list: The years that were (re)built.
+    """
+    directory = Path(directory)
+    years = list(years) if years is not None else processed_years(directory)
+    definitions = json.loads(json.dumps(cubes))
+
+    built = []
+    for year in years:
+        signature = source_signature(find_year_files(directory, year))
+        sidecar = cube_manifest_path(directory, year)
+        files = {name: cube_path(directory, year, name) for name in cubes}
+        if not overwrite and sidecar.exists() and all(f.exists() for f in files.values()):
+            previous = json.loads(sidecar.read_text())
+            if previous.get("version") == CUBE_VERSION and previous.get("signature") == signature \
+                    and previous.get("cubes") == definitions:
+                print(f"[INFO] Cubes for year {year} are up to date.")
+                continue
+
+        with stage("build_cubes", year=year, cubes=len(cubes)) as s:
+            fields = _all_fields(directory, year)
+            columns = list(dict.fromkeys(
+                c for spec in cubes.values() for c in _cube_columns(spec) + _filter_columns(spec.get("filter"), fields)
+            ))
+            attributes = pd.concat(list(iter_year_batches(directory, year, columns=columns)), ignore_index=True)
+            s.set(rows=len(attributes))
+
+            sidecar.unlink(missing_ok=True)
+            rows = {}
+            for name, spec in cubes.items():
+                table = aggregate_cube(attributes, spec)
+                tmp_path = files[name].with_suffix(".parquet.tmp")
+                table.to_parquet(tmp_path, index=False)
+                tmp_path.replace(files[name])
+                rows[name] = len(table)
+
+        # Written last, so an interrupted build never looks up to date.
+        sidecar.write_text(json.dumps({
+            "version": CUBE_VERSION,
+            "year": year,
+            "rows": len(attributes),
+            "signature": signature,
+            "cubes": definitions,
+            "cube_rows": rows,
+        }, indent=2, default=str))
+        for stale in directory.glob(f"parcels_{year}_cube_*.parquet"):
+            if stale not in files.values():
+                stale.unlink()
+        built.append(year)
+        print(f"[SUCCESS] Built {len(cubes)} cubes for year {year} from {len(attributes)} rows.")
+    return built
+
+
+def query_cube(
+    directory: Union[str, Path],
+    cube: str,
+    by: Union[str, List[str], None] = None,
+    measures: Union[List[str], None] = None,
+    years: Union[Iterable, None] = None,
+    where: Union[Dict[str, object], None] = None
+) -> pd.DataFrame:
+    """
+    Answer a group-by from a cube without reading any parcels.
+
+    Args:
+        directory (str | Path): Folder the cubes were built in.
+        cube (str): Cube name.
+        by (str | list[str] | None): 'Year' and/or any of the cube's dims. Defaults to
+            'Year' plus all dims. Fewer dims (or no 'Year') roll the cube up.
+        measures (list[str] | None): 'count' and '<col>_<agg>' with agg one of 'sum',
+            'n', 'mean', 'median', 'min', 'max'. Defaults to 'count' plus every stored
+            sum (and median/min/max at full grain).
+        years (Iterable | None): Years to include; None for every year with this cube.
+        where (dict | None): {dim: value or list of values} kept before grouping.
+
+    Returns:
+        pd.DataFrame: One row per group, sorted by `by`.
+    """
+    directory = Path(directory)
+    if years is None:
+        pattern = re.compile(rf'^parcels_(\d+)_cube_{re.escape(cube)}\.parquet$')
+        years = sorted(int(m.group(1)) for f in directory.iterdir() if (m := pattern.match(f.name)))
+    years = list(years)
+    paths = [cube_path(directory, year, cube) for year in years]
+    missing = [year for year, path in zip(years, paths) if not path.exists()]
+    if missing or not years:
+        raise FileNotFoundError(f"No '{cube}' cube for years {missing or years} in {directory}; run build_cubes first.")
+
+    # Dimensions come from the definitions the cubes were built with, not from column names.
+    definitions = []
+    for year in years:
+        sidecar = cube_manifest_path(directory, year)
+        spec = json.loads(sidecar.read_text()).get("cubes", {}).get(cube) if sidecar.exists() else None
+        if spec is None:
+            raise FileNotFoundError(f"No definition of cube '{cube}' for year {year} in {sidecar}; run build_cubes first.")
+        definitions.append(list(spec["dims"]))
+    dims = definitions[0]
+    if any(d != dims for d in definitions):
+        raise ValueError(f"Cube '{cube}' was built with different dimensions across years {years}; rebuild it.")
+
+    table = pd.concat([pd.read_parquet(p).assign(Year=year) for year, p in zip(years, paths)], ignore_index=True)
+    measure_columns = [c for c in table.columns if c not in dims and c != "Year"]
+    by = ["Year"] + dims if by is None else ([by] if isinstance(by, str) else list(by))
+    unknown = [c for c in by if c != "Year" and c not in dims]
+    if unknown:
+        raise KeyError(f"Cube '{cube}' has no dimension(s) {unknown}; its dimensions are {dims}.")
+
+    full_grain = set(by) >= set(dims) and ("Year" in by or len(years) == 1)
+    if measures is None:
+        measures = ["count"] + [c for c in measure_columns if c.endswith("_sum")
+                                or (full_grain and re.search(r'_(median|min|max)$', c))]
+
+    for dim, values in (where or {}).items():
+        values = values if isinstance(values, (list, tuple, set)) else [values]
+        table = table[table[dim].isin(values)]
+
+    needed = set()
+    for m in measures:
+        if m == "count":
+            needed.add(m)
+        elif m.endswith("_mean"):
+            needed.update([m[:-5] + "_sum", m[:-5] + "_n"])
+        elif m.endswith("_median") and not full_grain:
+            raise ValueError(f"{m} cannot be rolled up; query '{cube}' by all of {['Year'] + dims}.")
+        elif m in measure_columns:
+            needed.add(m)
+        else:
+            raise KeyError(f"Cube '{cube}' has no measure {m!r}.")
+
+    if full_grain:
+        result = table[by + sorted(needed)]
+    else:
+        agg = {c: _ROLLUP[c.rsplit("_", 1)[-1]] for c in needed}
+        result = table.groupby(by, dropna=False, observed=True).agg(agg).reset_index() if by else \
+            table.agg(agg).to_frame().T
+
+    for m in measures:
+        if m.endswith("_mean"):
+            n = result[m[:-5] + "_n"]
+            result[m] = result[m[:-5] + "_sum"] / n.where(n > 0)
+    return result[by + list(measures)].sort_values(by).reset_index(drop=True) if by else result[list(measures)]
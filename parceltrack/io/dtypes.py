@@ -0,0 +1,177 @@
+# parceltrack/io/dtypes.py
+
+"""
+Memory-compact dtypes for parcel GeoDataFrames.
+
+Parcel attributes load as object/str and float64/int64 columns, although most text
+fields repeat a handful of values (ZONING, OWNNAME1, BLOCK, ...) and the assessment
+columns hold whole dollars. `compact_dtypes` converts low-cardinality text to
+categoricals, downcasts numbers without losing values and stores ids as Arrow
+strings. `unify_categories` gives every year the same categories per column, so
+categorical columns compare and concatenate across years without falling back to
+object. `memory_report` shows the bytes per column before and after.
+
+Example:
+    from parceltrack.io.dtypes import compact_dtypes, memory_report
+    compact = compact_dtypes(parcels_2021)
+    print(memory_report(parcels_2021, compact))
+"""
+
+from typing import Dict, Iterable, Union
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+
+ID_COLUMNS = ("ACCTID",)
+
+
+def _is_text(series: pd.Series) -> bool:
+    return pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype)
+
+
+def _downcast_numeric(series: pd.Series, allow_float32: bool) -> pd.Series:
+    """Smallest dtype that holds every value exactly (floats of whole numbers become integers)."""
+    if pd.api.types.is_bool_dtype(series.dtype) or not pd.api.types.is_numeric_dtype(series.dtype):
+        return series
+    if pd.api.types.is_integer_dtype(series.dtype):
+        if isinstance(series.dtype, pd.api.extensions.ExtensionDtype):
+            return series
+        return pd.to_numeric(series, downcast="integer")
+
+    values = series.to_numpy(dtype=float, na_value=np.nan)
+    finite = values[~np.isnan(values)]
+    if len(finite) and np.all(np.mod(finite, 1) == 0) and np.abs(finite).max() < 2 ** 53:
+        if len(finite) == len(values):
+            return pd.to_numeric(series, downcast="integer")
+        # Whole numbers with gaps: nullable integers of the smallest width that fits.
+        for dtype, info in (("Int8", np.iinfo(np.int8)), ("Int16", np.iinfo(np.int16)),
+                            ("Int32", np.iinfo(np.int32)), ("Int64", np.iinfo(np.int64))):
+            if finite.min() >= info.min and finite.max() <= info.max:
+                return series.astype(dtype)
+    if allow_float32:
+        return pd.to_numeric(series, downcast="float")
+    return series
+
+
+def compact_dtypes(
+    gdf: Union[gpd.GeoDataFrame, pd.DataFrame],
+    id_columns: Iterable[str] = ID_COLUMNS,
+    max_category_ratio: float = 0.5,
+    categories: Union[Dict[str, pd.CategoricalDtype], None] = None,
+    allow_float32: bool = False
+) -> Union[gpd.GeoDataFrame, pd.DataFrame]:
+    """
+    Return a copy of `gdf` with memory-compact column dtypes.
+
+    - Id columns (`id_columns`) become Arrow-backed strings.
+    - Other text columns with at most `max_category_ratio` distinct values per row become
+      categoricals (with the given `categories` dtype for that column, if any).
+    - Integers are downcast; floats that only hold whole numbers become (nullable)
+      integers; other floats become float32 only with `allow_float32`.
+
+    Args:
+        gdf (GeoDataFrame | DataFrame): Frame to compact. Not modified.
+        id_columns (Iterable[str]): Identifier columns kept as (Arrow) strings.
+        max_category_ratio (float): Distinct values / rows at or below which text becomes categorical.
+        categories (dict | None): {column: CategoricalDtype} to use, e.g. shared across years.
+        allow_float32 (bool): Allow lossy float64 -> float32 for fractional columns.
+
+    Returns:
+        GeoDataFrame | DataFrame: Same columns and index, compact dtypes.
+    """
+    categories = categories or {}
+    id_columns = set(id_columns)
+    geometry_name = gdf.geometry.name if isinstance(gdf, gpd.GeoDataFrame) else None
+    converted = {}
+    for col in gdf.columns:
+        series = gdf[col]
+        if col == geometry_name or isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        if col in categories:
+            converted[col] = series.astype(categories[col])
+        elif _is_text(series):
+            if col in id_columns:
+                converted[col] = series.astype(pd.StringDtype("pyarrow"))
+            elif len(series) and series.nunique(dropna=True) <= max_category_ratio * len(series):
+                converted[col] = series.astype("category")
+        else:
+            downcast = _downcast_numeric(series, allow_float32)
+            if downcast.dtype != series.dtype:
+                converted[col] = downcast
+
+    out = gdf.copy(deep=False)
+    for col, series in converted.items():
+        out[col] = series
+    return out
+
+
+def shared_categories(frames: Iterable[pd.DataFrame]) -> Dict[str, pd.CategoricalDtype]:
+    """
+    Union of the values of every column that is categorical in at least one frame, sorted.
+
+    Frames where such a column is still text contribute their distinct values too, so
+    casting them to the shared dtype never turns a value into NaN.
+    """
+    frames = list(frames)
+    columns = {col for frame in frames for col in frame.columns if isinstance(frame[col].dtype, pd.CategoricalDtype)}
+    values: Dict[str, set] = {}
+    for frame in frames:
+        for col in columns & set(frame.columns):
+            series = frame[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                values.setdefault(col, set()).update(series.cat.categories)
+            elif _is_text(series):
+                values.setdefault(col, set()).update(series.dropna().unique())
+    return {col: pd.CategoricalDtype(sorted(v, key=str)) for col, v in values.items()}
+
+
+def unify_categories(geoms: Dict[int, pd.DataFrame]) -> Dict[int, pd.DataFrame]:
+    """
+    Give each categorical column the same categories in every year.
+
+    Re-coding keeps the values; it only changes the integer codes. A column that is
+    categorical in some years and text in others is converted in all of them; one that
+    is numeric in some year is left as it is there.
+    """
+    dtypes = shared_categories(geoms.values())
+    out = {}
+    for year, frame in geoms.items():
+        frame = frame.copy(deep=False)
+        for col, dtype in dtypes.items():
+            if col not in frame.columns or frame[col].dtype == dtype:
+                continue
+            if isinstance(frame[col].dtype, pd.CategoricalDtype):
+                frame[col] = frame[col].cat.set_categories(dtype.categories)
+            elif _is_text(frame[col]):
+                frame[col] = frame[col].astype(dtype)
+        out[year] = frame
+    return out
+
+
+def memory_report(
+    before: pd.DataFrame,
+    after: Union[pd.DataFrame, None] = None
+) -> pd.DataFrame:
+    """
+    Bytes per column (deep), optionally before and after compaction.
+
+    Returns:
+        pd.DataFrame: Indexed by column (plus 'TOTAL'), with 'dtype' and 'bytes', or with
+            'dtype_before', 'dtype_after', 'bytes_before', 'bytes_after' and 'ratio'.
+    """
+    def usage(df: pd.DataFrame) -> pd.DataFrame:
+        report = pd.DataFrame({
+            "dtype": df.dtypes.astype(str),
+            "bytes": df.memory_usage(deep=True, index=False),
+        })
+        report.loc["TOTAL"] = ["", int(report["bytes"].sum())]
+        return report
+
+    if after is None:
+        return usage(before)
+    before, after = usage(before), usage(after)
+    order = list(before.index[:-1]) + [c for c in after.index[:-1] if c not in before.index] + ["TOTAL"]
+    report = before.join(after, lsuffix="_before", rsuffix="_after", how="outer").reindex(order)
+    report["ratio"] = report["bytes_after"] / report["bytes_before"]
+    return report
+
@@ -0,0 +1,259 @@
+# parceltrack/io/geomstore.py
+
+"""
+Content-addressed geometry store shared by all processed years.
+
+Most parcels keep exactly the same polygon from one year to the next, so storing a
+full copy of every geometry per year (as the GeoJSON partitions do) mostly stores
+duplicates. A store directory instead holds:
+
+    geometries.parquet        one row per distinct polygon: geom_id, geometry (GeoParquet)
+    attributes_<year>.parquet the year's attribute rows plus their geom_id
+    store.json                CRS, grid size and per-year row counts
+
+A geom_id is the 128-bit BLAKE2b hash of the polygon's normalized WKB (optionally
+snapped to `grid_size`), so a polygon that reappears in another year, in any vertex
+order, is stored once. `load_store_years` parses each needed polygon once and builds
+the yearly GeoDataFrames from the same shapely objects, so unchanged parcels also
+share memory across years.
+
+Geometries are stored normalized: rings start at their lowest vertex and follow
+shapely's canonical orientation. Shapes and areas are unchanged.
+
+Example:
+    from parceltrack.io.geomstore import save_geometry_store, load_store_years
+    save_geometry_store(geoms, paths.processed / "store")
+    geoms = load_store_years(paths.processed / "store", [2021, 2022])
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Union
+import geopandas as gpd
+import hashlib
+import json
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import shapely
+
+from parceltrack.instrumentation import stage
+
+STORE_VERSION = 1
+GEOMETRIES_FILE = "geometries.parquet"
+ID_COLUMN = "geom_id"
+
+
+def store_manifest_path(directory) -> Path:
+    """Path of the store's `store.json`."""
+    return Path(directory) / "store.json"
+
+
+def read_store_manifest(directory) -> Union[dict, None]:
+    """Return the store manifest, or None if `directory` holds no store."""
+    path = store_manifest_path(directory)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def attributes_path(directory, year) -> Path:
+    return Path(directory) / f"attributes_{year}.parquet"
+
+
+def geometry_ids(geometry: Union[gpd.GeoSeries, np.ndarray], grid_size: Union[float, None] = None):
+    """
+    Content ids of geometries: hex BLAKE2b-128 of the normalized WKB.
+
+    Args:
+        geometry (GeoSeries | array of shapely geometries): Polygons to key.
+        grid_size (float | None): Snap coordinates to this grid (CRS units) first.
+
+    Returns:
+        tuple: (ids as an object array, None for missing geometries; normalized geometries;
+            their WKB).
+    """
+    geoms = np.asarray(geometry.values if isinstance(geometry, gpd.GeoSeries) else geometry)
+    if grid_size:
+        geoms = shapely.set_precision(geoms, grid_size)
+    geoms = shapely.normalize(geoms)
+    wkb = shapely.to_wkb(geoms)
+    ids = np.array([hashlib.blake2b(w, digest_size=16).hexdigest() if w is not None else None for w in wkb], dtype=object)
+    return ids, geoms, wkb
+
+
+def _write_replace(write, path: Path):
+    """Write through a temporary file so readers never see a half-written file."""
+    tmp = path.with_name(path.name + ".tmp")
+    write(tmp)
+    tmp.replace(path)
+
+
+def save_geometry_store(
+    geoms: Dict[int, gpd.GeoDataFrame],
+    directory: Union[str, Path],
+    grid_size: Union[float, None] = None,
+    row_group_size: int = 50_000
+) -> dict:
+    """
+    Add (or replace) years in a geometry store.
+
+    Years already in the store and not in `geoms` are kept. Geometries no longer used
+    by any year are dropped. All years are stored in the store's CRS (the first saved
+    year's CRS); later years are reprojected to it.
+
+    Args:
+        geoms (dict): {year: GeoDataFrame}.
+        directory (str | Path): Store directory; created if missing.
+        grid_size (float | None): Coordinate snapping before hashing; fixed when the
+            store is created.
+        row_group_size (int): Parquet row group size of `geometries.parquet`. Geometries
+            are sorted along a Hilbert curve, so bbox reads skip most row groups.
+
+    Returns:
+        dict: The updated store manifest.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = read_store_manifest(directory) or {
+        "version": STORE_VERSION,
+        "crs": None,
+        "grid_size": grid_size,
+        "years": {},
+    }
+    if manifest["version"] != STORE_VERSION:
+        raise ValueError(f"Unsupported geometry store version {manifest['version']} in {directory}")
+    grid_size = manifest["grid_size"]
+    geometries_path = directory / GEOMETRIES_FILE
+
+    known = set()
+    if geometries_path.exists():
+        known = set(pq.read_table(geometries_path, columns=[ID_COLUMN])[ID_COLUMN].to_pylist())
+
+    new_frames = []
+    for year, gdf in geoms.items():
+        if manifest["crs"] is None:
+            manifest["crs"] = gdf.crs.to_string() if gdf.crs else None
+        elif gdf.crs is not None and gdf.crs != manifest["crs"]:
+            gdf = gdf.to_crs(manifest["crs"])
+
+        with stage("store_hash", year=year, rows=len(gdf)):
+            ids, normalized, _ = geometry_ids(gdf.geometry, grid_size=grid_size)
+
+        # Distinct geometries of this year that the store does not have yet.
+        first = np.flatnonzero(~pd.Series(ids).duplicated().to_numpy())
+        new = np.array([i for i in first if ids[i] is not None and ids[i] not in known], dtype=int)
+        known.update(ids[new])
+        new_frames.append(gpd.GeoDataFrame({ID_COLUMN: ids[new]}, geometry=normalized[new], crs=manifest["crs"]))
+
+        attributes = pd.DataFrame(gdf.drop(columns=gdf.geometry.name))
+        attributes[ID_COLUMN] = pd.array(ids, dtype=pd.StringDtype("pyarrow"))
+        with stage("store_write", year=year, rows=len(attributes)):
+            _write_replace(lambda p: attributes.to_parquet(p, index=False), attributes_path(directory, year))
+        manifest["years"][str(year)] = {
+            "file": attributes_path(directory, year).name,
+            "rows": len(attributes),
+            "geometries": int(pd.Series(ids).nunique()),
+            "new_geometries": len(new),
+        }
+        print(f"[INFO] {year}: {len(gdf)} rows, {len(new)} new geometries.")
+
+    referenced = set()
+    for entry in manifest["years"].values():
+        referenced.update(pq.read_table(directory / entry["file"], columns=[ID_COLUMN])[ID_COLUMN].to_pylist())
+
+    with stage("store_write_geometries") as s:
+        frames = [gpd.read_parquet(geometries_path)] if geometries_path.exists() else []
+        frames += [f for f in new_frames if len(f)]
+        store = gpd.GeoDataFrame(pd.concat(frames, ignore_index=True), crs=manifest["crs"]) if frames else \
+            gpd.GeoDataFrame({ID_COLUMN: []}, geometry=[], crs=manifest["crs"])
+        store = store[store[ID_COLUMN].isin(referenced)]
+        if len(store):
+            store = store.iloc[np.argsort(store.hilbert_distance())]
+        _write_replace(lambda p: store.to_parquet(p, index=False, write_covering_bbox=True,
+                                                  row_group_size=row_group_size), geometries_path)
+        s.set(rows=len(store))
+
+    stored_rows = sum(entry["rows"] for entry in manifest["years"].values())
+    manifest["geometries"] = len(store)
+    store_manifest_path(directory).write_text(json.dumps(manifest, indent=2))
+    print(f"[SUCCESS] Geometry store {directory}: {len(manifest['years'])} years, "
+          f"{stored_rows} rows, {len(store)} distinct geometries.")
+    return manifest
+
+
+def load_store_years(
+    directory: Union[str, Path],
+    years: Union[Iterable, None] = None,
+    columns: Union[List[str], None] = None,
+    bbox=None,
+    target_crs=None,
+    with_ids: bool = False
+) -> Dict[int, gpd.GeoDataFrame]:
+    """
+    Load years from a geometry store as GeoDataFrames.
+
+    Each distinct geometry is read and parsed once, reprojected once, and the same
+    shapely object is used by every year (and row) that references it.
+
+    Args:
+        directory (str | Path): Store directory.
+        years (Iterable | None): Years to load; None for every stored year.
+        columns (list[str] | None): Attribute columns to read.
+        bbox (tuple | None): (minx, miny, maxx, maxy) in the store CRS; keep rows whose
+            geometry intersects it.
+        target_crs (str | int | None): Reproject CRS (e.g., 'EPSG:6487').
+        with_ids (bool): Keep the 'geom_id' column.
+
+    Returns:
+        Dict[int, gpd.GeoDataFrame]: GeoDataFrame by year, in the order given.
+    """
+    directory = Path(directory)
+    manifest = read_store_manifest(directory)
+    if manifest is None:
+        raise FileNotFoundError(f"No geometry store in {directory}")
+    years = list(years) if years is not None else [int(y) for y in manifest["years"]]
+    missing = [y for y in years if str(y) not in manifest["years"]]
+    if missing:
+        raise KeyError(f"Years not in the geometry store: {missing}")
+
+    read_columns = None if columns is None else list(dict.fromkeys(list(columns) + [ID_COLUMN]))
+    with stage("store_read_attributes", years=len(years)) as s:
+        attributes = {year: pd.read_parquet(directory / manifest["years"][str(year)]["file"], columns=read_columns)
+                      for year in years}
+        s.set(rows=sum(len(a) for a in attributes.values()))
+
+    with stage("store_read_geometries") as s:
+        geometries_path = directory / GEOMETRIES_FILE
+        if bbox is not None:
+            store = gpd.read_parquet(geometries_path, bbox=tuple(bbox))
+            store = store[store.intersects(shapely.box(*bbox))]
+        elif len(years) < len(manifest["years"]):
+            needed = pd.unique(pd.concat([a[ID_COLUMN] for a in attributes.values()]).dropna())
+            store = gpd.read_parquet(geometries_path, filters=[(ID_COLUMN, "in", list(needed))])
+        else:
+            store = gpd.read_parquet(geometries_path)
+        if target_crs is not None:
+            store = store.to_crs(target_crs)
+        s.set(rows=len(store))
+
+    store_index = pd.Index(store[ID_COLUMN])
+    result = {}
+    with stage("store_assemble", years=len(years)):
+        for year, frame in attributes.items():
+            positions = store_index.get_indexer(frame[ID_COLUMN])
+            if bbox is not None:
+                frame = frame[positions >= 0].reset_index(drop=True)
+                positions = positions[positions >= 0]
+            # take() copies references, not geometries: rows with the same id share one object.
+            geometry = store.geometry.values.take(positions, allow_fill=True)
+            if not with_ids:
+                frame = frame.drop(columns=ID_COLUMN)
+            result[year] = gpd.GeoDataFrame(frame, geometry=geometry, crs=store.crs)
+    print(f"[SUCCESS] Loaded {len(years)} years ({sum(len(g) for g in result.values())} rows, "
+          f"{len(store)} distinct geometries) from {directory}.")
+    return result
+
+
+def load_store_year(directory: Union[str, Path], year, **kwargs) -> gpd.GeoDataFrame:
+    """Load one year from a geometry store; see `load_store_years`."""
+    return load_store_years(directory, [year], **kwargs)[year]
@@ -1,12 +1,24 @@
 # parceltrack/io/load_geometry.py
 
 from pathlib import Path
-from typing import Dict, Union
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Dict, List, Union
 import geopandas as gpd
+import numpy as np
 import pandas as pd
-import tqdm
-import math
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pyogrio
+from pyproj import CRS
+from tqdm import tqdm
+import json
 import re
+import time
+
+from parceltrack.io.archive import path_exists, vsi_path
+from parceltrack.io.dtypes import compact_dtypes, unify_categories
+from parceltrack.io.cache import read_cache, write_cache, invalidate_cache, source_signature
+from parceltrack.instrumentation import record as record_stage, stage
 
 def parse_size(size_str: str) -> int:
     """Convert size string like '25MB' to bytes."""
@@ -23,73 +35,311 @@ def parse_size(size_str: str) -> int:
 def load_geometry(
     filepath: Union[str, Path],
     validate_geometry: bool = True,
-    target_crs: Union[str, int, None] = None
+    target_crs: Union[str, int, None] = None,
+    use_cache: bool = False,
+    cache_dir: Union[str, Path, None] = None,
+    columns: Union[List[str], None] = None,
+    bbox=None,
+    mask=None,
+    where: Union[str, None] = None,
+    compact: bool = False
 ) -> gpd.GeoDataFrame:
     """
     Load any geospatial file into a GeoDataFrame (Shapefile, GeoJSON, GeoPackage, etc.).
 
+    `columns`, `bbox`, `mask` and `where` are pushed down to the reader, so fields and
+    features they exclude are never materialized. Spatial filters are expressed in the
+    source file's CRS (a GeoDataFrame/GeoSeries mask with a CRS is reprojected for you).
+
+    Files inside a zip archive are read in place: pass a path that runs through the
+    archive, e.g. `raw/BACIparcels0821.zip/BACIPOLY/BACIPOLY.shp` (see `parceltrack.io.archive`).
+
     Args:
-        filepath (str | Path): Input path to a spatial file.
+        filepath (str | Path): Input path to a spatial file, possibly inside a zip archive.
         validate_geometry (bool): Drop invalid/missing geometries.
         target_crs (str | int | None): Reproject CRS (e.g., 'EPSG:6487').
+        use_cache (bool): Read from / write to the GeoParquet cache (see `parceltrack.io.cache`).
+        cache_dir (str | Path | None): Cache directory. Defaults to `data/processed/cache`.
+        columns (list[str] | None): Attribute columns to read; geometry is always read.
+        bbox (tuple | GeoDataFrame | GeoSeries | None): Keep features intersecting this box.
+        mask (shapely geometry | GeoDataFrame | GeoSeries | None): Keep features intersecting it.
+        where (str | None): SQL WHERE clause on attributes, e.g. "NFMTTLVL = 0 AND SQFTSTRC > 0".
+        compact (bool): Return memory-compact dtypes (see `parceltrack.io.dtypes.compact_dtypes`).
 
     Returns:
         gpd.GeoDataFrame: Cleaned and optionally reprojected geometries.
     """
     path = Path(filepath)
-    if not path.exists():
+    if not path_exists(path):
         raise FileNotFoundError(f"File not found: {path}")
 
+    read_kwargs = _read_kwargs(columns=columns, bbox=bbox, mask=mask, where=where)
+    cache_options = {"validate_geometry": validate_geometry, "target_crs": target_crs, **_filter_key(read_kwargs)}
+    if use_cache:
+        with stage("cache_read", file=str(path)) as s:
+            cached = read_cache([path], cache_options, name=path.stem, cache_dir=cache_dir)
+            s.set(hit=cached is not None, rows=len(cached) if cached is not None else None)
+        if cached is not None:
+            return _compact(cached, compact, file=str(path))
+
     try:
-        gdf = gpd.read_file(path)
+        with stage("read", file=str(path)) as s:
+            gdf = gpd.read_file(vsi_path(path), **read_kwargs)
+            s.set(rows=len(gdf))
     except Exception as e:
         raise RuntimeError(f"Failed to load geospatial file: {e}")
 
+    # Renumber after dropping invalid rows, so a cache hit and a miss return the same index.
+    gdf = _clean_geometry(gdf, validate_geometry, target_crs, file=str(path)).reset_index(drop=True)
+
+    if use_cache:
+        with stage("cache_write", file=str(path), rows=len(gdf)):
+            write_cache(gdf, [path], cache_options, name=path.stem, cache_dir=cache_dir)
+
+    return _compact(gdf, compact, file=str(path))
+
+def _compact(gdf: gpd.GeoDataFrame, compact: bool, **context) -> gpd.GeoDataFrame:
+    if not compact:
+        return gdf
+    with stage("compact", rows=len(gdf), **context):
+        return compact_dtypes(gdf)
+
+def _clean_geometry(gdf: gpd.GeoDataFrame, validate_geometry: bool, target_crs, **context) -> gpd.GeoDataFrame:
+    """Drop invalid/missing geometries and reproject, as configured. `context` labels the stages."""
     if validate_geometry:
-        gdf = gdf[gdf.geometry.notnull() & gdf.is_valid]
+        with stage("validate", **context) as s:
+            gdf = gdf[gdf.geometry.notnull() & gdf.is_valid]
+            s.set(rows=len(gdf))
 
     if target_crs:
         try:
-            gdf = gdf.to_crs(target_crs)
+            with stage("reproject", target_crs=str(target_crs), rows=len(gdf), **context):
+                gdf = gdf.to_crs(target_crs)
         except Exception as e:
             raise ValueError(f"CRS transformation failed: {e}")
-
     return gdf
 
-def load_files_from_metdata(filtered_shape_meta_df, in_dir: Path, target_crs=None):
+def _read_kwargs(**filters) -> dict:
+    """Reader keyword arguments for the filters that are actually set."""
+    return {k: v for k, v in filters.items() if v is not None}
+
+def _filter_key(read_kwargs: dict) -> dict:
+    """Cache-key representation of reader filters (geometries by WKT)."""
+    key = {}
+    for name, value in read_kwargs.items():
+        if isinstance(value, (gpd.GeoDataFrame, gpd.GeoSeries)):
+            value = (value.crs.to_string() if value.crs else None, value.union_all().wkt)
+        elif hasattr(value, "wkt"):
+            value = value.wkt
+        key[name] = value
+    return key
+
+def _filter_bounds(bbox=None, mask=None, crs=None):
+    """(minx, miny, maxx, maxy) covering a bbox/mask filter in `crs`, or None if unfiltered."""
+    spatial = mask if mask is not None else bbox
+    if spatial is None:
+        return None
+    if isinstance(spatial, (gpd.GeoDataFrame, gpd.GeoSeries)):
+        if crs is not None and spatial.crs is not None:
+            spatial = spatial.to_crs(crs)
+        return tuple(spatial.total_bounds)
+    if hasattr(spatial, "bounds"):
+        return tuple(spatial.bounds)
+    return tuple(spatial)
+
+def _bounds_intersect(a, b) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+def _load_timed(full_path: Path, load_kwargs: dict):
+    """Worker entry point for `load_files_from_metdata`: load one file and time it."""
+    start = time.perf_counter()
+    gdf = load_geometry(full_path, **load_kwargs)
+    return gdf, time.perf_counter() - start
+
+def load_files_from_metdata(
+    filtered_shape_meta_df: pd.DataFrame,
+    in_dir: Path,
+    target_crs=None,
+    workers: int = 1,
+    executor: str = "process",
+    max_pending: Union[int, None] = None,
+    return_report: bool = False,
+    use_cache: bool = False,
+    cache_dir: Union[str, Path, None] = None,
+    columns: Union[List[str], None] = None,
+    bbox=None,
+    mask=None,
+    where: Union[str, None] = None
+):
     """
     Load shapefiles listed in a metadata DataFrame into GeoDataFrames.
 
+    Files are independent, so with `workers > 1` they are loaded concurrently.
+    At most `max_pending` loads are in flight at once, which bounds how many
+    partially-built GeoDataFrames exist in the workers at any time.
+
     Args:
         filtered_shape_meta_df (pd.DataFrame): Contains 'Year', 'FullPath', and 'Shapefile' columns.
         in_dir (Path): Base directory to prepend to 'FullPath'.
         target_crs (str | int | None): Optional CRS to reproject geometries.
+        workers (int): Number of concurrent loads. 1 loads serially in this process.
+        executor (str): 'process' (ProcessPoolExecutor) or 'thread' (ThreadPoolExecutor;
+            pyogrio releases the GIL while reading).
+        max_pending (int | None): Maximum loads in flight. Defaults to `workers`.
+        return_report (bool): Also return a per-file success/failure report.
+        use_cache (bool): Read each file through the GeoParquet cache.
+        cache_dir (str | Path | None): Cache directory. Defaults to `data/processed/cache`.
+        columns, bbox, mask, where: Reader pushdown filters, see `load_geometry`.
 
     Returns:
-        Dict[int, Dict[str, gpd.GeoDataFrame]]: Nested dict by year and shapefile name.
+        Dict[int, gpd.GeoDataFrame]: GeoDataFrame by year. If several files share a year,
+            the last one in metadata order wins.
+        pd.DataFrame (only if return_report): One row per file with 'Year', 'Shapefile',
+            'Path', 'Status', 'NumFeatures', 'Seconds' and 'Error'.
     """
+    if executor not in ("process", "thread"):
+        raise ValueError(f"Unsupported executor: {executor}")
+
+    jobs = [
+        (row.Year, row.Shapefile, Path(in_dir) / Path(row.FullPath) / row.Shapefile)
+        for row in filtered_shape_meta_df[["Year", "FullPath", "Shapefile"]].itertuples(index=False)
+    ]
+    load_kwargs = dict(target_crs=target_crs, use_cache=use_cache, cache_dir=cache_dir,
+                       columns=columns, bbox=bbox, mask=mask, where=where)
+    print(f'Loading {len(jobs)} shapefiles with {workers} worker(s)...')
+
+    results = [None] * len(jobs)
+    report = [None] * len(jobs)
+
+    def record(i, gdf=None, seconds=None, error=None):
+        year, shapefile, full_path = jobs[i]
+        results[i] = gdf
+        report[i] = {
+            "Year": year,
+            "Shapefile": shapefile,
+            "Path": str(full_path),
+            "Status": "success" if error is None else "failure",
+            "NumFeatures": len(gdf) if gdf is not None else None,
+            "Seconds": seconds,
+            "Error": error,
+        }
+        record_stage("load_file", seconds, year=year, file=str(full_path), rows=report[i]["NumFeatures"],
+                     status=report[i]["Status"])
+        if error is None:
+            print(f"[SUCCESS] Loaded {year} {shapefile}, {len(gdf)} features.")
+        else:
+            print(f"[FAILURE] {year} {shapefile}: {error}")
+
+    progress = tqdm(total=len(jobs))
+    if workers <= 1:
+        for i, (_, _, full_path) in enumerate(jobs):
+            try:
+                gdf, seconds = _load_timed(full_path, load_kwargs)
+                record(i, gdf, seconds)
+            except Exception as e:
+                record(i, error=str(e))
+            progress.update(1)
+    else:
+        pool_cls = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+        max_pending = max_pending or workers
+        with pool_cls(max_workers=workers) as pool:
+            pending = {}
+            next_job = 0
+            while next_job < len(jobs) or pending:
+                while next_job < len(jobs) and len(pending) < max_pending:
+                    full_path = jobs[next_job][2]
+                    future = pool.submit(_load_timed, full_path, load_kwargs)
+                    pending[future] = next_job
+                    next_job += 1
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = pending.pop(future)
+                    try:
+                        gdf, seconds = future.result()
+                        record(i, gdf, seconds)
+                    except Exception as e:
+                        record(i, error=str(e))
+                    progress.update(1)
+    progress.close()
 
-    print(f'Loading {filtered_shape_meta_df.shape[0]} shapefiles...')
     geoms = {}
-    
-    for _, row in tqdm(filtered_shape_meta_df.iterrows(), total=filtered_shape_meta_df.shape[0]):
-    # for _, row in filtered_shape_meta_df.iterrows():
-        year = row["Year"]
-        print('loading', year)
-        rel_path = Path(row["FullPath"]) / row["Shapefile"]
-        full_path = in_dir / rel_path
-
-        try:
-            gdf = load_geometry(full_path, target_crs=target_crs)
-            if year not in geoms:
-                geoms[year] = None
-            geoms[year] = gdf.copy()
-            print(f"[SUCCESS] Loaded {year} {row['Shapefile']}, {len(gdf)} features.")
-        except Exception as e:
-            print(f"[FAILURE] {year} {row['Shapefile']}: {e}")
+    for (year, _, _), gdf in zip(jobs, results):
+        if gdf is not None:
+            geoms[year] = gdf
 
+    if return_report:
+        return geoms, pd.DataFrame(report)
     return geoms
    
+def _json_default(value):
+    """Serialize values json.dumps can't handle natively (timestamps, numpy scalars)."""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+def _geojson_header(name: str, crs) -> bytes:
+    header = {"type": "FeatureCollection", "name": name}
+    if crs is not None and not crs.equals("EPSG:4326"):
+        authority = crs.to_authority()
+        if authority is not None:
+            header["crs"] = {"type": "name", "properties": {"name": f"urn:ogc:def:crs:{authority[0]}::{authority[1]}"}}
+    # Reopen the object so features can be streamed in before the closing bracket.
+    return (json.dumps(header)[:-1] + ', "features": [\n').encode("utf-8")
+
+def _iter_encoded_features(gdf: gpd.GeoDataFrame, batch_rows: int = 5000):
+    """Yield each row of `gdf` as an encoded GeoJSON Feature."""
+    for start in range(0, len(gdf), batch_rows):
+        batch = gdf.iloc[start:start + batch_rows]
+        for feature in batch.iterfeatures(na="null", drop_id=True):
+            yield json.dumps(feature, default=_json_default).encode("utf-8")
+
+def _write_year_parts(gdf: gpd.GeoDataFrame, year, output_dir: Path, max_bytes: Union[int, None]) -> list:
+    """
+    Stream `gdf` into GeoJSON parts, starting a new part when the next feature would
+    push the current one past `max_bytes`. Returns one manifest record per part.
+    """
+    header = _geojson_header(f"parcels_{year}", gdf.crs)
+    separator, footer = b",\n", b"\n]}\n"
+    bounds = gdf.geometry.bounds.to_numpy()
+
+    parts = []
+    handle, size, start_row = None, 0, 0
+
+    def open_part(row):
+        nonlocal handle, size, start_row
+        part_path = output_dir / f"__parcels_{year}_part{len(parts) + 1}.geojson.partial"
+        handle = open(part_path, "wb")
+        handle.write(header)
+        size, start_row = len(header), row
+
+    def close_part(stop_row):
+        handle.write(footer)
+        handle.close()
+        part_bounds = bounds[start_row:stop_row]
+        bbox = None
+        if stop_row > start_row and not np.isnan(part_bounds).all():
+            bbox = [*np.nanmin(part_bounds[:, :2], axis=0).tolist(), *np.nanmax(part_bounds[:, 2:], axis=0).tolist()]
+        parts.append({"path": handle.name, "rows": [start_row, stop_row], "bbox": bbox, "bytes": size + len(footer)})
+
+    open_part(0)
+    for row, feature in enumerate(_iter_encoded_features(gdf)):
+        if row > start_row:
+            if max_bytes is not None and size + len(separator) + len(feature) + len(footer) > max_bytes:
+                close_part(row)
+                open_part(row)
+            else:
+                handle.write(separator)
+                size += len(separator)
+
+        handle.write(feature)
+        size += len(feature)
+
+    close_part(len(gdf))
+    return parts
+
 def save_geojson_per_year(
     geoms: Dict[int, gpd.GeoDataFrame],
     output_dir: Path,
@@ -99,6 +349,12 @@ def save_geojson_per_year(
     Save each year's GeoDataFrame to individual GeoJSON files. If max_size is set,
     split each file into multiple parts to stay under the size limit.
 
+    Features are serialized once and streamed to disk; a new part is started exactly
+    when the next feature would exceed `max_size` (a single feature larger than the
+    budget gets a part of its own). Alongside the parts, `parcels_{year}_manifest.json`
+    records each part's file name, row range, bbox and byte size. Parts from a
+    previous save of the same year are replaced.
+
     Args:
         geoms (dict): {year: GeoDataFrame}
         output_dir (Path): Directory to save output files
@@ -110,56 +366,289 @@ def save_geojson_per_year(
     for year, gdf in geoms.items():
         print(f"Saving {year}...")
 
-        # Save full file temporarily to measure size
-        temp_path = output_dir / f"__temp_parcels_{year}.geojson"
-        gdf.to_file(temp_path, driver="GeoJSON")
-        size = temp_path.stat().st_size
+        with stage("serialize", year=year, rows=len(gdf)) as s:
+            parts = _write_year_parts(gdf, year, output_dir, max_bytes)
+            s.set(parts=len(parts), bytes=sum(part["bytes"] for part in parts))
+        volume_max = len(parts)
 
-        if max_bytes is None or size <= max_bytes:
-            volume_max = 1
-            chunks = [(1, gdf)]
-        else:
-            volume_max = math.ceil(size / max_bytes)
-            chunk_size = math.ceil(len(gdf) / volume_max)
-            chunks = [
-                (i + 1, gdf.iloc[start:start + chunk_size])
-                for i, start in enumerate(range(0, len(gdf), chunk_size))
-            ]
-
-        for i, chunk in chunks:
+        stale = set(_scan_year_files(output_dir, year))
+        manifest_parts = []
+        for i, part in enumerate(parts, start=1):
             out_path = output_dir / f"parcels_{year}_part{i}_{volume_max}.geojson"
-            chunk.to_file(out_path, driver="GeoJSON")
-            print(f"Saved part {i}/{volume_max}: {out_path} ({chunk.shape[0]} rows)")
+            Path(part["path"]).replace(out_path)
+            stale.discard(out_path)
+            start, stop = part["rows"]
+            manifest_parts.append({"file": out_path.name, "rows": [start, stop], "bbox": part["bbox"], "bytes": part["bytes"]})
+            print(f"Saved part {i}/{volume_max}: {out_path} ({stop - start} rows)")
+
+        for old_path in stale:
+            old_path.unlink()
+
+        manifest = {
+            "year": year,
+            "rows": len(gdf),
+            "crs": gdf.crs.to_string() if gdf.crs else None,
+            "max_bytes": max_bytes,
+            "parts": manifest_parts,
+        }
+        manifest_path(output_dir, year).write_text(json.dumps(manifest, indent=2, default=_json_default))
+
+def manifest_path(directory, year) -> Path:
+    """Path of the partition manifest written by `save_geojson_per_year`."""
+    return Path(directory) / f"parcels_{year}_manifest.json"
+
+def read_manifest(directory, year) -> Union[dict, None]:
+    """Return the partition manifest for a year, or None if the year has none."""
+    path = manifest_path(directory, year)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
 
-        if temp_path.exists():
-            temp_path.unlink()
+def _scan_year_files(directory: Path, year) -> list:
+    pattern = re.compile(rf'^parcels_{year}_part(\d+)_\d+\.geojson$')
+    matches = [(int(m.group(1)), f) for f in directory.iterdir() if (m := pattern.match(f.name))]
+    return [f for _, f in sorted(matches)]
 
-def load_processed_year_files(directory, year, target_crs=None):
+def find_year_files(directory, year):
+    """
+    Return the `parcels_{year}_partN_M.geojson` files for a year in `directory`, in part order.
+
+    Uses the year's manifest when present and falls back to scanning the directory.
+    """
+    directory = Path(directory)
+    manifest = read_manifest(directory, year)
+    if manifest is not None:
+        matching_files = [directory / part["file"] for part in manifest["parts"]]
+    else:
+        matching_files = _scan_year_files(directory, year)
+
+    if not matching_files:
+        raise FileNotFoundError(f"No matching files found for year {year} in {directory}")
+    return matching_files
+
+def lod_path(directory, year, level: int) -> Path:
+    """Path of a simplified level written by `parceltrack.io.simplify.build_lod_levels`."""
+    return Path(directory) / f"parcels_{year}_lod{level}.parquet"
+
+def lod_manifest_path(directory, year) -> Path:
+    """Path of the sidecar describing a year's simplified levels."""
+    return Path(directory) / f"parcels_{year}_lod.json"
+
+def _parquet_crs(path: Path):
+    """CRS stored in a GeoParquet file's metadata, without reading any rows."""
+    geo = json.loads(pq.read_schema(path).metadata[b"geo"])
+    crs = geo["columns"][geo["primary_column"]].get("crs")
+    return CRS.from_user_input(crs) if crs else None
+
+def _read_lod_level(directory: Path, year, level: int, read_kwargs: dict, target_crs=None) -> gpd.GeoDataFrame:
+    """Read one simplified level (GeoParquet) with the same filters as the partitions."""
+    path = lod_path(directory, year, level)
+    if not path.exists():
+        raise FileNotFoundError(f"No level {level} for year {year} in {directory}; run build_lod_levels first.")
+    if "where" in read_kwargs:
+        raise ValueError("`where` is not supported for simplified levels; filter the returned frame instead.")
+
+    manifest = read_manifest(directory, year)
+    lod_manifest = lod_manifest_path(directory, year)
+    if manifest is not None and lod_manifest.exists():
+        sources = [directory / part["file"] for part in manifest["parts"]]
+        if json.loads(lod_manifest.read_text()).get("signature") != source_signature(sources):
+            print(f"[WARNING] Level {level} for year {year} is older than its partitions; rebuild it with build_lod_levels.")
+
+    columns = read_kwargs.get("columns")
+    mask = read_kwargs.get("mask")
+    crs = _parquet_crs(path)
+    bounds = _filter_bounds(read_kwargs.get("bbox"), mask, crs=crs)
+    gdf = gpd.read_parquet(path, columns=None if columns is None else list(columns) + ["geometry"], bbox=bounds)
+
+    if mask is not None:
+        if isinstance(mask, (gpd.GeoDataFrame, gpd.GeoSeries)):
+            mask = (mask.to_crs(crs) if mask.crs is not None and crs is not None else mask).union_all()
+        gdf = gdf[gdf.intersects(mask)]
+    # Same 0..n-1 index as the partition loaders, after masking and dropping invalid rows.
+    return _clean_geometry(gdf, True, target_crs).reset_index(drop=True)
+
+def _arrow_filters(read_kwargs: dict, crs) -> dict:
+    """Translate `load_geometry` filters to what `pyogrio.read_arrow` accepts."""
+    kwargs = dict(read_kwargs)
+    if "bbox" in kwargs and not isinstance(kwargs["bbox"], tuple):
+        kwargs["bbox"] = _filter_bounds(bbox=kwargs["bbox"], crs=crs)
+    mask = kwargs.get("mask")
+    if isinstance(mask, (gpd.GeoDataFrame, gpd.GeoSeries)):
+        if crs is not None and mask.crs is not None:
+            mask = mask.to_crs(crs)
+        kwargs["mask"] = mask.union_all()
+    return kwargs
+
+def _read_part_arrow(path: Path, read_kwargs: dict, crs):
+    """Read one partition as an Arrow table (no pandas conversion)."""
+    meta, table = pyogrio.read_arrow(path, **_arrow_filters(read_kwargs, crs))
+    geometry_name = meta["geometry_name"] or "wkb_geometry"
+    return meta, table.rename_columns(["geometry" if c == geometry_name else c for c in table.column_names])
+
+def _read_parts_concurrent(part_files: list, read_kwargs: dict, workers: int, crs=None) -> gpd.GeoDataFrame:
+    """
+    Read partitions on a thread pool as Arrow tables and build one GeoDataFrame.
+
+    Arrow tables are concatenated without copying their buffers, and the pandas
+    conversion releases each Arrow buffer as soon as it has been converted, so peak
+    memory stays close to a single copy of the year.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda f: _read_part_arrow(f, read_kwargs, crs), part_files))
+
+    part_crs = results[0][0]["crs"]
+    table = pa.concat_tables([t for _, t in results], promote_options="permissive")
+    del results
+
+    wkb = table.column("geometry")
+    table = table.drop_columns(["geometry"])
+    df = table.to_pandas(self_destruct=True, split_blocks=True)
+    del table
+    geometry = gpd.GeoSeries.from_wkb(wkb.to_numpy(zero_copy_only=False), crs=part_crs)
+    del wkb
+    return gpd.GeoDataFrame(df, geometry=geometry.values, crs=part_crs)
+
+def load_processed_year_files(
+    directory,
+    year,
+    target_crs=None,
+    use_cache=False,
+    cache_dir=None,
+    columns=None,
+    bbox=None,
+    mask=None,
+    where=None,
+    workers=1,
+    level=0,
+    compact=False
+):
     """
     Loads and concatenates all GeoJSON partition files for a given year using `load_geometry`.
 
+    With a `bbox` or `mask`, parts whose manifest extent does not intersect the filter
+    are skipped without being opened. With `workers > 1`, parts are read concurrently as
+    Arrow tables (part order is kept) and converted to a single GeoDataFrame in one pass
+    instead of concatenating per-part frames.
+
+    With `level > 0`, the year's simplified GeoParquet level (see
+    `parceltrack.io.simplify.build_lod_levels`) is read instead of the partitions;
+    `columns`, `bbox` and `mask` still apply, the cache is not used.
+
     Parameters:
     - directory (str or Path): Folder containing partitioned GeoJSON files.
     - year (int or str): Year of interest (e.g., 2021).
     - target_crs (str or CRS, optional): CRS to reproject all GeoDataFrames into.
+    - use_cache (bool): Read the combined year from / write it to the GeoParquet cache.
+    - cache_dir (str or Path, optional): Cache directory. Defaults to `data/processed/cache`.
+    - columns, bbox, mask, where: Reader pushdown filters, see `load_geometry`.
+    - workers (int): Number of partitions read concurrently.
+    - level (int): 0 for full-resolution partitions, n for the n-th simplified level.
+    - compact (bool): Return memory-compact dtypes (see `parceltrack.io.dtypes.compact_dtypes`).
 
     Returns:
     - GeoDataFrame: Combined GeoDataFrame with unified CRS.
     """
+    with stage("load_year", year=year, level=level) as s:
+        combined = _load_processed_year(directory, year, target_crs, use_cache, cache_dir,
+                                        columns, bbox, mask, where, workers, level)
+        s.set(rows=len(combined))
+    return _compact(combined, compact, year=year)
+
+def _load_processed_year(directory, year, target_crs, use_cache, cache_dir, columns, bbox, mask, where, workers, level):
+    """Body of `load_processed_year_files`, run inside its 'load_year' stage."""
     directory = Path(directory)
-    pattern = re.compile(rf'^parcels_{year}_part\d+_\d+\.geojson$')
-    matching_files = sorted([f for f in directory.iterdir() if pattern.match(f.name)])
+    read_kwargs = _read_kwargs(columns=columns, bbox=bbox, mask=mask, where=where)
+    if level:
+        combined = _read_lod_level(directory, year, level, read_kwargs, target_crs=target_crs)
+        print(f"[SUCCESS] Loaded {len(combined)} features for year {year} at level {level}.")
+        return combined
+
+    matching_files = find_year_files(directory, year)
+    cache_options = {"year": year, "validate_geometry": True, "target_crs": target_crs, **_filter_key(read_kwargs)}
+    if use_cache:
+        with stage("cache_read", year=year) as s:
+            cached = read_cache(matching_files, cache_options, name=f"parcels_{year}", cache_dir=cache_dir)
+            s.set(hit=cached is not None, rows=len(cached) if cached is not None else None)
+        if cached is not None:
+            print(f"[INFO] Loaded {len(cached)} features for year {year} from cache.")
+            return cached
+
+    part_files = matching_files
+    manifest = read_manifest(directory, year)
+    manifest_crs = manifest["crs"] if manifest else None
+    filter_bounds = _filter_bounds(bbox, mask, crs=manifest_crs)
+    if filter_bounds is not None and manifest is not None:
+        part_files = [
+            directory / part["file"] for part in manifest["parts"]
+            if part["bbox"] is not None and _bounds_intersect(part["bbox"], filter_bounds)
+        ]
+        # Nothing intersects: read one part anyway for an empty frame with the right schema.
+        part_files = part_files or matching_files[:1]
+
+    print(f"[INFO] Loading {len(part_files)} of {len(matching_files)} GeoJSON files for year {year}...")
+
+    if workers > 1:
+        with stage("read_parts", year=year, files=len(part_files), workers=workers) as s:
+            combined = _read_parts_concurrent(part_files, read_kwargs, workers, crs=manifest_crs)
+            s.set(rows=len(combined))
+        # Renumber after dropping invalid rows, as the serial path's concat does.
+        combined = _clean_geometry(combined, True, target_crs, year=year).reset_index(drop=True)
+    else:
+        gdfs = [load_geometry(f, target_crs=target_crs, **read_kwargs) for f in part_files]
+        with stage("concat", year=year, files=len(gdfs)) as s:
+            combined = gpd.GeoDataFrame(pd.concat(gdfs, ignore_index=True), crs=gdfs[0].crs)
+            s.set(rows=len(combined))
 
-    if not matching_files:
-        raise FileNotFoundError(f"No matching files found for year {year} in {directory}")
+    print(f"[SUCCESS] Combined {len(part_files)} files into {len(combined)} features.")
 
-    print(f"[INFO] Loading {len(matching_files)} GeoJSON files for year {year}...")
+    if use_cache:
+        with stage("cache_write", year=year, rows=len(combined)):
+            write_cache(combined, matching_files, cache_options, name=f"parcels_{year}", cache_dir=cache_dir)
+    return combined
 
-    gdfs = [load_geometry(f, target_crs=target_crs) for f in matching_files]
-    combined = gpd.GeoDataFrame(pd.concat(gdfs, ignore_index=True), crs=gdfs[0].crs)
+def load_processed_years(directory, years, **kwargs) -> Dict[int, gpd.GeoDataFrame]:
+    """
+    Load several processed years with `load_processed_year_files`.
 
-    print(f"[SUCCESS] Combined {len(gdfs)} files into {len(combined)} features.")
-    return combined
+    Years are loaded one after another, so only one year is being assembled at a time;
+    use `workers=` to read each year's parts concurrently. With `compact=True`, each
+    year is compacted as it is loaded and categorical columns then get the same
+    categories in every year (see `parceltrack.io.dtypes.unify_categories`).
+
+    Args:
+        directory (str | Path): Folder containing partitioned GeoJSON files.
+        years (Iterable[int]): Years to load.
+        **kwargs: Passed to `load_processed_year_files`.
+
+    Returns:
+        Dict[int, gpd.GeoDataFrame]: GeoDataFrame by year, in the order given.
+    """
+    geoms = {year: load_processed_year_files(directory, year, **kwargs) for year in years}
+    if kwargs.get("compact"):
+        geoms = unify_categories(geoms)
+    return geoms
+
+def rebuild_cache(filepath, year=None, cache_dir=None, **load_kwargs):
+    """
+    Drop and rebuild the cache entries for a file, or for a processed year.
+
+    Args:
+        filepath (str | Path): Spatial file, or the partition directory when `year` is set.
+        year (int | None): Rebuild the combined year from `load_processed_year_files`.
+        cache_dir (str | Path | None): Cache directory. Defaults to `data/processed/cache`.
+        **load_kwargs: Passed to the loader (e.g. `target_crs`).
+
+    Returns:
+        gpd.GeoDataFrame: Freshly loaded data.
+    """
+    if year is not None:
+        for part in find_year_files(filepath, year):
+            invalidate_cache(part, cache_dir=cache_dir)
+        return load_processed_year_files(filepath, year, use_cache=True, cache_dir=cache_dir, **load_kwargs)
+
+    invalidate_cache(filepath, cache_dir=cache_dir)
+    return load_geometry(filepath, use_cache=True, cache_dir=cache_dir, **load_kwargs)
 
 
 
@@ -0,0 +1,155 @@
+# parceltrack/io/simplify.py
+
+"""
+Multi-resolution (level-of-detail) versions of the processed parcel years.
+
+Overview maps and citywide aggregates do not need full-precision boundaries. For
+each year, `build_lod_levels` writes simplified copies at increasing tolerances,
+with coordinates snapped to a coarser grid, as GeoParquet files next to the GeoJSON
+partitions:
+
+    parcels_2021_lod1.parquet, parcels_2021_lod2.parquet, ..., parcels_2021_lod.json
+
+Level n is read back with `load_processed_year_files(directory, year, level=n)`.
+The parcels of a year are simplified together as a coverage (`shapely.coverage_simplify`,
+shapely >= 2.1): each edge shared by neighbouring parcels is simplified once, so
+neighbours still share it exactly and no gaps or overlaps open up between them.
+Parcels whose simplified shape is invalid (which happens where the input itself has
+overlaps) fall back to simplifying on their own.
+
+Example:
+    from parceltrack.io.simplify import build_lod_levels
+    build_lod_levels(paths.processed / "parcels", 2021, tolerances=(2.0, 10.0), workers=4)
+    overview = load_processed_year_files(paths.processed / "parcels", 2021, level=2)
+"""
+
+from pathlib import Path
+from typing import List, Sequence, Union
+import geopandas as gpd
+import json
+import numpy as np
+import shapely
+
+from parceltrack.io.cache import source_signature
+from parceltrack.io.load_geometry import (find_year_files,
+                                          load_processed_year_files,
+                                          lod_manifest_path,
+                                          lod_path
+                                        )
+
+# Tolerances in CRS units (US feet for the Maryland State Plane data).
+LOD_TOLERANCES = (1.0, 5.0, 25.0)
+
+
+def simplify_geometries(
+    geoms: Union[np.ndarray, gpd.GeoSeries],
+    tolerance: float,
+    grid_size: Union[float, None] = None
+) -> np.ndarray:
+    """
+    Coverage simplification plus coordinate snapping.
+
+    All polygons are simplified in one pass, so edges shared by neighbours stay shared
+    (a coverage cannot be split into independently simplified chunks). Missing, empty
+    and non-polygonal geometries are returned unchanged.
+
+    Args:
+        geoms (np.ndarray | gpd.GeoSeries): Geometries to simplify.
+        tolerance (float): Simplification tolerance (CRS units), roughly the square root
+            of the area of the vertex triangles that are removed.
+        grid_size (float | None): Snap coordinates to this grid; None keeps full precision.
+
+    Returns:
+        np.ndarray: Simplified geometries, in input order.
+    """
+    geoms = np.asarray(geoms.values if isinstance(geoms, gpd.GeoSeries) else geoms)
+    simplified = geoms.copy()
+    polygonal = ~shapely.is_missing(geoms) & ~shapely.is_empty(geoms) \
+        & np.isin(shapely.get_type_id(geoms), [3, 6])
+    if polygonal.any():
+        coverage = shapely.coverage_simplify(geoms[polygonal], tolerance)
+        invalid = ~shapely.is_valid(coverage)
+        if invalid.any():
+            print(f"[WARNING] {invalid.sum()} parcels are not part of a valid coverage; simplifying them on their own.")
+            coverage[invalid] = shapely.simplify(geoms[polygonal][invalid], tolerance, preserve_topology=True)
+        simplified[polygonal] = coverage
+    if not grid_size:
+        return simplified
+    # Shared vertices snap to the same grid point, so snapping keeps the coverage intact.
+    snapped = shapely.set_precision(simplified, grid_size)
+    # Parcels smaller than the grid collapse when snapped; keep their simplified shape.
+    return np.where(shapely.is_empty(snapped) & ~shapely.is_empty(simplified), simplified, snapped)
+
+
+def build_lod_levels(
+    directory: Union[str, Path],
+    year,
+    tolerances: Sequence[float] = LOD_TOLERANCES,
+    grid_sizes: Union[Sequence[float], None] = None,
+    columns: Union[List[str], None] = None,
+    workers: int = 1,
+    overwrite: bool = False
+) -> List[Path]:
+    """
+    Write simplified levels 1..n of a processed year next to its partitions.
+
+    Levels are skipped when the sidecar shows they were built from the current
+    partitions with the same tolerances, unless `overwrite` is set.
+
+    Args:
+        directory (str | Path): Folder containing the year's GeoJSON partitions.
+        year (int): Year to simplify.
+        tolerances (Sequence[float]): Simplification tolerance of each level (CRS units), finest first.
+        grid_sizes (Sequence[float] | None): Coordinate grid of each level; defaults to a tenth of its tolerance.
+        columns (list[str] | None): Attribute columns to keep; None keeps all.
+        workers (int): Processes used for reading the partitions.
+        overwrite (bool): Rebuild even if the levels are up to date.
+
+    Returns:
+        List[Path]: The level files, level 1 first.
+    """
+    directory = Path(directory)
+    grid_sizes = list(grid_sizes) if grid_sizes is not None else [t / 10 for t in tolerances]
+    if len(grid_sizes) != len(tolerances):
+        raise ValueError("grid_sizes must have one entry per tolerance.")
+
+    signature = source_signature(find_year_files(directory, year))
+    level_specs = [{"level": i + 1, "tolerance": t, "grid_size": g} for i, (t, g) in enumerate(zip(tolerances, grid_sizes))]
+    files = [lod_path(directory, year, spec["level"]) for spec in level_specs]
+
+    sidecar = lod_manifest_path(directory, year)
+    if not overwrite and sidecar.exists() and all(f.exists() for f in files):
+        previous = json.loads(sidecar.read_text())
+        built = [{k: lvl[k] for k in ("level", "tolerance", "grid_size")} for lvl in previous.get("levels", [])]
+        if previous.get("signature") == signature and previous.get("columns") == columns and built == level_specs:
+            print(f"[INFO] Levels for year {year} are up to date.")
+            return files
+
+    gdf = load_processed_year_files(directory, year, columns=columns, workers=workers)
+    vertices = shapely.get_num_coordinates(gdf.geometry.values).sum()
+
+    sidecar.unlink(missing_ok=True)
+    for spec, path in zip(level_specs, files):
+        simplified = simplify_geometries(gdf.geometry, spec["tolerance"], spec["grid_size"])
+        level_gdf = gdf.set_geometry(simplified, crs=gdf.crs)
+        tmp_path = path.with_suffix(".parquet.tmp")
+        level_gdf.to_parquet(tmp_path, index=False, write_covering_bbox=True)
+        tmp_path.replace(path)
+
+        spec["vertices"] = int(shapely.get_num_coordinates(simplified).sum())
+        spec["bytes"] = path.stat().st_size
+        print(f"[SUCCESS] Level {spec['level']} (tolerance {spec['tolerance']}): "
+              f"{spec['vertices'] / max(vertices, 1):.0%} of vertices, {spec['bytes'] / 1024 / 1024:.1f} MB -> {path.name}")
+
+    # Written last, so an interrupted build never looks up to date.
+    sidecar.write_text(json.dumps({
+        "year": year,
+        "columns": columns,
+        "vertices": int(vertices),
+        "signature": signature,
+        "levels": level_specs,
+    }, indent=2, default=str))
+    for stale in directory.glob(f"parcels_{year}_lod*.parquet"):
+        if stale not in files:
+            stale.unlink()
+    return files
@@ -0,0 +1,253 @@
+# parceltrack/io/stream.py
+
+"""
+Streaming reads and bounded-memory queries over parcel files.
+
+Most exploratory questions ("which owners hold zero-value parcels with structures
+on them?") need a few columns of every row but produce a small result. Instead of
+loading a whole year, `iter_file_batches` / `iter_year_batches` stream fixed-size
+row batches (attributes only, unless `geometry=True`) from a raw shapefile, a
+member of a raw zip archive, or a year's processed partitions, and `query` /
+`query_years` filter each batch and fold it into running group counts and sums.
+Peak memory is one batch plus the aggregate, whatever the size of the year.
+
+Example:
+    from parceltrack.io.stream import query_years
+    owners = query_years(paths.processed, [2021, 2022],
+                         where="NFMTTLVL = 0 AND SQFTSTRC > 0", by=["Year", "OWNNAME1"])
+"""
+
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Union
+import geopandas as gpd
+import pandas as pd
+import pyogrio
+
+from parceltrack.io.archive import path_exists, vsi_path
+from parceltrack.io.load_geometry import (_arrow_filters,
+                                          _bounds_intersect,
+                                          _filter_bounds,
+                                          find_year_files,
+                                          read_manifest
+                                        )
+from parceltrack.instrumentation import stage
+
+DEFAULT_BATCH_SIZE = 50_000
+
+Filter = Union[str, Callable[[pd.DataFrame], pd.Series], None]
+
+
+def iter_file_batches(
+    filepath: Union[str, Path],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    columns: Union[List[str], None] = None,
+    where: Union[str, None] = None,
+    bbox=None,
+    mask=None,
+    geometry: bool = False
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield a spatial file's rows in batches of `batch_size` (the last one may be shorter).
+
+    The filters are pushed down to GDAL as in `load_geometry`; spatial filters are in
+    the file's CRS. Only the current batch is held in memory.
+
+    Args:
+        filepath (str | Path): Spatial file, possibly inside a zip archive.
+        batch_size (int): Rows per batch.
+        columns (list[str] | None): Attribute columns to read.
+        where (str | None): SQL WHERE clause on attributes.
+        bbox, mask: Spatial filters, see `load_geometry`.
+        geometry (bool): Also read geometries and yield GeoDataFrames.
+
+    Yields:
+        pd.DataFrame | gpd.GeoDataFrame: One batch of rows.
+    """
+    path = Path(filepath)
+    if not path_exists(path):
+        raise FileNotFoundError(f"File not found: {path}")
+
+    read_kwargs = {k: v for k, v in {"columns": columns, "where": where, "bbox": bbox, "mask": mask}.items() if v is not None}
+    spatial = "bbox" in read_kwargs or "mask" in read_kwargs
+    if spatial:
+        read_kwargs = _arrow_filters(read_kwargs, pyogrio.read_info(vsi_path(path))["crs"])
+
+    # GDAL skips the spatial filter when geometries are not read, so read them and drop
+    # them here; with nothing else to read (no columns, no geometry), read feature ids.
+    read_geometry = geometry or spatial
+    fids_only = columns is not None and len(columns) == 0 and not read_geometry
+    with pyogrio.open_arrow(vsi_path(path), batch_size=batch_size, read_geometry=read_geometry,
+                            return_fids=fids_only, use_pyarrow=True, **read_kwargs) as (meta, reader):
+        geometry_name = meta["geometry_name"] or "wkb_geometry"
+        for batch in reader:
+            if batch.num_rows == 0:
+                continue
+            if read_geometry and not geometry:
+                batch = batch.drop_columns([geometry_name])
+            df = batch.to_pandas()
+            if fids_only:
+                df = df.iloc[:, :0]
+            if geometry:
+                wkb = df.pop(geometry_name)
+                df = gpd.GeoDataFrame(df, geometry=gpd.GeoSeries.from_wkb(wkb.to_numpy(), crs=meta["crs"]))
+            yield df
+
+
+def iter_year_batches(
+    directory: Union[str, Path],
+    year,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    columns: Union[List[str], None] = None,
+    where: Union[str, None] = None,
+    bbox=None,
+    mask=None,
+    geometry: bool = False
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield the rows of a processed year in batches, one partition after another.
+
+    With a `bbox` or `mask`, partitions whose manifest extent does not intersect the
+    filter are skipped, as in `load_processed_year_files`. Other arguments are as in
+    `iter_file_batches`.
+    """
+    directory = Path(directory)
+    part_files = find_year_files(directory, year)
+    manifest = read_manifest(directory, year)
+    filter_bounds = _filter_bounds(bbox, mask, crs=manifest["crs"] if manifest else None)
+    if filter_bounds is not None and manifest is not None:
+        part_files = [
+            directory / part["file"] for part in manifest["parts"]
+            if part["bbox"] is not None and _bounds_intersect(part["bbox"], filter_bounds)
+        ]
+    for part in part_files:
+        yield from iter_file_batches(part, batch_size=batch_size, columns=columns, where=where,
+                                     bbox=bbox, mask=mask, geometry=geometry)
+
+
+def _apply_filter(df: pd.DataFrame, filter: Filter) -> pd.DataFrame:
+    if filter is None:
+        return df
+    if isinstance(filter, str):
+        return df.query(filter)
+    return df[filter(df)]
+
+
+def _aggregate(df: pd.DataFrame, by: List[str], sums: List[str]) -> pd.DataFrame:
+    """Counts and sums of one batch, by group (or a single row without `by`)."""
+    if not by:
+        return pd.DataFrame({"count": [len(df)], **{c: [df[c].sum()] for c in sums}})
+    grouped = df.groupby(by, dropna=False, observed=True, sort=False)
+    out = grouped.size().to_frame("count")
+    if sums:
+        out = out.join(grouped[sums].sum())
+    return out
+
+
+def query(
+    batches: Iterable[pd.DataFrame],
+    filter: Filter = None,
+    by: Union[str, List[str], None] = None,
+    sums: Union[str, List[str], None] = None
+) -> pd.DataFrame:
+    """
+    Filter batches and fold them into group counts (and sums) with bounded memory.
+
+    Each batch is filtered, aggregated and merged into the running result, then
+    dropped, so memory is one batch plus one row per group seen so far.
+
+    Args:
+        batches (Iterable[pd.DataFrame]): E.g. `iter_year_batches(...)`.
+        filter (str | callable | None): A `DataFrame.query` expression, or a function
+            returning a boolean mask for a batch. Prefer the readers' `where` for
+            filters GDAL can evaluate; use this for anything else.
+        by (str | list[str] | None): Group columns; None counts over all rows.
+        sums (str | list[str] | None): Columns summed per group.
+
+    Returns:
+        pd.DataFrame: Indexed by `by` (sorted, missing values included), with 'count'
+            and one column per summed column; a single row without `by`.
+    """
+    by = [by] if isinstance(by, str) else list(by or [])
+    sums = [sums] if isinstance(sums, str) else list(sums or [])
+
+    result = None
+    with stage("query", by=",".join(by)) as s:
+        scanned = 0
+        for batch in batches:
+            scanned += len(batch)
+            part = _aggregate(_apply_filter(batch, filter), by, sums)
+            if result is None:
+                result = part
+            elif by:
+                result = pd.concat([result, part]).groupby(level=list(range(len(by))), dropna=False, sort=False).sum()
+            else:
+                result = result + part
+        if result is None:
+            result = pd.DataFrame(columns=["count"] + sums)
+        elif by:
+            result = result.sort_index()
+        s.set(rows=scanned, groups=len(result))
+    return result
+
+
+def query_years(
+    directory: Union[str, Path],
+    years: Iterable,
+    filter: Filter = None,
+    by: Union[str, List[str], None] = None,
+    sums: Union[str, List[str], None] = None,
+    where: Union[str, None] = None,
+    columns: Union[List[str], None] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    **filters
+) -> pd.DataFrame:
+    """
+    Run `query` over the processed partitions of several years.
+
+    Each batch gets a 'Year' column, so 'Year' can be used in `by`. Only the columns
+    used by `by` and `sums` are read unless `columns` is given (add the ones a
+    `filter` needs; `where` is evaluated by GDAL and needs none).
+
+    Args:
+        directory (str | Path): Folder containing partitioned GeoJSON files.
+        years (Iterable): Years to scan, one after another.
+        filter, by, sums: See `query`.
+        where (str | None): SQL WHERE clause pushed down to the reader.
+        columns (list[str] | None): Attribute columns to read.
+        batch_size (int): Rows per batch.
+        **filters: `bbox` / `mask`, passed to `iter_year_batches`.
+
+    Returns:
+        pd.DataFrame: See `query`.
+    """
+    by_cols = [by] if isinstance(by, str) else list(by or [])
+    sum_cols = [sums] if isinstance(sums, str) else list(sums or [])
+    if columns is None:
+        columns = list(dict.fromkeys(c for c in by_cols + sum_cols if c != "Year"))
+
+    def batches():
+        for year in years:
+            for batch in iter_year_batches(directory, year, batch_size=batch_size, columns=columns,
+                                           where=where, **filters):
+                batch.insert(0, "Year", year)
+                yield batch
+
+    return query(batches(), filter=filter, by=by, sums=sums)
+
+
+def collect(batches: Iterable[pd.DataFrame], filter: Filter = None, limit: Union[int, None] = None) -> pd.DataFrame:
+    """Concatenate the rows of `batches` that pass `filter`, stopping after `limit` rows."""
+    kept: List[pd.DataFrame] = []
+    total = 0
+    for batch in batches:
+        batch = _apply_filter(batch, filter)
+        if limit is not None:
+            batch = batch.iloc[:limit - total]
+        if len(batch):
+            kept.append(batch)
+            total += len(batch)
+        if limit is not None and total >= limit:
+            break
+    if not kept:
+        return pd.DataFrame()
+    return pd.concat(kept, ignore_index=True)
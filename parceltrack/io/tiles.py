@@ -0,0 +1,291 @@
+# parceltrack/io/tiles.py
+
+"""
+Offline Mapbox Vector Tile (MVT) pyramids for processed parcel years.
+
+Cuts a year of parcels into z/x/y vector tiles in Web Mercator, either as a
+directory tree (`<output>/<z>/<x>/<y>.pbf`) or as a single MBTiles (SQLite) file
+when the output ends in `.mbtiles`. Tiles are encoded in parallel: every worker
+process parses the geometries once and builds its own STRtree, then encodes batches
+of tiles (clip to the tile plus a buffer, scale to tile pixels, simplify and snap to
+the pixel grid). Tiles are gzip-compressed, as MBTiles viewers expect.
+
+Requires the optional `mapbox-vector-tile` package (`pip install parceltrack[tiles]`).
+
+Example:
+    python -m parceltrack.io.tiles --years 2021 2022 --columns ACCTID NFMTTLVL ZONING --workers 4
+
+    from parceltrack.io.tiles import build_year_tiles
+    build_year_tiles(paths.processed, 2021, "parcels_2021.mbtiles", minzoom=12, maxzoom=16)
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Tuple, Union
+import argparse
+import geopandas as gpd
+import gzip
+import json
+import math
+import numpy as np
+import shapely
+import sqlite3
+
+from parceltrack.configs.paths import ProjectPaths
+from parceltrack.io.load_geometry import load_processed_year_files
+
+try:
+    import mapbox_vector_tile
+except ImportError:
+    mapbox_vector_tile = None
+
+EXTENT = 4096
+WEB_MERCATOR_HALF = 20037508.342789244
+DEFAULT_TILE_COLUMNS = ["ACCTID", "NFMTTLVL", "ZONING"]
+
+
+def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """Web Mercator (EPSG:3857) bounds of XYZ tile z/x/y."""
+    size = 2 * WEB_MERCATOR_HALF / 2 ** z
+    minx = -WEB_MERCATOR_HALF + x * size
+    maxy = WEB_MERCATOR_HALF - y * size
+    return minx, maxy - size, minx + size, maxy
+
+
+def tiles_for_bounds(bounds: Sequence[float], z: int) -> Iterator[Tuple[int, int, int]]:
+    """XYZ tiles at zoom `z` covering Web Mercator `bounds` (minx, miny, maxx, maxy)."""
+    n = 2 ** z
+    size = 2 * WEB_MERCATOR_HALF / n
+
+    def clamp(v):
+        return min(max(v, 0), n - 1)
+
+    x0 = clamp(math.floor((bounds[0] + WEB_MERCATOR_HALF) / size))
+    x1 = clamp(math.floor((bounds[2] + WEB_MERCATOR_HALF) / size))
+    y0 = clamp(math.floor((WEB_MERCATOR_HALF - bounds[3]) / size))
+    y1 = clamp(math.floor((WEB_MERCATOR_HALF - bounds[1]) / size))
+    for x in range(x0, x1 + 1):
+        for y in range(y0, y1 + 1):
+            yield z, x, y
+
+
+def _tile_properties(gdf: gpd.GeoDataFrame, columns: Union[List[str], None]) -> List[Dict]:
+    """Per-feature attribute dicts with plain Python values; missing values are left out (MVT has no null)."""
+    columns = [c for c in (columns or []) if c in gdf.columns and c != gdf.geometry.name]
+    if not columns:
+        return [{} for _ in range(len(gdf))]
+    records = gdf[columns].astype(object).where(gdf[columns].notna(), None).to_dict("records")
+    return [{k: (v.item() if isinstance(v, np.generic) else v) for k, v in r.items() if v is not None} for r in records]
+
+
+_WORKER = {}
+
+
+def _init_worker(wkb: np.ndarray, properties: List[Dict], layer: str, buffer: int, simplify_px: float):
+    """Parse geometries and build the STRtree once per worker process."""
+    geoms = shapely.from_wkb(wkb)
+    _WORKER.update(geoms=geoms, tree=shapely.STRtree(geoms), properties=properties,
+                   layer=layer, buffer=buffer, simplify_px=simplify_px)
+
+
+def _encode_tile(z: int, x: int, y: int) -> Union[bytes, None]:
+    """Encode one tile from the worker's geometries, or None if it is empty."""
+    geoms, properties = _WORKER["geoms"], _WORKER["properties"]
+    minx, miny, maxx, maxy = tile_bounds(z, x, y)
+    scale = EXTENT / (maxx - minx)
+    pad = _WORKER["buffer"] / scale
+
+    hits = np.sort(_WORKER["tree"].query(shapely.box(minx - pad, miny - pad, maxx + pad, maxy + pad)))
+    if not len(hits):
+        return None
+
+    clipped = shapely.clip_by_rect(geoms[hits], minx - pad, miny - pad, maxx + pad, maxy + pad)
+    # Tile pixel coordinates with y up; the encoder flips y to MVT's y-down convention.
+    clipped = shapely.transform(clipped, lambda coords: (coords - (minx, miny)) * scale)
+    if _WORKER["simplify_px"]:
+        clipped = shapely.simplify(clipped, _WORKER["simplify_px"], preserve_topology=True)
+    clipped = shapely.set_precision(clipped, 1.0)
+
+    keep = ~shapely.is_empty(clipped)
+    if not keep.any():
+        return None
+    features = [
+        {"geometry": geom, "properties": properties[i], "id": int(i)}
+        for geom, i in zip(clipped[keep], hits[keep])
+    ]
+    tile = mapbox_vector_tile.encode([{"name": _WORKER["layer"], "features": features}], default_options={"extents": EXTENT})
+    return gzip.compress(tile)
+
+
+def _encode_batch(tiles: List[Tuple[int, int, int]]) -> List[Tuple[int, int, int, Union[bytes, None]]]:
+    return [(z, x, y, _encode_tile(z, x, y)) for z, x, y in tiles]
+
+
+def _open_mbtiles(path: Path, metadata: Dict) -> sqlite3.Connection:
+    path.unlink(missing_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE metadata (name TEXT, value TEXT);
+        CREATE TABLE tiles (zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB);
+        CREATE UNIQUE INDEX tile_index ON tiles (zoom_level, tile_column, tile_row);
+    """)
+    conn.executemany("INSERT INTO metadata VALUES (?, ?)", [(k, str(v)) for k, v in metadata.items()])
+    return conn
+
+
+def build_tiles(
+    gdf: gpd.GeoDataFrame,
+    output: Union[str, Path],
+    layer: str = "parcels",
+    columns: Union[List[str], None] = None,
+    minzoom: int = 12,
+    maxzoom: int = 16,
+    workers: int = 1,
+    buffer: int = 64,
+    simplify_px: float = 1.0,
+    batch_size: int = 64
+) -> Path:
+    """
+    Cut parcels into a vector tile pyramid.
+
+    Args:
+        gdf (gpd.GeoDataFrame): Parcels in any CRS (reprojected to EPSG:3857).
+        output (str | Path): Directory for z/x/y.pbf tiles, or a `.mbtiles` file.
+        layer (str): Layer name inside the tiles.
+        columns (list[str] | None): Attributes carried into the tiles; None carries none.
+        minzoom (int): Lowest zoom level.
+        maxzoom (int): Highest zoom level.
+        workers (int): Processes encoding tiles. 1 runs inline.
+        buffer (int): Pixels (of 4096) of geometry kept outside each tile edge.
+        simplify_px (float): Simplification tolerance in tile pixels; 0 disables it.
+        batch_size (int): Maximum tiles per task sent to a worker.
+
+    Returns:
+        Path: The tile directory or MBTiles file.
+    """
+    if mapbox_vector_tile is None:
+        raise ImportError("Vector tiles require the 'mapbox-vector-tile' package: pip install parceltrack[tiles]")
+
+    output = Path(output)
+    gdf = gdf[gdf.geometry.notna() & ~gdf.geometry.is_empty]
+    gdf = gdf.to_crs(3857) if gdf.crs is not None else gdf
+    wkb = shapely.to_wkb(np.asarray(gdf.geometry.values))
+    properties = _tile_properties(gdf, columns)
+    init_args = (wkb, properties, layer, buffer, simplify_px)
+
+    tiles = [t for z in range(minzoom, maxzoom + 1) for t in tiles_for_bounds(gdf.total_bounds, z)]
+    # Low zooms have few, heavy tiles: keep batches small enough to spread them over all workers.
+    batch_size = max(1, min(batch_size, math.ceil(len(tiles) / (4 * workers))))
+    batches = [tiles[start:start + batch_size] for start in range(0, len(tiles), batch_size)]
+    print(f"[INFO] Encoding up to {len(tiles)} tiles (z{minzoom}-{maxzoom}) for {len(gdf)} features...")
+
+    lon_min, lat_min, lon_max, lat_max = gpd.GeoSeries(shapely.box(*gdf.total_bounds), crs=3857).to_crs(4326).total_bounds
+    metadata = {
+        "name": layer,
+        "format": "pbf",
+        "type": "overlay",
+        "minzoom": minzoom,
+        "maxzoom": maxzoom,
+        "bounds": f"{lon_min},{lat_min},{lon_max},{lat_max}",
+        "center": f"{(lon_min + lon_max) / 2},{(lat_min + lat_max) / 2},{minzoom}",
+        "json": json.dumps({"vector_layers": [{
+            "id": layer,
+            "fields": {c: str(gdf[c].dtype) for c in (columns or []) if c in gdf.columns},
+            "minzoom": minzoom,
+            "maxzoom": maxzoom,
+        }]}),
+    }
+
+    mbtiles = output.suffix == ".mbtiles"
+    if mbtiles:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        conn = _open_mbtiles(output, metadata)
+    else:
+        output.mkdir(parents=True, exist_ok=True)
+        (output / "metadata.json").write_text(json.dumps(metadata, indent=2))
+
+    def write(results):
+        encoded = [(z, x, y, data) for z, x, y, data in results if data is not None]
+        if mbtiles:
+            # MBTiles rows follow the TMS scheme (y counted from the bottom).
+            conn.executemany("INSERT INTO tiles VALUES (?, ?, ?, ?)",
+                             [(z, x, 2 ** z - 1 - y, sqlite3.Binary(data)) for z, x, y, data in encoded])
+        else:
+            for z, x, y, data in encoded:
+                tile_path = output / str(z) / str(x) / f"{y}.pbf"
+                tile_path.parent.mkdir(parents=True, exist_ok=True)
+                tile_path.write_bytes(data)
+        return len(encoded)
+
+    written = 0
+    try:
+        if workers > 1 and len(batches) > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as pool:
+                for results in pool.map(_encode_batch, batches):
+                    written += write(results)
+        else:
+            _init_worker(*init_args)
+            for batch in batches:
+                written += write(_encode_batch(batch))
+            _WORKER.clear()
+        if mbtiles:
+            conn.commit()
+    finally:
+        if mbtiles:
+            conn.close()
+
+    print(f"[SUCCESS] Wrote {written} non-empty tiles -> {output}")
+    return output
+
+
+def build_year_tiles(
+    directory: Union[str, Path],
+    year,
+    output: Union[str, Path, None] = None,
+    columns: Union[List[str], None] = DEFAULT_TILE_COLUMNS,
+    level: int = 0,
+    **tile_kwargs
+) -> Path:
+    """
+    Build the tile pyramid of one processed year.
+
+    Args:
+        directory (str | Path): Folder containing the year's GeoJSON partitions.
+        year (int): Year to tile.
+        output (str | Path | None): Defaults to `<directory>/tiles/parcels_<year>.mbtiles`.
+        columns (list[str] | None): Attributes carried into the tiles; only these are read.
+        level (int): Simplified level to tile from (see `parceltrack.io.simplify`).
+        **tile_kwargs: Passed to `build_tiles` (zooms, workers, ...).
+
+    Returns:
+        Path: The tile directory or MBTiles file.
+    """
+    directory = Path(directory)
+    output = Path(output) if output else directory / "tiles" / f"parcels_{year}.mbtiles"
+    gdf = load_processed_year_files(directory, year, columns=columns, level=level, workers=tile_kwargs.get("workers", 1))
+    return build_tiles(gdf, output, layer="parcels", columns=columns, **tile_kwargs)
+
+
+def main(argv: Union[Sequence[str], None] = None):
+    parser = argparse.ArgumentParser(description="Build offline vector tiles (MBTiles or z/x/y.pbf) for processed parcel years.")
+    parser.add_argument("--years", type=int, nargs="+", required=True, help="Years to tile.")
+    parser.add_argument("--input", type=Path, default=None, help="Partition directory (default: data/processed).")
+    parser.add_argument("--output", type=Path, default=None, help="Output directory (default: <input>/tiles).")
+    parser.add_argument("--format", choices=["mbtiles", "dir"], default="mbtiles", help="One MBTiles file or a z/x/y.pbf tree per year.")
+    parser.add_argument("--columns", nargs="*", default=DEFAULT_TILE_COLUMNS, help="Attributes to carry into the tiles.")
+    parser.add_argument("--minzoom", type=int, default=12)
+    parser.add_argument("--maxzoom", type=int, default=16)
+    parser.add_argument("--level", type=int, default=0, help="Simplified level to tile from.")
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    directory = args.input or ProjectPaths().processed
+    output_dir = args.output or directory / "tiles"
+    for year in args.years:
+        name = f"parcels_{year}.mbtiles" if args.format == "mbtiles" else f"parcels_{year}"
+        build_year_tiles(directory, year, output_dir / name, columns=args.columns or None, level=args.level,
+                         minzoom=args.minzoom, maxzoom=args.maxzoom, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+# parceltrack/synthetic.py
+
+"""
+Synthetic BACIPOLY-like parcel data for benchmarks and experiments.
+
+The MDP parcel shapefiles are not part of the repo, so this module generates
+stand-ins with the same shape: a tessellation of narrow rowhouse-like lots laid out
+in city blocks separated by streets, with ACCTID / BLOCK / ZONING / YEARBLT /
+SQFTSTRC / NFM* columns, in the Maryland State Plane CRS. Lots share their edges
+with their neighbours (corners are jittered, not the lots), so contiguity and
+overlap code sees realistic topology.
+
+`make_parcel_years` evolves a base year with controlled churn (value growth,
+rezoning, lot splits and merges), and `write_synthetic` writes the years as raw
+shapefiles, zipped shapefiles and processed GeoJSON partitions in the same layout
+as the real data.
+
+Example:
+    from parceltrack.synthetic import make_parcels, make_parcel_years, write_synthetic
+    base = make_parcels(100_000, seed=1)
+    years = make_parcel_years(base, years=range(2021, 2025), churn=0.02)
+    metadata = write_synthetic(years, Path("/tmp/synthetic"))
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, Sequence, Tuple
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+import zipfile
+
+from parceltrack.io.geomstore import save_geometry_store
+from parceltrack.io.load_geometry import save_geojson_per_year
+
+ZONES = np.array(["R-8", "R-7", "R-6", "R-5", "C-1", "C-2", "OR-1", "I-1"])
+ZONE_WEIGHTS = np.array([0.30, 0.20, 0.12, 0.10, 0.10, 0.08, 0.06, 0.04])
+OWNERS = np.array(["MAYOR AND CITY COUNCIL", "HOUSING AUTHORITY OF BALTIMORE CITY", "SMITH", "JOHNSON",
+                   "WILLIAMS", "BROWN", "JONES", "DAVIS", "MILLER", "WILSON"])
+
+
+def make_parcels(
+    n: int = 10_000,
+    seed: int = 0,
+    lot_size: Tuple[float, float] = (18.0, 90.0),
+    lots_per_block: Tuple[int, int] = (12, 2),
+    street_width: float = 60.0,
+    origin: Tuple[float, float] = (1_405_000.0, 580_000.0),
+    crs: str = "EPSG:2248"
+) -> gpd.GeoDataFrame:
+    """
+    Generate one year of synthetic parcels.
+
+    Args:
+        n (int): Number of parcels.
+        seed (int): Random seed.
+        lot_size (tuple): Lot (width, depth) in CRS units (US feet).
+        lots_per_block (tuple): Lots per block along x and y.
+        street_width (float): Gap between blocks.
+        origin (tuple): Lower-left corner of the city.
+        crs (str): CRS of the coordinates.
+
+    Returns:
+        gpd.GeoDataFrame: `n` parcels with BACIPOLY-style attribute columns.
+    """
+    rng = np.random.default_rng(seed)
+    lot_w, lot_d = lot_size
+    per_x, per_y = lots_per_block
+    per_block = per_x * per_y
+    n_blocks = int(np.ceil(n / per_block))
+    blocks_x = int(np.ceil(np.sqrt(n_blocks * (per_y * lot_d) / (per_x * lot_w))))
+    block_w, block_d = per_x * lot_w + street_width, per_y * lot_d + street_width
+
+    # Corner lattice of one block, jittered inside the block so neighbouring lots share edges.
+    cx, cy = np.meshgrid(np.arange(per_x + 1) * lot_w, np.arange(per_y + 1) * lot_d, indexing="ij")
+    jitter = (lot_w * 0.15, lot_d * 0.05)
+
+    idx = np.arange(n)
+    block, lot = idx // per_block, idx % per_block
+    i, j = lot % per_x, lot // per_x
+    bx, by = block % blocks_x, block // blocks_x
+    x0, y0 = origin[0] + bx * block_w, origin[1] + by * block_d
+
+    corners_x = np.broadcast_to(cx, (n_blocks,) + cx.shape).copy()
+    corners_y = np.broadcast_to(cy, (n_blocks,) + cy.shape).copy()
+    corners_x[:, 1:-1, :] += rng.uniform(-jitter[0], jitter[0], (n_blocks, per_x - 1, per_y + 1))
+    corners_y[:, :, 1:-1] += rng.uniform(-jitter[1], jitter[1], (n_blocks, per_x + 1, per_y - 1))
+
+    ring_i = np.stack([i, i + 1, i + 1, i, i], axis=1)
+    ring_j = np.stack([j, j, j + 1, j + 1, j], axis=1)
+    xs = corners_x[block[:, None], ring_i, ring_j] + x0[:, None]
+    ys = corners_y[block[:, None], ring_i, ring_j] + y0[:, None]
+    geometry = shapely.polygons(np.stack([xs, ys], axis=-1))
+
+    # Zoning and build year cluster by block, values depend on zoning and lot area.
+    block_zone = rng.choice(len(ZONES), size=n_blocks, p=ZONE_WEIGHTS)
+    zone = np.where(rng.random(n) < 0.9, block_zone[block], rng.choice(len(ZONES), size=n, p=ZONE_WEIGHTS))
+    area = shapely.area(geometry)
+    land = np.round(area * rng.lognormal(1.0, 0.5, n) * np.where(zone >= 4, 2.0, 1.0), -2)
+    improvements = np.where(rng.random(n) < 0.08, 0.0, np.round(rng.lognormal(11.5, 0.8, n), -2))
+    ward = 1 + block % 28
+
+    return gpd.GeoDataFrame({
+        "ACCTID": pd.array([f"03{w:02d}{b:05d}{k:05d}" for w, b, k in zip(ward, block, lot)], dtype="string"),
+        "BLOCK": [f"{b:05d}" for b in block],
+        "LOT": [f"{k:03d}" for k in lot],
+        "WARD": ward.astype(np.int64),
+        "ZONING": ZONES[zone],
+        "OWNNAME1": rng.choice(OWNERS, size=n),
+        "YEARBLT": np.where(improvements > 0, rng.integers(1880, 2020, n), 0),
+        "SQFTSTRC": np.where(improvements > 0, rng.integers(600, 4000, n), 0),
+        "NFMLNDVL": land,
+        "NFMIMPVL": improvements,
+        "NFMTTLVL": land + improvements,
+        "geometry": geometry,
+    }, crs=crs)
+
+
+def _split_lots(gdf: gpd.GeoDataFrame, rows: np.ndarray, next_id: int) -> gpd.GeoDataFrame:
+    """Cut each selected lot in two across its longer side; halves get new ACCTIDs."""
+    geoms = np.asarray(gdf.geometry.values)[rows]
+    minx, miny, maxx, maxy = shapely.bounds(geoms).T
+    wide = (maxx - minx) >= (maxy - miny)
+    midx, midy = (minx + maxx) / 2, (miny + maxy) / 2
+    first = shapely.intersection(geoms, shapely.box(minx, miny, np.where(wide, midx, maxx), np.where(wide, maxy, midy)))
+    second = shapely.intersection(geoms, shapely.box(np.where(wide, midx, minx), np.where(wide, miny, midy), maxx, maxy))
+
+    halves = pd.concat([gdf.iloc[rows], gdf.iloc[rows]], ignore_index=True)
+    halves["geometry"] = np.concatenate([first, second])
+    for col in ("NFMLNDVL", "NFMIMPVL", "NFMTTLVL", "SQFTSTRC"):
+        if col in halves.columns:
+            halves[col] = halves[col] // 2
+    halves["ACCTID"] = [f"03{w:02d}9{i:09d}" for w, i in zip(halves["WARD"], range(next_id, next_id + len(halves)))]
+    return gpd.GeoDataFrame(halves, geometry="geometry", crs=gdf.crs)
+
+
+def _merge_lots(gdf: gpd.GeoDataFrame, rows: np.ndarray) -> gpd.GeoDataFrame:
+    """Merge each selected lot with the next row (an adjacent lot), keeping the first ACCTID."""
+    geoms = np.asarray(gdf.geometry.values)
+    merged = gdf.iloc[rows].copy()
+    merged["geometry"] = shapely.union(geoms[rows], geoms[rows + 1])
+    for col in ("NFMLNDVL", "NFMIMPVL", "NFMTTLVL", "SQFTSTRC"):
+        if col in merged.columns:
+            merged[col] = merged[col].to_numpy() + gdf[col].to_numpy()[rows + 1]
+    return merged
+
+
+def make_parcel_years(
+    base: gpd.GeoDataFrame,
+    years: Iterable[int] = range(2021, 2025),
+    churn: float = 0.01,
+    value_growth: float = 0.03,
+    seed: int = 0
+) -> Dict[int, gpd.GeoDataFrame]:
+    """
+    Evolve a base year into a series of years with controlled change.
+
+    Each year after the first, values grow by `value_growth` on average (with noise),
+    `churn` of the parcels are rezoned, and `churn / 2` each are split in two or merged
+    with the next lot on their block.
+
+    Args:
+        base (gpd.GeoDataFrame): First year, e.g. from `make_parcels`.
+        years (Iterable[int]): Years to produce; the first one is `base`.
+        churn (float): Share of parcels changed per year.
+        value_growth (float): Mean yearly growth of NFM values.
+        seed (int): Random seed.
+
+    Returns:
+        Dict[int, gpd.GeoDataFrame]: Parcels by year. Each year after the first carries
+            its changes from the year before in `attrs["churn"]`: {'merges', 'splits',
+            'rezoned'} counts.
+    """
+    rng = np.random.default_rng(seed)
+    years = list(years)
+    out = {years[0]: base}
+    current = base.reset_index(drop=True)
+    next_id = 0
+
+    for year in years[1:]:
+        current = current.copy()
+        n = len(current)
+        growth = rng.normal(1 + value_growth, value_growth, n).clip(0.8)
+        for col in ("NFMLNDVL", "NFMIMPVL"):
+            current[col] = np.round(current[col].to_numpy() * growth, -2)
+        current["NFMTTLVL"] = current["NFMLNDVL"] + current["NFMIMPVL"]
+
+        rezoned = rng.random(n) < churn
+        current.loc[rezoned, "ZONING"] = rng.choice(ZONES, size=int(rezoned.sum()), p=ZONE_WEIGHTS)
+
+        # Merges pair a lot with the next row when it is an edge neighbour on the same block; splits take other lots.
+        geoms = np.asarray(current.geometry.values)
+        same_block = current["BLOCK"].to_numpy()[:-1] == current["BLOCK"].to_numpy()[1:]
+        candidates = np.flatnonzero(same_block & shapely.relate_pattern(geoms[:-1], geoms[1:], "****1****"))
+        picked = np.sort(rng.choice(candidates, size=min(len(candidates), int(n * churn / 2)), replace=False))
+        merge_rows = picked[np.diff(picked, prepend=-2) > 1]
+        taken = np.zeros(n, dtype=bool)
+        taken[merge_rows] = taken[merge_rows + 1] = True
+        split_rows = rng.choice(np.flatnonzero(~taken), size=min(int((~taken).sum()), int(n * churn / 2)), replace=False)
+        taken[split_rows] = True
+
+        split = _split_lots(current, np.sort(split_rows), next_id)
+        next_id += len(split)
+        merged = _merge_lots(current, merge_rows)
+        current = pd.concat([current[~taken], merged, split], ignore_index=True)
+        current = gpd.GeoDataFrame(current.sort_values(["BLOCK", "LOT"], kind="stable").reset_index(drop=True),
+                                   geometry="geometry", crs=base.crs)
+        current.attrs["churn"] = {"merges": len(merge_rows), "splits": len(split_rows), "rezoned": int(rezoned.sum())}
+        out[year] = current
+        print(f"[INFO] {year}: {len(current)} parcels ({len(merge_rows)} merges, {len(split_rows)} splits, {int(rezoned.sum())} rezoned).")
+    return out
+
+
+def write_synthetic(
+    geoms: Dict[int, gpd.GeoDataFrame],
+    out_dir: Path,
+    formats: Sequence[str] = ("shapefile", "zip", "geojson"),
+    max_size: str = "25MB"
+) -> pd.DataFrame:
+    """
+    Write synthetic years in the layout of the real data.
+
+    - 'shapefile': `<out_dir>/raw/BACIparcels<year>/BACIPOLY.shp`
+    - 'zip': `<out_dir>/zips/BACIparcels<year>.zip` holding `BACIPOLY/BACIPOLY.*`
+    - 'geojson': `<out_dir>/processed/parcels_<year>_partN_M.geojson` plus manifests
+    - 'store': a geometry store in `<out_dir>/store` (see `parceltrack.io.geomstore`)
+
+    Args:
+        geoms (dict): Parcels by year.
+        out_dir (Path): Root output folder.
+        formats (Sequence[str]): Any of 'shapefile', 'zip', 'geojson' and 'store'.
+        max_size (str): Partition size for 'geojson', e.g. '25MB'.
+
+    Returns:
+        pd.DataFrame: Shapefile metadata ('Year', 'FullPath', 'Shapefile', relative to
+            `<out_dir>/raw`) usable with `load_files_from_metdata`.
+    """
+    out_dir = Path(out_dir)
+    raw_dir = out_dir / "raw"
+    records = []
+    if "shapefile" in formats or "zip" in formats:
+        for year, gdf in geoms.items():
+            folder = raw_dir / f"BACIparcels{year}"
+            folder.mkdir(parents=True, exist_ok=True)
+            gdf.to_file(folder / "BACIPOLY.shp", engine="pyogrio")
+            records.append({"Year": year, "FullPath": folder.name, "Shapefile": "BACIPOLY.shp"})
+
+            if "zip" in formats:
+                zip_dir = out_dir / "zips"
+                zip_dir.mkdir(parents=True, exist_ok=True)
+                with zipfile.ZipFile(zip_dir / f"{folder.name}.zip", "w", zipfile.ZIP_DEFLATED) as archive:
+                    for part in sorted(folder.glob("BACIPOLY.*")):
+                        archive.write(part, f"BACIPOLY/{part.name}")
+        print(f"[SUCCESS] Wrote {len(geoms)} synthetic shapefile years to {raw_dir}")
+
+    if "geojson" in formats:
+        save_geojson_per_year(geoms, out_dir / "processed", max_size=max_size)
+    if "store" in formats:
+        save_geometry_store(geoms, out_dir / "store")
+    return pd.DataFrame(records, columns=["Year", "FullPath", "Shapefile"])
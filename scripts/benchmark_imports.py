@@ -0,0 +1,107 @@
+"""
+scripts/benchmark_imports.py
+
+Measure import time of parceltrack modules in fresh interpreters.
+
+Each target is imported in a new `python -X importtime` subprocess `--repeat` times;
+the median wall time (minus an empty interpreter's startup) and the cumulative
+import time reported by `-X importtime` are recorded, along with the slowest
+imports of the last run. Results are written as JSON next to the io benchmarks.
+
+Example:
+    python scripts/benchmark_imports.py
+    python scripts/benchmark_imports.py --targets parceltrack parceltrack.io.load_geometry --repeat 9
+"""
+
+from pathlib import Path
+from typing import Dict, List
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+from parceltrack.configs.paths import ProjectPaths
+
+DEFAULT_TARGETS = [
+    "parceltrack",
+    "parceltrack.io",
+    "parceltrack.analysis",
+    "parceltrack.analysis.spatial_matching",
+    "parceltrack.io.load_geometry",
+    "parceltrack.instrumentation",
+]
+
+
+def _run(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True)
+
+
+def _parse_importtime(stderr: str) -> List[Dict]:
+    """Rows of `-X importtime` output as {'module', 'self_us', 'cumulative_us'}."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = [part.strip() for part in line[len("import time:"):].split("|")]
+        rows.append({"module": module.strip(), "self_us": int(self_us), "cumulative_us": int(cumulative_us)})
+    return rows
+
+
+def measure_import(target: str, repeat: int, baseline: float, top: int) -> Dict:
+    """Median wall and cumulative import time of `import <target>` in fresh interpreters."""
+    walls, cumulative = [], []
+    rows = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = _run(f"import {target}")
+        walls.append(time.perf_counter() - start)
+        rows = _parse_importtime(result.stderr)
+        cumulative.append(sum(r["self_us"] for r in rows) / 1000)
+
+    slowest = sorted(rows, key=lambda r: r["self_us"], reverse=True)[:top]
+    heavy = sorted({r["module"].split(".")[0] for r in rows} & {"geopandas", "pandas", "pyarrow", "pyogrio", "scipy", "plotly", "matplotlib"})
+    out = {
+        "target": target,
+        "wall_ms": (statistics.median(walls) - baseline) * 1000,
+        "import_ms": statistics.median(cumulative),
+        "modules": len(rows),
+        "heavy_dependencies": heavy,
+        "slowest": [{"module": r["module"], "self_ms": r["self_us"] / 1000} for r in slowest],
+    }
+    print(f"[INFO] {target}: {out['wall_ms']:.0f} ms wall, {out['import_ms']:.0f} ms importing, heavy deps: {heavy or 'none'}")
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import-time benchmark for parceltrack modules.")
+    parser.add_argument("--targets", nargs="+", default=DEFAULT_TARGETS, help="Modules to import.")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per target (the median is reported).")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports listed per target.")
+    parser.add_argument("--output", type=Path, default=None, help="Results file (default: reports/benchmarks/imports_<time>.json).")
+    args = parser.parse_args(argv)
+
+    startup = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        _run("pass")
+        startup.append(time.perf_counter() - start)
+    baseline = statistics.median(startup)
+    print(f"[INFO] Interpreter startup: {baseline * 1000:.0f} ms (subtracted from wall times)")
+
+    results = [measure_import(target, args.repeat, baseline, args.top) for target in args.targets]
+
+    output = args.output or ProjectPaths().reports / "benchmarks" / f"imports_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "startup_ms": baseline * 1000,
+        "results": results,
+    }, indent=2))
+    print(f"[SUCCESS] Wrote {len(results)} results to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+"""
+scripts/benchmark_io.py
+
+Time and memory-profile the io pipeline on synthetic parcels at several scales.
+
+For each scale, synthetic years are generated (see `parceltrack.synthetic`) and
+written to a temporary folder, then every stage is run `--repeat` times for wall
+time and once more under tracemalloc for peak traced memory (Python objects and
+numpy/pandas/Arrow buffers; GEOS geometries are not traced, so RSS growth is recorded
+too, when psutil is installed). Results are written as JSON so two commits can be
+compared with `--compare`.
+
+Example:
+    python scripts/benchmark_io.py --scales 10000 100000 --years 2
+    python scripts/benchmark_io.py --scales 10000 --compare reports/benchmarks/<previous>.json
+"""
+
+from pathlib import Path
+from typing import Callable, Dict, List
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from parceltrack.configs.paths import ProjectPaths
+from parceltrack.io.geomstore import load_store_years, save_geometry_store
+from parceltrack.io.load_geometry import (load_geometry,
+                                          load_files_from_metdata,
+                                          load_processed_year_files,
+                                          load_processed_years,
+                                          save_geojson_per_year
+                                        )
+from parceltrack.synthetic import make_parcels, make_parcel_years, write_synthetic
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def _rss_mb() -> float:
+    return psutil.Process().memory_info().rss / 1024 / 1024 if psutil else float("nan")
+
+
+def measure(stage: str, scale: int, fn: Callable, repeat: int = 1, memory: bool = True) -> Dict:
+    """Run `fn` `repeat` times for timing, then once under tracemalloc for its peak allocation."""
+    times = []
+    rows = None
+    rss_before = _rss_mb()
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - start)
+        rows = _count_rows(out)
+        del out
+    rss_after = _rss_mb()
+
+    peak_mb = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        out = fn()
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+        del out
+
+    result = {
+        "stage": stage,
+        "scale": scale,
+        "rows": rows,
+        "seconds": min(times),
+        "seconds_all": times,
+        "peak_mb": peak_mb,
+        "rss_growth_mb": rss_after - rss_before,
+    }
+    peak = f"{peak_mb:.1f} MB peak" if peak_mb is not None else "no memory profile"
+    print(f"[INFO] {stage} @ {scale}: {min(times):.3f}s, {peak}")
+    return result
+
+
+def _count_rows(out):
+    if isinstance(out, dict):
+        return int(sum(len(v) for v in out.values() if hasattr(v, "__len__")))
+    if hasattr(out, "__len__") and not isinstance(out, (str, bytes)):
+        return len(out)
+    return None
+
+
+def run_scale(scale: int, n_years: int, workdir: Path, repeat: int, memory: bool, workers: int, plot_max: int) -> List[Dict]:
+    """Generate data for one scale and benchmark every stage on it."""
+    years = list(range(2021, 2021 + n_years))
+    geoms = make_parcel_years(make_parcels(scale, seed=scale), years=years, churn=0.01)
+    metadata = write_synthetic(geoms, workdir, formats=("shapefile", "geojson"))
+    raw_dir, processed_dir = workdir / "raw", workdir / "processed"
+    first_shp = raw_dir / metadata["FullPath"].iloc[0] / metadata["Shapefile"].iloc[0]
+    out_dir = workdir / "bench_out"
+    store_dir = workdir / "store"
+    save_geometry_store(geoms, store_dir)
+
+    stages = {
+        "load_geometry": lambda: load_geometry(first_shp),
+        "load_geometry[columns]": lambda: load_geometry(first_shp, columns=["ACCTID", "NFMTTLVL"]),
+        "load_files_from_metdata": lambda: load_files_from_metdata(metadata, raw_dir),
+        "save_geojson_per_year": lambda: save_geojson_per_year(geoms, out_dir, max_size="25MB"),
+        "load_processed_year_files": lambda: load_processed_year_files(processed_dir, years[0]),
+        "load_processed_years": lambda: load_processed_years(processed_dir, years),
+        "save_geometry_store": lambda: save_geometry_store(geoms, out_dir / "store"),
+        "load_store_years": lambda: load_store_years(store_dir, years),
+    }
+    if workers > 1:
+        stages["load_files_from_metdata[workers]"] = lambda: load_files_from_metdata(metadata, raw_dir, workers=workers)
+        stages["load_processed_year_files[workers]"] = lambda: load_processed_year_files(processed_dir, years[0], workers=workers)
+
+    if scale <= plot_max:
+        from load_parcels import plot_timeseries_choropleth
+        columns = ["ACCTID", "ZONING", "NFMTTLVL", "POLYID", "geometry"]
+        plot_input = {year: gdf.assign(POLYID=range(len(gdf)))[columns] for year, gdf in geoms.items()}
+        stages["plot_timeseries_choropleth"] = lambda: plot_timeseries_choropleth(plot_input, "NFMTTLVL", hover_cols=["ACCTID", "ZONING"]).to_json()
+        stages["plot_timeseries_choropleth[shared]"] = lambda: plot_timeseries_choropleth(
+            plot_input, "NFMTTLVL", hover_cols=["ACCTID", "ZONING"], shared_geometry=True).to_json()
+
+    return [measure(name, scale, fn, repeat=repeat, memory=memory) for name, fn in stages.items()]
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(current: List[Dict], previous_path: Path) -> pd.DataFrame:
+    """Side-by-side seconds and peak memory against a previous results file."""
+    previous = pd.DataFrame(json.loads(Path(previous_path).read_text())["results"])
+    merged = pd.DataFrame(current).merge(previous, on=["stage", "scale"], how="left", suffixes=("", "_prev"))
+    merged["speedup"] = merged["seconds_prev"] / merged["seconds"]
+    merged["peak_ratio"] = merged["peak_mb"] / merged["peak_mb_prev"]
+    return merged[["stage", "scale", "seconds_prev", "seconds", "speedup", "peak_mb_prev", "peak_mb", "peak_ratio"]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark parceltrack io stages on synthetic parcels.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[10_000, 100_000], help="Parcels per year.")
+    parser.add_argument("--years", type=int, default=2, help="Number of synthetic years.")
+    parser.add_argument("--repeat", type=int, default=1, help="Timed runs per stage (the minimum is reported).")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc run.")
+    parser.add_argument("--workers", type=int, default=1, help="Also benchmark the parallel loaders with this many workers.")
+    parser.add_argument("--plot-max", type=int, default=50_000, help="Largest scale for the choropleth stages.")
+    parser.add_argument("--output", type=Path, default=None, help="Results file (default: reports/benchmarks/io_<commit>_<time>.json).")
+    parser.add_argument("--compare", type=Path, default=None, help="Previous results file to compare against.")
+    args = parser.parse_args(argv)
+
+    results = []
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory(prefix=f"parceltrack_bench_{scale}_") as tmp:
+            results.extend(run_scale(scale, args.years, Path(tmp), args.repeat, not args.no_memory, args.workers, args.plot_max))
+
+    commit = _git_commit()
+    output = args.output or ProjectPaths().reports / "benchmarks" / f"io_{commit}_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "args": {k: str(v) for k, v in vars(args).items()},
+        "results": results,
+    }, indent=2))
+    print(f"[SUCCESS] Wrote {len(results)} results to {output}")
+
+    if args.compare:
+        print(compare(results, args.compare).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -5,86 +5,190 @@ from parceltrack.configs.paths import ProjectPaths
 
 from pathlib import Path
 import geopandas as gpd
+import numpy as np
+import shapely
 from tqdm import tqdm  #progress bar
 import pandas as pd
 
-import plotly.express as px
-import plotly.graph_objects as go
 import json
 import re
 
-import matplotlib.pyplot as plt
-
 def filter_poly_files(shapefile_metadata_df):
     poly_shapes = shapefile_metadata_df[shapefile_metadata_df['Shapefile'].str.lower().str.contains('bacipoly')]
     return poly_shapes
                         
+def build_hovertext(df: pd.DataFrame, cols: list, sep: str = "<br>") -> pd.Series:
+    """Join the string form of `cols` row-wise with vectorized string concatenation."""
+    text = df[cols[0]].astype(str)
+    for col in cols[1:]:
+        text = text + sep + df[col].astype(str)
+    return text
+
+def build_shared_geojson(
+    gdf_dict: dict,
+    simplify_tolerance: float = None,
+    precision: int = 6
+) -> tuple:
+    """
+    Serialize each distinct parcel polygon once, as GeoJSON features keyed by content.
+
+    A feature's id is the hash of its (normalized) polygon, so a parcel whose geometry
+    is unchanged across years is stored once, while a parcel that was reshaped, split
+    or merged gets a feature per version and each year points at its own. Each year's
+    parcels are optionally simplified together as a coverage (see
+    `parceltrack.io.simplify.simplify_geometries`, in the source CRS units), so
+    neighbours keep their shared edges; the features are then reprojected to WGS84 and
+    rounded to `precision` decimal places (6 ≈ 0.1 m), which shrinks the serialized
+    coordinates.
+
+    Args:
+        gdf_dict (dict): A dictionary of {year: GeoDataFrame}.
+        simplify_tolerance (float | None): Coverage simplification tolerance.
+        precision (int | None): Decimal places kept for lon/lat.
+
+    Returns:
+        tuple: (GeoJSON FeatureCollection, {year: feature id of each row, in row order}).
+    """
+    from parceltrack.io.geomstore import geometry_ids
+    from parceltrack.io.simplify import simplify_geometries
+
+    years = sorted(gdf_dict.keys())
+    crs = gdf_dict[years[0]].crs
+    features = {}
+    locations = {}
+    for year in years:
+        gdf = gdf_dict[year].to_crs(crs) if gdf_dict[year].crs != crs else gdf_dict[year]
+        geometry = np.asarray(gdf.geometry.values)
+        if simplify_tolerance:
+            geometry = simplify_geometries(geometry, simplify_tolerance)
+        ids, normalized, _ = geometry_ids(geometry)
+        for geom_id, geom in zip(ids, normalized):
+            if geom_id is not None and geom_id not in features:
+                features[geom_id] = geom
+        locations[year] = ids
+
+    geometry = gpd.GeoSeries(list(features.values()), index=list(features.keys()), crs=crs)
+    if crs is not None and not crs.equals("EPSG:4326"):
+        geometry = geometry.to_crs(4326)
+    if precision is not None:
+        geometry = gpd.GeoSeries(
+            shapely.transform(geometry.values, lambda coords: np.round(coords, precision)),
+            index=geometry.index, crs=geometry.crs
+        )
+
+    shared = gpd.GeoDataFrame({"geometry": geometry.values}, index=geometry.index, crs=geometry.crs)
+    return json.loads(shared.to_json(drop_id=False)), locations
+
 def plot_timeseries_choropleth(
     gdf_dict: dict,
     value_col: str,
     hover_cols: list = ["ACCTID"],
     title: str = "Parcel Value Over Time",
-    color_scale: str = "Viridis"
-) -> go.Figure:
+    color_scale: str = "Viridis",
+    shared_geometry: bool = False,
+    simplify_tolerance: float = None,
+    precision: int = 6
+) -> "go.Figure":
     """
     Create a timeseries choropleth plot using Plotly with a slider to toggle between years.
 
+    By default every year is its own trace with its own embedded GeoJSON. With
+    `shared_geometry=True`, the parcel polygons are serialized once (see
+    `build_shared_geojson`) into a single trace, and each slider step only swaps
+    that year's locations, values and hovertext in, which keeps multi-year figures small.
+
     Args:
         gdf_dict (dict): A dictionary of {year: GeoDataFrame}.
         value_col (str): Column to use for color fill.
         hover_cols (list): Columns to show in hover tooltip.
         title (str): Plot title.
         color_scale (str): Color scale for the choropleth.
+        shared_geometry (bool): Serialize each distinct geometry once and point every year at its own.
+        simplify_tolerance (float | None): Simplification tolerance used with `shared_geometry`.
+        precision (int | None): Decimal places kept for lon/lat with `shared_geometry`.
 
     Returns:
         plotly.graph_objects.Figure: A choropleth figure with a slider.
     """
+    import plotly.graph_objects as go  # plotting deps are only loaded when a figure is built
+
     layers = []
     years = sorted(gdf_dict.keys())
     buttons = []
 
-    cols = hover_cols + [value_col, 'geometry', 'POLYID']
-    for i, (year, gdf) in enumerate(gdf_dict.items()):
-        print(year)
-        
-        used_gdf = gdf[cols].reset_index(drop=True)
-        
-        if hover_cols:
-            gdf["hovertext"] = used_gdf[hover_cols].astype(str).agg("<br>".join, axis=1)
-        else:
-            gdf["hovertext"] = f"Year: {year}"
-
-        geojson = json.loads(used_gdf.to_json())
-
-        visible = [False] * len(years)
-        visible[i] = True
+    if shared_geometry:
+        geojson, locations = build_shared_geojson(gdf_dict, simplify_tolerance=simplify_tolerance, precision=precision)
+        for year in years:
+            gdf = gdf_dict[year]
+            hovertext = build_hovertext(gdf, hover_cols) if hover_cols else pd.Series(f"Year: {year}", index=gdf.index)
+            buttons.append(dict(
+                label=str(year),
+                method="update",
+                args=[{
+                    "locations": [locations[year].tolist()],
+                    "z": [gdf[value_col].tolist()],
+                    "text": [hovertext.tolist()],
+                    "zmin": gdf[value_col].min(),
+                    "zmax": gdf[value_col].max(),
+                }, {"title": f"{title} ({year})"}]
+            ))
 
+        first = buttons[0]["args"][0]
         layers.append(go.Choroplethmap(
             geojson=geojson,
-            locations=gdf.index,
-            z=gdf[value_col],
-            text=gdf["hovertext"],
+            locations=first["locations"][0],
+            z=first["z"][0],
+            text=first["text"][0],
             colorscale=color_scale,
-            zmin=gdf[value_col].min(),
-            zmax=gdf[value_col].max(),
+            zmin=first["zmin"],
+            zmax=first["zmax"],
             marker_opacity=0.6,
             marker_line_width=0,
-            visible=visible[i],
-            name=str(year)
+            name=value_col
         ))
+    else:
+        cols = hover_cols + [value_col, 'geometry', 'POLYID']
+        for i, (year, gdf) in enumerate(gdf_dict.items()):
+            print(year)
 
-        buttons.append(dict(
-            label=str(year),
-            method="update",
-            args=[{"visible": [j == i for j in range(len(years))]},
-                  {"title": f"{title} ({year})"}]
-        ))
+            used_gdf = gdf[cols].reset_index(drop=True)
+
+            if hover_cols:
+                gdf["hovertext"] = build_hovertext(gdf, hover_cols)
+            else:
+                gdf["hovertext"] = f"Year: {year}"
+
+            geojson = json.loads(used_gdf.to_json())
+
+            visible = [False] * len(years)
+            visible[i] = True
+
+            layers.append(go.Choroplethmap(
+                geojson=geojson,
+                locations=gdf.index,
+                z=gdf[value_col],
+                text=gdf["hovertext"],
+                colorscale=color_scale,
+                zmin=gdf[value_col].min(),
+                zmax=gdf[value_col].max(),
+                marker_opacity=0.6,
+                marker_line_width=0,
+                visible=visible[i],
+                name=str(year)
+            ))
+
+            buttons.append(dict(
+                label=str(year),
+                method="update",
+                args=[{"visible": [j == i for j in range(len(years))]},
+                      {"title": f"{title} ({year})"}]
+            ))
 
     fig = go.Figure(data=layers)
     fig.update_layout(
-        mapbox_style="carto-positron",
-        mapbox_zoom=10,
-        mapbox_center={"lat": 39.29, "lon": -76.61},
+        map_style="carto-positron",
+        map_zoom=10,
+        map_center={"lat": 39.29, "lon": -76.61},
         margin={"r": 0, "t": 30, "l": 0, "b": 0},
         title=title,
         sliders=[{
@@ -103,16 +207,17 @@ if __name__ == '__main__':
     if output_as_geojsons:
         shapefile_metadata = pd.read_csv(paths.raw / "shapefile_metadata.csv")
         poly_files = filter_poly_files(shapefile_metadata)
-        parcel_files_dict = load_files_from_metdata(poly_files, paths.raw)
+        parcel_files_dict = load_files_from_metdata(poly_files, paths.raw, workers=4)
         save_geojson_per_year(parcel_files_dict, paths.processed, max_size="25MB")
     
     for year in range(2021, 2025):
         if(year in [2022, 2023, 2024]):
             continue
-        parcels_year = load_processed_year_files(directory=paths.processed / 'partitioned_files', year=year)
+        parcels_year = load_processed_year_files(directory=paths.processed / 'partitioned_files', year=year, use_cache=True)
         save_geojson_per_year({year:parcels_year}, paths.processed)
     
     if False:
+        import matplotlib.pyplot as plt
         parcel_columns = parcels_2021.columns.tolist()
         columns = ['ACCTID', 'ADDRESS', 'BLOCK', 'ZONING', 'YEARBLT', 'SQFTSTRC', 'NFMLNDVL', 'NFMIMPVL', 'NFMTTLVL', 'geometry']
         parcels_2021_subset = parcels_2021[columns]
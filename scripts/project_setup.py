@@ -1,5 +1,6 @@
 from parceltrack import ProjectPaths
 from pathlib import Path
+import argparse
 import zipfile
 import os
 
@@ -13,6 +14,12 @@ def extract_all_zips(zip_dir: Path, output_dir: Path):
             print(f"Extracted {file.name} → {target_folder}")
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Create the project folders and optionally unpack the raw archives.")
+    parser.add_argument("--extract", action="store_true",
+                        help="Unpack data/raw/*.zip. Not needed: the loaders and the inventory read shapefiles inside the zips directly.")
+    args = parser.parse_args()
+
+    project_paths = ProjectPaths(create_dirs=True)
     print('Project structure initialized.')
-    project_paths = ProjectPaths()
-    extract_all_zips(project_paths.raw, project_paths.raw)
\ No newline at end of file
+    if args.extract:
+        extract_all_zips(project_paths.raw, project_paths.raw)
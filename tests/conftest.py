@@ -0,0 +1,54 @@
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+import shapely
+from shapely.geometry import Polygon
+
+from parceltrack.synthetic import make_parcel_years, make_parcels, write_synthetic
+
+YEARS = [2021, 2022, 2023]
+
+
+@pytest.fixture(scope="session")
+def parcel_years():
+    return make_parcel_years(make_parcels(600, seed=7), years=YEARS, churn=0.05)
+
+
+@pytest.fixture(scope="session")
+def synthetic_dir(tmp_path_factory, parcel_years):
+    """Raw shapefiles and processed GeoJSON partitions (several parts per year)."""
+    out = tmp_path_factory.mktemp("synthetic")
+    metadata = write_synthetic(parcel_years, out, formats=("shapefile", "geojson"), max_size="100KB")
+    return out, metadata
+
+
+@pytest.fixture
+def shapefile_with_invalid_rows(tmp_path, parcel_years):
+    """A shapefile whose 2nd and 5th rows are self-intersecting (invalid) polygons."""
+    gdf = parcel_years[YEARS[0]].iloc[:20].copy()
+    bowtie = Polygon([(0, 0), (10, 10), (10, 0), (0, 10)])
+    gdf.loc[gdf.index[[1, 4]], "geometry"] = bowtie
+    path = tmp_path / "invalid.shp"
+    gpd.GeoDataFrame(gdf, crs=parcel_years[YEARS[0]].crs).to_file(path)
+    return path
+
+
+def assert_frames_equal(a: pd.DataFrame, b: pd.DataFrame):
+    pd.testing.assert_frame_equal(pd.DataFrame(a.drop(columns="geometry")), pd.DataFrame(b.drop(columns="geometry")))
+    pd.testing.assert_index_equal(a.index, b.index)
+    assert a.geometry.geom_equals(b.geometry).all()
+    assert a.crs == b.crs
+
+
+def wiggly_blocks(n=5, size=10.0, seed=0):
+    """An n x n grid of parcels whose interior edges are jagged polylines (a valid coverage)."""
+    rng = np.random.default_rng(seed)
+    steps = np.linspace(0, n * size, 10 * n + 1)
+    lines = []
+    for k in range(n + 1):
+        jitter = rng.normal(0, 0.4, len(steps)) * (0 < k < n)
+        lines.append(shapely.LineString(np.c_[k * size + jitter, steps]))
+        jitter = rng.normal(0, 0.4, len(steps)) * (0 < k < n)
+        lines.append(shapely.LineString(np.c_[steps, k * size + jitter]))
+    return shapely.get_parts(shapely.polygonize(shapely.get_parts(shapely.union_all(lines))))
@@ -0,0 +1,30 @@
+import shutil
+
+import pandas as pd
+
+from conftest import YEARS, assert_frames_equal
+from parceltrack.io.archive import path_exists, vsi_path
+from parceltrack.io.load_geometry import load_files_from_metdata, load_geometry
+from parceltrack.synthetic import write_synthetic
+
+
+def test_load_files_from_metdata_reads_zip_members(parcel_years, tmp_path):
+    years = {year: parcel_years[year] for year in YEARS[:2]}
+    write_synthetic(years, tmp_path, formats=("zip",))
+    # Keep only the archives, so nothing can be read from extracted files.
+    extracted = tmp_path / "extracted"
+    shutil.move(tmp_path / "raw", extracted)
+
+    metadata = pd.DataFrame([{"Year": year, "FullPath": f"BACIparcels{year}.zip/BACIPOLY", "Shapefile": "BACIPOLY.shp"}
+                             for year in years])
+    member = tmp_path / "zips" / metadata["FullPath"].iloc[0] / "BACIPOLY.shp"
+    assert not member.exists() and path_exists(member)
+    assert str(vsi_path(member)).startswith("/vsizip/")
+
+    serial = load_files_from_metdata(metadata, tmp_path / "zips")
+    concurrent = load_files_from_metdata(metadata, tmp_path / "zips", workers=2, use_cache=True,
+                                         cache_dir=tmp_path / "cache")
+    for year in years:
+        expected = load_geometry(extracted / f"BACIparcels{year}" / "BACIPOLY.shp")
+        assert_frames_equal(serial[year], expected)
+        assert_frames_equal(concurrent[year], expected)
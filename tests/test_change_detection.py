@@ -0,0 +1,36 @@
+import numpy as np
+import shapely
+
+from conftest import YEARS
+from parceltrack.analysis.change_detection import detect_changes, summarize_changes
+
+
+def test_flags_match_a_merge_on_acctid(parcel_years):
+    before, after = parcel_years[YEARS[0]], parcel_years[YEARS[1]].copy()
+    # Reordered vertices are the same polygon and must not count as a geometry change.
+    after.geometry = shapely.reverse(after.geometry.values)
+
+    changes = detect_changes({YEARS[0]: before, YEARS[1]: after}).set_index("ACCTID")
+    merged = before.merge(after, on="ACCTID", how="outer", suffixes=("_before", "_after"), indicator=True).set_index("ACCTID")
+    both = merged["_merge"] == "both"
+
+    assert set(changes.index[changes["added"]]) == set(merged.index[merged["_merge"] == "right_only"])
+    assert set(changes.index[changes["removed"]]) == set(merged.index[merged["_merge"] == "left_only"])
+    common = merged[both]
+    rezoned = common.index[common["ZONING_before"] != common["ZONING_after"]]
+    revalued = common.index[common["NFMTTLVL_before"] != common["NFMTTLVL_after"]]
+    reshaped = common.index[~shapely.equals(common["geometry_before"].values, common["geometry_after"].values)]
+    assert set(changes.index[changes["zoning_changed"]]) == set(rezoned)
+    assert set(changes.index[changes["NFMTTLVL_changed"]]) == set(revalued)
+    assert set(changes.index[changes["geometry_changed"]]) == set(reshaped)
+    # Merged lots keep the first lot's ACCTID with the union as their geometry.
+    assert len(reshaped) == after.attrs["churn"]["merges"]
+
+
+def test_summary_counts_every_year_pair(parcel_years):
+    summary = summarize_changes(detect_changes(parcel_years))
+    assert list(zip(summary["FromYear"], summary["ToYear"])) == list(zip(YEARS[:-1], YEARS[1:]))
+    churn = [parcel_years[year].attrs["churn"] for year in YEARS[1:]]
+    # A split removes one lot and adds two; a merge removes the second lot of the pair.
+    np.testing.assert_array_equal(summary["added"], [2 * c["splits"] for c in churn])
+    np.testing.assert_array_equal(summary["removed"], [c["splits"] + c["merges"] for c in churn])
@@ -0,0 +1,70 @@
+import shutil
+
+import pandas as pd
+import pytest
+
+from conftest import YEARS
+from parceltrack.io.cubes import DEFAULT_CUBES, build_cubes, query_cube
+from parceltrack.io.load_geometry import load_processed_year_files, save_geojson_per_year
+
+
+# The synthetic parcels have no zero-value lots, so the filtered cube uses a threshold that keeps some.
+CUBES = {
+    **DEFAULT_CUBES,
+    "low_value_owners": {"dims": ["OWNNAME1", "ZONING"], "measures": {"SQFTSTRC": ["max"]}, "filter": "NFMTTLVL < 50000"},
+}
+
+
+@pytest.fixture(scope="module")
+def cube_dir(synthetic_dir, tmp_path_factory):
+    out, _ = synthetic_dir
+    directory = tmp_path_factory.mktemp("cubes") / "processed"
+    shutil.copytree(out / "processed", directory)
+    assert build_cubes(directory, cubes=CUBES) == YEARS
+    return directory
+
+
+@pytest.fixture(scope="module")
+def parcels(cube_dir):
+    return pd.concat([pd.DataFrame(load_processed_year_files(cube_dir, year).drop(columns="geometry")).assign(Year=year)
+                      for year in YEARS], ignore_index=True)
+
+
+def test_full_grain_matches_groupby(cube_dir, parcels):
+    result = query_cube(cube_dir, "zoning_values", measures=["count", "NFMTTLVL_sum", "NFMTTLVL_median", "NFMTTLVL_max"])
+    expected = parcels.groupby(["Year", "ZONING"]).agg(
+        count=("NFMTTLVL", "size"), NFMTTLVL_sum=("NFMTTLVL", "sum"),
+        NFMTTLVL_median=("NFMTTLVL", "median"), NFMTTLVL_max=("NFMTTLVL", "max"),
+    ).reset_index()
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_rollup_and_filters_match_groupby(cube_dir, parcels):
+    result = query_cube(cube_dir, "block_values", by="ZONING", measures=["count", "NFMLNDVL_mean"],
+                        years=YEARS[1:], where={"ZONING": ["R-6", "R-7"]})
+    subset = parcels[parcels["Year"].isin(YEARS[1:]) & parcels["ZONING"].isin(["R-6", "R-7"])]
+    expected = subset.groupby("ZONING").agg(count=("NFMLNDVL", "size"), NFMLNDVL_mean=("NFMLNDVL", "mean")).reset_index()
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    with pytest.raises(ValueError):
+        query_cube(cube_dir, "block_values", by="ZONING", measures=["NFMTTLVL_median"])
+
+
+def test_filtered_cube_matches_groupby(cube_dir, parcels):
+    result = query_cube(cube_dir, "low_value_owners", by=["Year", "ZONING"], measures=["count", "SQFTSTRC_max"])
+    low = parcels[parcels["NFMTTLVL"] < 50000]
+    expected = low.groupby(["Year", "ZONING"]).agg(count=("SQFTSTRC", "size"), SQFTSTRC_max=("SQFTSTRC", "max")).reset_index()
+    assert len(expected) > len(YEARS)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_dimensions_named_like_measures(parcel_years, tmp_path):
+    gdf = parcel_years[YEARS[0]].assign(zone_min=lambda df: df["ZONING"], land_n=lambda df: df["WARD"].astype(str))
+    save_geojson_per_year({YEARS[0]: gdf}, tmp_path)
+    build_cubes(tmp_path, cubes={"zones": {"dims": ["zone_min", "land_n"], "measures": {"NFMTTLVL": ["max"]}}})
+
+    result = query_cube(tmp_path, "zones", by="zone_min", measures=["count", "NFMTTLVL_max"], where={"land_n": "1"})
+    subset = gdf[gdf["land_n"] == "1"]
+    expected = subset.groupby("zone_min").agg(count=("NFMTTLVL", "size"), NFMTTLVL_max=("NFMTTLVL", "max")).reset_index()
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert list(query_cube(tmp_path, "zones").columns[:3]) == ["Year", "zone_min", "land_n"]
@@ -0,0 +1,29 @@
+import pandas as pd
+
+from parceltrack.io.dtypes import compact_dtypes, unify_categories
+
+
+def test_unify_keeps_values_of_years_still_stored_as_text():
+    geoms = {
+        2021: pd.DataFrame({"ZONING": pd.Series(["R-6", "X", "X"], dtype="category"), "WARD": [1, 2, 3]}),
+        2022: pd.DataFrame({"ZONING": ["P", "Q", "R", "X"], "WARD": [1, 2, 3, 4]}),
+        2023: pd.DataFrame({"ZONING": [3, 4], "WARD": [5, 6]}),
+    }
+    unified = unify_categories(geoms)
+
+    assert unified[2022]["ZONING"].tolist() == ["P", "Q", "R", "X"]
+    assert unified[2021]["ZONING"].tolist() == ["R-6", "X", "X"]
+    assert unified[2021]["ZONING"].dtype == unified[2022]["ZONING"].dtype
+    assert list(unified[2022]["ZONING"].cat.categories) == ["P", "Q", "R", "R-6", "X"]
+    # Numeric years are not forced into the text categories.
+    assert unified[2023]["ZONING"].tolist() == [3, 4]
+    assert pd.concat([unified[2021], unified[2022]])["ZONING"].dtype == unified[2021]["ZONING"].dtype
+
+
+def test_compact_dtypes_keeps_values(parcel_years):
+    gdf = parcel_years[2021]
+    compact = compact_dtypes(gdf)
+    assert isinstance(compact["ZONING"].dtype, pd.CategoricalDtype)
+    assert compact.memory_usage(deep=True).sum() < gdf.memory_usage(deep=True).sum()
+    for col in gdf.columns.drop("geometry"):
+        assert compact[col].astype(object).tolist() == gdf[col].astype(object).tolist()
@@ -0,0 +1,62 @@
+import os
+import shutil
+
+import pandas as pd
+
+from parceltrack.analysis.package_early_exploration import extract_parcel_metadata
+from parceltrack.analysis.package_early_exploration.extract_parcel_metadata import get_shapefile_metadata
+
+
+def test_reused_rows_have_the_types_of_inspected_rows(synthetic_dir, tmp_path):
+    out, metadata = synthetic_dir
+    fresh = get_shapefile_metadata(metadata, base_dir=out / "raw")
+    csv = tmp_path / "shapefile_metadata.csv"
+    fresh.to_csv(csv, index=False)
+
+    reused = get_shapefile_metadata(metadata, base_dir=out / "raw", previous=csv)
+    for column in ("Columns", "Bounds"):
+        assert all(isinstance(v, list) for v in reused[column])
+        assert reused[column].tolist() == fresh[column].tolist()
+    assert all(isinstance(v, float) for bounds in reused["Bounds"] for v in bounds)
+
+
+def test_old_csvs_with_numpy_reprs_are_decoded(synthetic_dir, tmp_path):
+    out, metadata = synthetic_dir
+    fresh = get_shapefile_metadata(metadata, base_dir=out / "raw")
+    old = fresh.copy()
+    old["Columns"] = [repr([f"np.str_('{c}')" for c in cols]).replace('"', "") for cols in fresh["Columns"]]
+    old["Bounds"] = [repr([f"np.float64({v!r})" for v in b]).replace("'", "") for b in fresh["Bounds"]]
+    csv = tmp_path / "shapefile_metadata.csv"
+    old.to_csv(csv, index=False)
+
+    reused = get_shapefile_metadata(metadata, base_dir=out / "raw", previous=csv)
+    assert reused["Columns"].tolist() == fresh["Columns"].tolist()
+    assert reused["Bounds"].tolist() == fresh["Bounds"].tolist()
+
+
+def test_unchanged_rows_are_not_inspected_again(synthetic_dir, tmp_path, monkeypatch):
+    out, metadata = synthetic_dir
+    raw = tmp_path / "raw"
+    shutil.copytree(out / "raw", raw)
+    # A listed shapefile that no longer exists leaves its signature columns empty.
+    tree = pd.concat([metadata, pd.DataFrame([{"FullPath": "BACIparcels1999", "Shapefile": "BACIPOLY.shp"}])],
+                     ignore_index=True)
+    fresh = get_shapefile_metadata(tree, base_dir=raw)
+    assert fresh["MTimeNs"].isna().sum() == 1
+    csv = tmp_path / "shapefile_metadata.csv"
+    fresh.to_csv(csv, index=False)
+
+    inspected = []
+    original = extract_parcel_metadata.inspect_shapefile
+    monkeypatch.setattr(extract_parcel_metadata, "inspect_shapefile",
+                        lambda path, **kwargs: inspected.append(path) or original(path, **kwargs))
+
+    reused = get_shapefile_metadata(tree, base_dir=raw, previous=csv)
+    assert inspected == []
+    pd.testing.assert_series_equal(reused["MTimeNs"], fresh["MTimeNs"])
+
+    changed = raw / metadata["FullPath"].iloc[0] / "BACIPOLY.dbf"
+    stat = changed.stat()
+    os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    get_shapefile_metadata(tree, base_dir=raw, previous=csv)
+    assert inspected == [raw / metadata["FullPath"].iloc[0] / "BACIPOLY.shp"]
@@ -0,0 +1,45 @@
+import pandas as pd
+import shapely
+
+from conftest import YEARS
+from parceltrack.io.geomstore import load_store_year, load_store_years, read_store_manifest, save_geometry_store
+
+
+def test_round_trip(parcel_years, tmp_path):
+    manifest = save_geometry_store(parcel_years, tmp_path)
+    loaded = load_store_years(tmp_path)
+
+    distinct = pd.concat([pd.Series(shapely.to_wkb(shapely.normalize(g.geometry.values))) for g in parcel_years.values()])
+    assert manifest["geometries"] == distinct.nunique() < sum(len(g) for g in parcel_years.values())
+    for year, gdf in parcel_years.items():
+        pd.testing.assert_frame_equal(pd.DataFrame(loaded[year].drop(columns="geometry")),
+                                      pd.DataFrame(gdf.drop(columns="geometry")), check_dtype=False)
+        assert loaded[year].geometry.geom_equals(gdf.geometry).all()
+        assert loaded[year].crs == gdf.crs
+
+    # Unchanged parcels share one geometry object between years.
+    first, second = loaded[YEARS[0]], loaded[YEARS[1]]
+    shared = {id(g) for g in first.geometry.values} & {id(g) for g in second.geometry.values}
+    assert len(shared) > 0.8 * len(first)
+
+
+def test_replacing_a_year_drops_unused_geometries(parcel_years, tmp_path):
+    save_geometry_store(parcel_years, tmp_path)
+    moved = parcel_years[YEARS[-1]].assign(geometry=lambda df: df.geometry.translate(xoff=5000))
+    save_geometry_store({YEARS[-1]: moved}, tmp_path)
+
+    assert list(read_store_manifest(tmp_path)["years"]) == [str(y) for y in YEARS]
+    assert load_store_year(tmp_path, YEARS[-1]).geometry.geom_equals(moved.geometry).all()
+    reference = save_geometry_store({**parcel_years, YEARS[-1]: moved}, tmp_path / "fresh")
+    assert read_store_manifest(tmp_path)["geometries"] == reference["geometries"]
+
+
+def test_bbox_and_columns(parcel_years, tmp_path):
+    save_geometry_store(parcel_years, tmp_path)
+    gdf = parcel_years[YEARS[0]]
+    minx, miny, maxx, maxy = gdf.total_bounds
+    bbox = (minx, miny, (minx + maxx) / 2, (miny + maxy) / 2)
+
+    loaded = load_store_year(tmp_path, YEARS[0], columns=["ACCTID"], bbox=bbox)
+    assert list(loaded.columns) == ["ACCTID", "geometry"]
+    assert sorted(loaded["ACCTID"]) == sorted(gdf.loc[gdf.intersects(shapely.box(*bbox)), "ACCTID"])
@@ -0,0 +1,55 @@
+import threading
+
+import pytest
+
+from parceltrack import instrumentation as inst
+
+
+@pytest.fixture
+def recording():
+    inst.reset()
+    inst.enable()
+    yield
+    inst.disable()
+    inst.reset()
+
+
+def test_nested_stages_record_parent_and_depth(recording):
+    with inst.stage("outer"):
+        with inst.stage("inner") as s:
+            s.set(rows=3)
+    inner, outer = inst.records()
+    assert (inner["parent"], inner["depth"], inner["rows"]) == ("outer", 1, 3)
+    assert (outer["parent"], outer["depth"]) == (None, 0)
+    assert outer["peak_scope"] != "concurrent"
+
+
+def test_stages_in_threads_nest_per_thread(recording):
+    barrier = threading.Barrier(3)
+
+    def work(i):
+        with inst.stage(f"outer{i}"):
+            barrier.wait()
+            with inst.stage(f"inner{i}"):
+                barrier.wait()
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    records = {r["stage"]: r for r in inst.records()}
+    for i in range(3):
+        assert records[f"inner{i}"]["parent"] == f"outer{i}"
+        assert records[f"inner{i}"]["depth"] == 1
+        assert records[f"outer{i}"]["depth"] == 0
+    # Overlapping stages cannot own the process-wide high-water mark.
+    assert all(r["peak_scope"] == "concurrent" and r["peak_rss_mb"] is None for r in records.values())
+
+
+def test_disabled_stage_is_a_no_op():
+    inst.reset()
+    with inst.stage("ignored") as s:
+        s.set(rows=1)
+    assert inst.records() == []
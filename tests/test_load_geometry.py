@@ -0,0 +1,61 @@
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+
+from conftest import YEARS, assert_frames_equal
+from parceltrack.io.load_geometry import (load_geometry,
+                                          load_processed_year_files,
+                                          read_manifest,
+                                          save_geojson_per_year
+                                        )
+
+
+def test_cache_hit_equals_cache_miss(shapefile_with_invalid_rows, tmp_path):
+    cache_dir = tmp_path / "cache"
+    miss = load_geometry(shapefile_with_invalid_rows, use_cache=True, cache_dir=cache_dir)
+    hit = load_geometry(shapefile_with_invalid_rows, use_cache=True, cache_dir=cache_dir)
+    assert len(miss) == 18
+    assert isinstance(miss.index, pd.RangeIndex)
+    assert_frames_equal(miss, hit)
+    assert_frames_equal(miss, load_geometry(shapefile_with_invalid_rows))
+
+
+def test_serial_load_equals_concurrent_load(synthetic_dir):
+    out, _ = synthetic_dir
+    for year in YEARS:
+        serial = load_processed_year_files(out / "processed", year)
+        concurrent = load_processed_year_files(out / "processed", year, workers=3)
+        assert isinstance(serial.index, pd.RangeIndex)
+        assert_frames_equal(serial, concurrent)
+
+
+def test_concurrent_load_renumbers_after_dropping_invalid_rows(shapefile_with_invalid_rows, tmp_path):
+    save_geojson_per_year({2021: gpd.read_file(shapefile_with_invalid_rows)}, tmp_path, max_size="5KB")
+    serial = load_processed_year_files(tmp_path, 2021)
+    concurrent = load_processed_year_files(tmp_path, 2021, workers=2)
+    assert len(serial) == 18
+    assert_frames_equal(serial, concurrent)
+
+
+def test_writer_manifest_describes_its_parts(parcel_years, tmp_path):
+    gdf = parcel_years[YEARS[0]]
+    save_geojson_per_year({2021: gdf}, tmp_path, max_size="40KB")
+    manifest = read_manifest(tmp_path, 2021)
+    parts = manifest["parts"]
+    assert len(parts) > 1
+    assert manifest["rows"] == len(gdf)
+
+    # Row ranges tile 0..n without gaps, and each part's bbox/bytes match its file.
+    assert [p["rows"][0] for p in parts] == [0] + [p["rows"][1] for p in parts[:-1]]
+    assert parts[-1]["rows"][1] == len(gdf)
+    for part in parts:
+        path = tmp_path / part["file"]
+        assert path.stat().st_size == part["bytes"] <= 40 * 1024
+        start, stop = part["rows"]
+        assert len(gpd.read_file(path)) == stop - start
+        np.testing.assert_allclose(part["bbox"], gdf.iloc[start:stop].total_bounds)
+
+    # A coarser save replaces every part of the previous one.
+    save_geojson_per_year({2021: gdf}, tmp_path, max_size="10MB")
+    assert [p["file"] for p in read_manifest(tmp_path, 2021)["parts"]] == ["parcels_2021_part1_1.geojson"]
+    assert sorted(f.name for f in tmp_path.glob("parcels_2021_part*")) == ["parcels_2021_part1_1.geojson"]
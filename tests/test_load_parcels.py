@@ -0,0 +1,48 @@
+import geopandas as gpd
+import numpy as np
+import shapely
+
+from conftest import wiggly_blocks
+from scripts.load_parcels import build_shared_geojson, plot_timeseries_choropleth
+
+
+def test_changed_geometries_get_their_own_features(parcel_years):
+    years = {year: parcel_years[year] for year in (2021, 2022)}
+    geojson, locations = build_shared_geojson(years, precision=None)
+
+    features = {f["id"] for f in geojson["features"]}
+    assert all(len(locations[year]) == len(gdf) for year, gdf in years.items())
+    assert set(np.concatenate(list(locations.values()))) == features
+
+    # Parcels keep their geometry id exactly when their polygon did not change.
+    first, second = (gdf.assign(location=locations[year]).set_index("ACCTID") for year, gdf in years.items())
+    common = first.index.intersection(second.index)
+    same = shapely.equals(first.loc[common].geometry.values, second.loc[common].geometry.values)
+    assert (~same).any()
+    assert ((first.loc[common, "location"] == second.loc[common, "location"]) == same).all()
+
+
+def test_simplified_shared_layer_has_no_gaps_between_neighbours(parcel_years):
+    blocks = shapely.transform(wiggly_blocks(), lambda coords: coords + [1_420_000, 590_000])
+    gdf = gpd.GeoDataFrame({"ACCTID": np.arange(len(blocks)).astype(str)}, geometry=blocks, crs="EPSG:2248")
+    geojson, locations = build_shared_geojson({2021: gdf}, simplify_tolerance=2.0, precision=None)
+    shapes = {f["id"]: shapely.geometry.shape(f["geometry"]) for f in geojson["features"]}
+    simplified = np.array([shapes[i] for i in locations[2021]])
+    assert shapely.get_num_coordinates(simplified).sum() < shapely.get_num_coordinates(gdf.geometry.values).sum()
+    assert shapely.coverage_is_valid(simplified)
+
+
+
+def test_slider_steps_swap_locations(parcel_years):
+    fig = plot_timeseries_choropleth(parcel_years, "NFMTTLVL", hover_cols=["ACCTID", "ZONING"], shared_geometry=True)
+    steps = fig.layout.sliders[0].steps
+    assert len(fig.data) == 1 and len(steps) == len(parcel_years)
+    for step, gdf in zip(steps, parcel_years.values()):
+        assert len(step.args[0]["locations"][0]) == len(step.args[0]["z"][0]) == len(gdf)
+
+
+def test_per_year_traces_build(parcel_years):
+    plot_input = {year: gdf.assign(POLYID=range(len(gdf))) for year, gdf in parcel_years.items()}
+    fig = plot_timeseries_choropleth(plot_input, "NFMTTLVL", hover_cols=["ACCTID", "ZONING"])
+    assert len(fig.data) == len(parcel_years)
+    assert fig.layout.map.style == "carto-positron"
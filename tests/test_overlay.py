@@ -0,0 +1,78 @@
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+from shapely.geometry import box
+
+from parceltrack.analysis.overlay import grid_tiles, load_or_overlay, overlay_parcels
+
+
+@pytest.fixture
+def zones():
+    return gpd.GeoDataFrame({"ZONE": ["R-6", "C-2"], "POP": [1000.0, 400.0]},
+                            geometry=[box(0, 0, 10, 20), box(10, 0, 20, 20)], crs="EPSG:2248")
+
+
+@pytest.fixture
+def parcels():
+    return gpd.GeoDataFrame({"ACCTID": ["west", "east", "straddle", "outside"]}, geometry=[
+        box(1, 1, 5, 5),
+        box(12, 12, 18, 18),
+        box(7, 8, 17, 10),  # 3 units in R-6, 7 units in C-2
+        box(30, 30, 31, 31),
+    ], crs="EPSG:2248")
+
+
+def _reference(parcels, zones):
+    pieces = gpd.overlay(parcels, zones, how="intersection", keep_geom_type=True)
+    pieces["area"] = pieces.area
+    pieces["share"] = pieces["area"] / pieces["ACCTID"].map(parcels.set_index("ACCTID").area)
+    return pieces
+
+
+def test_largest_matches_gpd_overlay(parcels, zones):
+    result = overlay_parcels(parcels, zones, how="largest", tiles=4).set_index("ACCTID")
+    pieces = _reference(parcels, zones)
+    expected = pieces.sort_values("area", ascending=False).drop_duplicates("ACCTID").set_index("ACCTID")
+
+    assert result.loc["straddle", "ZONE"] == "C-2"
+    assert result.loc["straddle", "parcel_share"] == pytest.approx(0.7)
+    pd.testing.assert_series_equal(result["ZONE"].drop("outside"), expected["ZONE"].reindex(result.index.drop("outside")),
+                                   check_dtype=False)
+    np.testing.assert_allclose(result["parcel_share"].drop("outside"), expected["share"].reindex(result.index.drop("outside")))
+    assert result.loc["outside"].drop("ACCTID", errors="ignore").isna().all()
+
+
+def test_apportion_matches_gpd_overlay(parcels, zones):
+    result = overlay_parcels(parcels, zones, how="apportion", columns=["POP"], tiles=4).set_index("ACCTID")
+    pieces = _reference(parcels, zones)
+    pieces["POP_part"] = pieces["POP"] * pieces["area"] / pieces["ZONE"].map(zones.set_index("ZONE").area)
+    expected = pieces.groupby("ACCTID")["POP_part"].sum().reindex(result.index, fill_value=0.0)
+
+    np.testing.assert_allclose(result["POP"], expected)
+    assert result.loc["straddle", "POP"] == pytest.approx(1000 * 6 / 200 + 400 * 14 / 200)
+    np.testing.assert_allclose(result["parcel_share"], [1, 1, 1, 0])
+
+
+def test_tiling_and_workers_do_not_change_the_result(parcel_years):
+    parcels = parcel_years[2021]
+    cells = grid_tiles(tuple(parcels.total_bounds), 9)
+    layer = gpd.GeoDataFrame({"CELL": np.arange(len(cells)), "POP": np.arange(len(cells)) * 10.0},
+                             geometry=[box(*c) for c in cells], crs=parcels.crs)
+    reference = _reference(parcels[["ACCTID", "geometry"]], layer)
+
+    for tiles, workers in ((1, 1), (16, 1), (16, 2)):
+        result = overlay_parcels(parcels, layer, how="intersects", tiles=tiles, workers=workers)
+        merged = result.merge(reference, on=["ACCTID", "CELL"], how="outer", indicator=True)
+        assert (merged["_merge"] == "both").all()
+        np.testing.assert_allclose(merged["overlap_area"], merged["area"])
+
+
+def test_cache_is_reused_until_the_layer_changes(parcels, zones, tmp_path):
+    first = load_or_overlay(parcels, 2021, zones, how="largest", layer_name="zones", cache_dir=tmp_path)
+    cached = load_or_overlay(parcels, 2021, zones, how="largest", layer_name="zones", cache_dir=tmp_path)
+    pd.testing.assert_frame_equal(first, cached)
+
+    renamed = zones.assign(ZONE=["R-7", "C-2"])
+    assert load_or_overlay(parcels, 2021, renamed, how="largest", layer_name="zones",
+                           cache_dir=tmp_path).set_index("ACCTID").loc["west", "ZONE"] == "R-7"
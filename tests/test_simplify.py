@@ -0,0 +1,27 @@
+import numpy as np
+import shapely
+
+from conftest import wiggly_blocks
+from parceltrack.io.simplify import simplify_geometries
+
+
+def test_neighbours_keep_their_shared_edges():
+    parcels = wiggly_blocks()
+    assert shapely.coverage_is_valid(parcels)
+
+    simplified = simplify_geometries(parcels, tolerance=1.0, grid_size=0.1)
+    assert shapely.get_num_coordinates(simplified).sum() < shapely.get_num_coordinates(parcels).sum() / 2
+    assert shapely.coverage_is_valid(simplified)
+    assert abs(shapely.union_all(simplified).area - shapely.union_all(parcels).area) < 1e-6
+
+    # Every pair of neighbours still shares a line, not just corners or nothing.
+    i, j = np.triu_indices(len(parcels), 1)
+    neighbours = shapely.relate_pattern(parcels[i], parcels[j], "****1****")
+    assert shapely.relate_pattern(simplified[i[neighbours]], simplified[j[neighbours]], "****1****").all()
+
+
+def test_missing_and_empty_geometries_pass_through():
+    parcels = np.array([shapely.box(0, 0, 1, 1), None, shapely.Polygon(), shapely.box(1, 0, 2, 1)])
+    simplified = simplify_geometries(parcels, tolerance=0.1)
+    assert simplified[1] is None and simplified[2].is_empty
+    assert shapely.equals(simplified[[0, 3]], parcels[[0, 3]]).all()
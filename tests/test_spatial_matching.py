@@ -0,0 +1,24 @@
+from parceltrack.analysis.spatial_matching import match_parcels
+from parceltrack.synthetic import make_parcel_years, make_parcels
+
+
+def test_relation_counts_follow_the_synthetic_merges_and_splits():
+    years = make_parcel_years(make_parcels(600, seed=7), years=[2021, 2022], churn=0.05)
+    churn = years[2022].attrs["churn"]
+    merges, splits = churn["merges"], churn["splits"]
+    assert merges and splits
+
+    lineage = match_parcels(years[2021], years[2022])
+    counts = lineage["relation"].value_counts().to_dict()
+    # A merge links two earlier lots to one later lot; a split links one lot to its two halves.
+    assert counts == {"1:1": len(years[2021]) - 2 * merges - splits, "merge": 2 * merges, "split": 2 * splits}
+    assert lineage["from_pos"].notna().all() and lineage["to_pos"].notna().all()
+
+
+def test_moved_parcels_are_removed_and_added(parcel_years):
+    before = parcel_years[2021].iloc[:50]
+    after = before.copy()
+    after.geometry = before.geometry.translate(xoff=1_000_000)
+
+    lineage = match_parcels(before, after)
+    assert lineage["relation"].value_counts().to_dict() == {"removed": 50, "added": 50}
@@ -0,0 +1,49 @@
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+from shapely.geometry import box
+
+from parceltrack.analysis.spillover import event_flags, spillover_scores
+from parceltrack.analysis.weights import build_weights
+
+# A - B - C in a row; D is an island with no neighbours.
+VALUES = {"A": [100, 150, 150], "B": [200, 200, 260], "C": [300, 330, 330], "D": [50, 80, 80]}
+YEARS = [2021, 2022, 2023]
+
+
+@pytest.fixture
+def scores():
+    parcels = gpd.GeoDataFrame({"ACCTID": list("ABCD")}, geometry=[
+        box(0, 0, 10, 10), box(10, 0, 20, 10), box(20, 0, 30, 10), box(100, 100, 110, 110),
+    ], crs="EPSG:2248")
+    W, ids = build_weights(parcels, "queen", standardize=False)
+    panel = pd.DataFrame(
+        [(year, acct, values[t]) for acct, values in VALUES.items() for t, year in enumerate(YEARS)],
+        columns=["Year", "ACCTID", "NFMTTLVL"],
+    ).set_index(["Year", "ACCTID"]).sort_index()
+    panel = panel.join(event_flags(panel))
+    return spillover_scores(panel, W, ids, events=["value_jump"], outcomes=["NFMTTLVL"]).set_index(["Year", "ACCTID"])
+
+
+def _column(scores, year, column):
+    return scores.xs(year, level="Year")[column].reindex(list("ABCD")).to_numpy()
+
+
+def test_event_flags_compare_with_the_previous_year(scores):
+    # Jumps above 25%: A and D into 2022, B into 2023 (events are reported at T for the T -> T+1 pair).
+    assert _column(scores, 2021, "value_jump").tolist() == [False, False, False, False]
+    assert _column(scores, 2022, "value_jump").tolist() == [True, False, False, True]
+
+
+def test_lags_by_hand(scores):
+    nan = np.nan
+    np.testing.assert_allclose(_column(scores, 2022, "value_jump_exposure_mean"), [0, 0.5, 0, nan])
+    np.testing.assert_allclose(_column(scores, 2022, "value_jump_exposure_sum"), [0, 1, 0, 0])
+    np.testing.assert_allclose(_column(scores, 2021, "NFMTTLVL_change"), [50, 0, 30, 30])
+    np.testing.assert_allclose(_column(scores, 2021, "NFMTTLVL_neighbor_change_mean"), [0, 40, 0, nan])
+    np.testing.assert_allclose(_column(scores, 2022, "NFMTTLVL_neighbor_change_mean"), [60, 0, 60, nan])
+    np.testing.assert_allclose(_column(scores, 2022, "NFMTTLVL_neighbor_change_sum"), [60, 0, 60, 0])
+    # Reactivity only for parcels with the event; the island has no neighbours to react.
+    np.testing.assert_allclose(_column(scores, 2022, "value_jump_NFMTTLVL_reactivity"), [60, nan, nan, nan])
+    assert scores.xs("D", level="ACCTID")["NextYear"].tolist() == [2022, 2023]
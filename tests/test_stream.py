@@ -0,0 +1,46 @@
+import pandas as pd
+import shapely
+
+from conftest import YEARS
+from parceltrack.io.load_geometry import load_processed_year_files
+from parceltrack.io.stream import collect, iter_year_batches, query_years
+
+
+def _attributes(directory, years):
+    return pd.concat([pd.DataFrame(load_processed_year_files(directory, year).drop(columns="geometry")).assign(Year=year)
+                      for year in years], ignore_index=True)
+
+
+def test_query_years_matches_pandas(synthetic_dir):
+    out, _ = synthetic_dir
+    parcels = _attributes(out / "processed", YEARS)
+
+    result = query_years(out / "processed", YEARS, where="NFMTTLVL > 100000", by=["Year", "ZONING"],
+                         sums="NFMLNDVL", batch_size=97)
+    subset = parcels[parcels["NFMTTLVL"] > 100000]
+    expected = subset.groupby(["Year", "ZONING"]).agg(count=("NFMLNDVL", "size"), NFMLNDVL=("NFMLNDVL", "sum"))
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_index_type=False)
+
+    # A filter evaluated on each batch gives the same result as one pushed down to the reader.
+    filtered = query_years(out / "processed", YEARS, filter="NFMTTLVL > 100000", by=["Year", "ZONING"],
+                           sums="NFMLNDVL", columns=["ZONING", "NFMLNDVL", "NFMTTLVL"], batch_size=97)
+    pd.testing.assert_frame_equal(filtered, result)
+
+
+def test_bbox_batches_match_a_spatial_filter(synthetic_dir):
+    out, _ = synthetic_dir
+    gdf = load_processed_year_files(out / "processed", YEARS[0])
+    minx, miny, maxx, maxy = gdf.total_bounds
+    bbox = (minx, miny, (minx + maxx) / 2, (miny + maxy) / 2)
+
+    batches = list(iter_year_batches(out / "processed", YEARS[0], bbox=bbox, columns=["ACCTID"], batch_size=50))
+    assert all(len(b) <= 50 for b in batches) and all(list(b.columns) == ["ACCTID"] for b in batches)
+    expected = gdf.loc[gdf.intersects(shapely.box(*bbox)), "ACCTID"]
+    assert sorted(pd.concat(batches)["ACCTID"]) == sorted(expected)
+
+
+def test_collect_stops_at_the_limit(synthetic_dir):
+    out, _ = synthetic_dir
+    rows = collect(iter_year_batches(out / "processed", YEARS[0], columns=["ACCTID", "ZONING"], batch_size=40),
+                   filter=lambda df: df["ZONING"] == "R-6", limit=55)
+    assert len(rows) == 55 and (rows["ZONING"] == "R-6").all()
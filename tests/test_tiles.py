@@ -0,0 +1,65 @@
+import gzip
+import sqlite3
+
+import numpy as np
+import pytest
+import shapely
+
+from parceltrack.io.load_geometry import load_processed_year_files
+from parceltrack.io.tiles import build_tiles, build_year_tiles, tile_bounds, tiles_for_bounds
+
+mapbox_vector_tile = pytest.importorskip("mapbox_vector_tile")
+
+COLUMNS = ["ACCTID", "NFMTTLVL", "ZONING"]
+
+
+def _expected_tiles(gdf, zooms):
+    """Tiles whose square overlaps some parcel with a positive area."""
+    geoms = np.asarray(gdf.to_crs(3857).geometry.values)
+    tree = shapely.STRtree(geoms)
+    expected = {}
+    for z in zooms:
+        candidates = list(tiles_for_bounds(shapely.total_bounds(geoms), z))
+        boxes = np.array([shapely.box(*tile_bounds(*t)) for t in candidates])
+        tile_idx, geom_idx = tree.query(boxes, predicate="intersects")
+        overlap = shapely.area(shapely.intersection(boxes[tile_idx], geoms[geom_idx])) > 0
+        expected[z] = len(np.unique(tile_idx[overlap]))
+    return expected
+
+
+def test_mbtiles_row_counts_and_properties(synthetic_dir, tmp_path):
+    out, _ = synthetic_dir
+    gdf = load_processed_year_files(out / "processed", 2021, columns=COLUMNS)
+    output = build_year_tiles(out / "processed", 2021, tmp_path / "parcels_2021.mbtiles", columns=COLUMNS,
+                              minzoom=15, maxzoom=17, buffer=0)
+
+    with sqlite3.connect(output) as conn:
+        counts = dict(conn.execute("SELECT zoom_level, COUNT(*) FROM tiles GROUP BY zoom_level").fetchall())
+        metadata = dict(conn.execute("SELECT name, value FROM metadata").fetchall())
+        # The tile holding the first parcel's interior point at the top zoom (TMS rows count from the bottom).
+        point = gdf.to_crs(3857).geometry.iloc[0].representative_point()
+        z, x, y = next(tiles_for_bounds((point.x, point.y, point.x, point.y), 17))
+        data = conn.execute("SELECT tile_data FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?",
+                            (z, x, 2 ** z - 1 - y)).fetchone()[0]
+
+    assert counts == _expected_tiles(gdf, range(15, 18))
+    assert counts[17] > counts[15]
+    assert (metadata["minzoom"], metadata["maxzoom"]) == ("15", "17")
+
+    features = mapbox_vector_tile.decode(gzip.decompress(data))["parcels"]["features"]
+    first = next(f for f in features if f["properties"]["ACCTID"] == gdf["ACCTID"].iloc[0])
+    assert first["properties"] == gdf[COLUMNS].iloc[0].to_dict()
+
+
+def test_directory_output_matches_mbtiles(parcel_years, tmp_path):
+    gdf = parcel_years[2021]
+    build_tiles(gdf, tmp_path / "tiles.mbtiles", columns=COLUMNS, minzoom=15, maxzoom=16)
+    build_tiles(gdf, tmp_path / "tiles", columns=COLUMNS, minzoom=15, maxzoom=16, workers=2)
+
+    with sqlite3.connect(tmp_path / "tiles.mbtiles") as conn:
+        rows = {(z, x, 2 ** z - 1 - row): gzip.decompress(data)
+                for z, x, row, data in conn.execute("SELECT * FROM tiles").fetchall()}
+    files = {(int(p.parent.parent.name), int(p.parent.name), int(p.stem)): gzip.decompress(p.read_bytes())
+             for p in (tmp_path / "tiles").glob("*/*/*.pbf")}
+    assert rows.keys() == files.keys()
+    assert all(mapbox_vector_tile.decode(rows[k]) == mapbox_vector_tile.decode(files[k]) for k in rows)
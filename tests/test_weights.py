@@ -0,0 +1,77 @@
+import geopandas as gpd
+import pytest
+from shapely.geometry import Polygon, box
+
+from parceltrack.analysis.weights import build_weights
+from parceltrack.synthetic import make_parcels
+
+
+def _pairs(W, ids):
+    rows, cols = W.nonzero()
+    return {(ids[r], ids[c]) for r, c in zip(rows, cols) if r < c}
+
+
+@pytest.fixture(scope="module")
+def city():
+    return make_parcels(2000, seed=3)
+
+
+def test_rook_is_a_subset_of_queen(city):
+    rook, ids = build_weights(city, "rook", standardize=False)
+    queen, _ = build_weights(city, "queen", standardize=False)
+    assert 0 < rook.nnz < queen.nnz
+    assert _pairs(rook, ids) <= _pairs(queen, ids)
+
+
+@pytest.mark.parametrize("method", ["rook", "queen"])
+def test_tolerance_does_not_add_links_on_a_clean_city(city, method):
+    exact, _ = build_weights(city, method, standardize=False)
+    snapped, _ = build_weights(city, method, tolerance=0.5, standardize=False)
+    assert snapped.nnz == exact.nnz
+
+
+def test_rook_with_tolerance_ignores_slanted_corner_touch():
+    # B meets A only at A's corner (10, 10); B's edge leaves that corner at a steep slant,
+    # running within the tolerance of A's right edge for a while without sharing it.
+    gdf = gpd.GeoDataFrame({
+        "ACCTID": ["A", "B", "C"],
+        "geometry": [
+            box(0, 0, 10, 10),
+            Polygon([(10, 10), (11, 0), (20, 0), (20, 10)]),
+            box(0, 10.2, 10, 20),  # separated from A by a gap below the tolerance
+        ],
+    }, crs="EPSG:2248")
+
+    rook, ids = build_weights(gdf, "rook", tolerance=0.5, standardize=False)
+    queen, _ = build_weights(gdf, "queen", tolerance=0.5, standardize=False)
+    assert ("A", "B") not in _pairs(rook, ids)
+    assert ("A", "B") in _pairs(queen, ids)
+    assert ("A", "C") in _pairs(rook, ids)
+
+
+@pytest.mark.parametrize("gap", [0.01, 0.2, 0.26, 0.3, 0.37, 0.49])
+@pytest.mark.parametrize("shift", [0.0, 3.3, -4.1])
+def test_rook_with_tolerance_bridges_any_gap_below_it(gap, shift):
+    # C sits above A across a sliver `gap` wide, shifted sideways so the edges only partly overlap.
+    gdf = gpd.GeoDataFrame({
+        "ACCTID": ["A", "C"],
+        "geometry": [box(0, 0, 10, 10), box(shift, 10 + gap, 10 + shift, 20)],
+    }, crs="EPSG:2248")
+    rook, ids = build_weights(gdf, "rook", tolerance=0.5, standardize=False)
+    assert ("A", "C") in _pairs(rook, ids)
+    rook, ids = build_weights(gdf, "rook", standardize=False)
+    assert ("A", "C") not in _pairs(rook, ids)
+
+
+def test_rook_with_tolerance_ignores_gaps_above_it():
+    gdf = gpd.GeoDataFrame({"ACCTID": ["A", "C"], "geometry": [box(0, 0, 10, 10), box(0, 10.6, 10, 20)]}, crs="EPSG:2248")
+    rook, _ = build_weights(gdf, "rook", tolerance=0.5, standardize=False)
+    assert rook.nnz == 0
+
+
+@pytest.mark.parametrize("rows", [1, 3])
+def test_knn_with_a_single_neighbour(rows):
+    gdf = gpd.GeoDataFrame({"ACCTID": list("ABC")[:rows], "geometry": [box(0, 0, 1, 1), box(2, 0, 3, 1), box(5, 0, 6, 1)][:rows]})
+    W, ids = build_weights(gdf, "knn", k=1, standardize=False)
+    assert W.shape == (rows, rows)
+    assert _pairs(W + W.T, ids) == ({("A", "B"), ("B", "C")} if rows == 3 else set())